@@ -0,0 +1,8 @@
+from sqlalchemy import BigInteger, Column, String
+from utils.database import Base
+
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+
+    TABLE_NAME  = Column(String(64), primary_key=True)
+    VERSION     = Column(BigInteger, nullable=False, default=0)   # bumped by triggers on every write to TABLE_NAME
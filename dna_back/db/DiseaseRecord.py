@@ -20,3 +20,25 @@ class DiseaseRecord(Base):
     MUTATED_SEQ  = Column(Text)
     Category     = Column(Text)
     ORIGIN       = Column(Float)
+
+    # Filter/facet indexes used by utils.dbHandler.apply_filters and the
+    # /data/variant-counts groupings, and the (POS, ID) keyset order of
+    # sort_by=Position pages. The (column, ID) indexes serve a filter on one
+    # value of that column already in ID order, so its pages need no sort;
+    # create them with scripts/manage_indexes.py
+    __table_args__ = (
+        Index('ix_disease_records_chrom_pos_id',     'CHROM', 'POS', 'ID'),
+        Index('ix_disease_records_chrom_id',         'CHROM', 'ID'),
+        Index('ix_disease_records_pos_id',           'POS', 'ID'),
+        Index('ix_disease_records_alt_type_chrom',   'ALT_TYPE', 'CHROM'),
+        Index('ix_disease_records_alt_type_id',      'ALT_TYPE', 'ID'),
+        Index('ix_disease_records_clnsig_chrom',     'CLNSIG', 'CHROM'),
+        Index('ix_disease_records_clnsig_id',        'CLNSIG', 'ID'),
+        Index('ix_disease_records_geneinfo_id',      'GENEINFO', 'ID'),
+        Index('ix_disease_records_ref_alt_value',    'REF', 'ALT_VALUE'),
+        Index('ix_disease_records_ref_id',           'REF', 'ID'),
+        Index('ix_disease_records_alt_value_id',     'ALT_VALUE', 'ID'),
+        Index('ix_disease_records_category_clndn',   'Category', 'CLNDN'),
+        Index('ix_disease_records_category_id',      'Category', 'ID'),
+        Index('ix_disease_records_clndn_id',         'CLNDN', 'ID'),
+    )
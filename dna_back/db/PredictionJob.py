@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Boolean, DateTime, Float, Integer, String, Text, func
+from utils.database import Base
+
+class PredictionJob(Base):
+    __tablename__ = 'prediction_jobs'
+
+    ID                 = Column(String(32), primary_key=True)
+    CLIENT_ID          = Column(Text, index=True)
+    STATUS             = Column(String(16), index=True)   # queued / running / completed / failed / cancelled
+    FILENAME           = Column(Text)
+    UPLOAD_PATH        = Column(Text)
+    UPLOAD_BYTES       = Column(Integer)                  # size of the stored upload, for the server‐wide cap
+    PROCESSED_RECORDS  = Column(Integer, default=0)
+    CANCEL_REQUESTED   = Column(Boolean, default=False)
+    ERROR              = Column(Text)
+    OWNER              = Column(String(32))               # run that claimed the job (jobHandler.submit_run)
+    LEASE_UNTIL        = Column(Float)                    # epoch seconds; a running job past it is resumable
+    CREATED_AT         = Column(DateTime, server_default=func.now())
+    UPDATED_AT         = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, String, Text
+from utils.database import Base
+
+class PredictionJobResult(Base):
+    __tablename__ = 'prediction_job_results'
+
+    JOB_ID          = Column(String(32), ForeignKey('prediction_jobs.ID', ondelete='CASCADE'), primary_key=True)
+    RECORD_INDEX    = Column(Integer, primary_key=True)   # position among the valid records
+    RECORD_ID       = Column(Text)
+    PREDICTION_IDX  = Column(Integer)
+    PROBS           = Column(LargeBinary)                 # float32 bytes
+    ALPHAS          = Column(LargeBinary)                 # float32 bytes
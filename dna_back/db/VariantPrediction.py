@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, LargeBinary, String, func
+from utils.database import Base
+
+class VariantPrediction(Base):
+    __tablename__ = 'variant_predictions'
+
+    RECORD_ID       = Column(BigInteger, ForeignKey('disease_records.ID', ondelete='CASCADE'), primary_key=True)
+    MODEL_VERSION   = Column(String(16), primary_key=True)   # model_fingerprint of the model files
+    SEQUENCE        = Column(String(8), primary_key=True)    # "normal" (NormalSeq) or "mutated" (MUTATED_SEQ)
+    CHROMOSOME      = Column(String(8))                      # model inputs actually used
+    GENE            = Column(String(32))
+    PREDICTION_IDX  = Column(Integer)
+    PROBS           = Column(LargeBinary)                    # float32 bytes
+    ALPHAS          = Column(LargeBinary)                    # float32 bytes; NULL if stored without attention
+    CREATED_AT      = Column(DateTime, server_default=func.now())
@@ -1,8 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import dataRoute, metadataRoutes, modelRoutes
+from routes import dataRoute, jobRoutes, metadataRoutes, metricsRoutes, modelRoutes
+from utils.countCache import create_data_version_table
+from utils.database import SessionLocal
+from utils.geneSearch import create_gene_search_index
+from utils.jobHandler import create_job_tables, resume_jobs, shutdown_executor
+from utils.metrics import ServerTimingMiddleware
+from utils.variantPredictions import create_variant_prediction_table
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create job, prediction and data version tables and the gene search
+    index, and requeue unfinished jobs on startup.
+    """
+    create_job_tables()
+    create_variant_prediction_table()
+    create_data_version_table()
+    create_gene_search_index()
+    db = SessionLocal()
+    try:
+        resume_jobs(db)
+    finally:
+        db.close()
+    yield
+    shutdown_executor()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -10,12 +38,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],  
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(ServerTimingMiddleware)
 
 
 app.include_router(dataRoute.router, prefix="/data")
 app.include_router(metadataRoutes.router, prefix="/metadata")
+app.include_router(jobRoutes.router,      prefix="/model/jobs")
 app.include_router(modelRoutes.router,    prefix="/model")
+app.include_router(metricsRoutes.router,  prefix="/metrics")
 
 if __name__ == "__main__":
     import uvicorn
@@ -7,10 +7,14 @@ from utils.dbHandler import (
     filter_data_advanced,
     filter_data_by_column,
     filter_query,
+    get_all_records,
+    get_record_sequences,
+    parse_fields,
     get_disease_counts_grouped_by_category,
     get_db,
 )
 from db.DiseaseRecord import DiseaseRecord
+from utils.geneSearch import SUGGEST_LIMIT, gene_suggester
 
 router = APIRouter()
 
@@ -114,6 +118,10 @@ def get_unique_values_route(
 def get_all_data(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(100, ge=1, description="Records per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    sort_by: str = Query("ID", description="Order of the records: ID or Position"),
+    exact_count: bool = Query(True, description="False allows an estimated total_records (see total_exact)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. ID,Chromosome,Position (default: all)"),
     db: Session = Depends(get_db),
 ) -> dict:
     """
@@ -121,12 +129,18 @@ def get_all_data(
 
     :param page: Page number (1-based).
     :param limit: Records per page.
+    :param cursor: Opaque cursor from the previous page's next_cursor.
+    :param sort_by: Sort key (ID or Position); ties are ordered by ID.
+    :param exact_count: If False, an uncached total is only counted a few pages ahead.
+    :param fields: Response fields to include; ID is always included.
     :param db: Database session.
     :return: {'data': paginated records}
     """
     try:
-        result = filter_data_by_column(None, None, page, limit, db=db)
+        result = get_all_records(page, limit, db=db, cursor=cursor, sort_by=sort_by, exact_count=exact_count, fields=parse_fields(fields))
         return {"data": result}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -136,6 +150,10 @@ def advanced_search(
     filters: VariantFilterParams = Depends(),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(100, ge=1, description="Records per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    sort_by: str = Query("ID", description="Order of the records: ID or Position"),
+    exact_count: bool = Query(True, description="False allows an estimated total_records (see total_exact)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. ID,Chromosome,Position (default: all)"),
     db: Session = Depends(get_db),
 ) -> dict:
     """
@@ -144,6 +162,10 @@ def advanced_search(
     :param filters: VariantFilterParams for filtering.
     :param page: Page number (1-based).
     :param limit: Records per page.
+    :param cursor: Opaque cursor from the previous page's next_cursor.
+    :param sort_by: Sort key (ID or Position); ties are ordered by ID.
+    :param exact_count: If False, an uncached total is only counted a few pages ahead.
+    :param fields: Response fields to include; ID is always included.
     :param db: Database session.
     :return: {'data': search results}
     """
@@ -162,8 +184,14 @@ def advanced_search(
             page,
             limit,
             db=db,
+            cursor=cursor,
+            sort_by=sort_by,
+            exact_count=exact_count,
+            fields=parse_fields(fields),
         )
         return {"data": result}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -174,6 +202,10 @@ def filter_data(
     value: str = Query(..., description="Value to filter for"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(100, ge=1, description="Records per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    sort_by: str = Query("ID", description="Order of the records: ID or Position"),
+    exact_count: bool = Query(True, description="False allows an estimated total_records (see total_exact)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. ID,Chromosome,Position (default: all)"),
     db: Session = Depends(get_db),
 ) -> dict:
     """
@@ -183,11 +215,15 @@ def filter_data(
     :param value: Value to match.
     :param page: Page number (1-based).
     :param limit: Records per page.
+    :param cursor: Opaque cursor from the previous page's next_cursor.
+    :param sort_by: Sort key (ID or Position); ties are ordered by ID.
+    :param exact_count: If False, an uncached total is only counted a few pages ahead.
+    :param fields: Response fields to include; ID is always included.
     :param db: Database session.
     :return: {'data': filtered records}
     """
     try:
-        result = filter_data_by_column(column, value, page, limit, db=db)
+        result = filter_data_by_column(column, value, page, limit, db=db, cursor=cursor, sort_by=sort_by, exact_count=exact_count, fields=parse_fields(fields))
         return {"data": result}
     except HTTPException:
         raise
@@ -195,6 +231,19 @@ def filter_data(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/records/{record_id}/sequences")
+def record_sequences(record_id: int, db: Session = Depends(get_db)) -> dict:
+    """
+    Normal and mutated sequences of one record, for list pages fetched
+    without them (`fields=`).
+
+    :param record_id: Record ID.
+    :param db: Database session.
+    :return: {'data': ID, Normal Sequence and Mutated Sequence}
+    """
+    return {"data": get_record_sequences(record_id, db=db)}
+
+
 @router.get("/disease-counts")
 def disease_counts(db: Session = Depends(get_db)) -> dict:
     """
@@ -212,22 +261,22 @@ def disease_counts(db: Session = Depends(get_db)) -> dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def _group_and_sort(
+def group_count_query(
     group_field: str,
     filters: VariantFilterParams,
     db: Session,
     limit: Optional[int] = None,
     sort_fn=None,
-) -> List[dict]:
+):
     """
-    Helper to group by a field, count, sort, and optionally limit results.
+    Build the filtered group‐by/count query behind the variant‐count endpoints.
 
     :param group_field: Model attribute name to group by.
     :param filters: VariantFilterParams for query filtering.
     :param db: Database session.
     :param limit: Optional maximum number of results.
     :param sort_fn: Optional SQLAlchemy sort function.
-    :return: List of dicts with lowercased group_field and count.
+    :return: SQLAlchemy Query of (group value, count) rows.
     """
     query = filter_query(
         filters.geneinfo,
@@ -243,14 +292,34 @@ def _group_and_sort(
         db,
     )
     entity = getattr(DiseaseRecord, group_field)
-    q = query.with_entities(entity.label(group_field.lower()), func.count(DiseaseRecord.ID).label("count")).group_by(entity)
+    # count(*) rather than count(ID): ID is never NULL, and the facet indexes can answer it without the table
+    q = query.with_entities(entity.label(group_field.lower()), func.count().label("count")).group_by(entity)
     
     if sort_fn is not None:
         q = q.order_by(sort_fn)
     if limit is not None:
         q = q.limit(limit)
+    return q
+
+
+def _group_and_sort(
+    group_field: str,
+    filters: VariantFilterParams,
+    db: Session,
+    limit: Optional[int] = None,
+    sort_fn=None,
+) -> List[dict]:
+    """
+    Helper to group by a field, count, sort, and optionally limit results.
 
-    results = q.all()
+    :param group_field: Model attribute name to group by.
+    :param filters: VariantFilterParams for query filtering.
+    :param db: Database session.
+    :param limit: Optional maximum number of results.
+    :param sort_fn: Optional SQLAlchemy sort function.
+    :return: List of dicts with lowercased group_field and count.
+    """
+    results = group_count_query(group_field, filters, db, limit, sort_fn).all()
     data = [{group_field.lower(): r[0], "count": r[1]} for r in results]
     return sort_chromosomes(data) if group_field == "CHROM" else data
 
@@ -311,7 +380,7 @@ def variant_counts_gene(
             filters,
             db,
             limit=10,
-            sort_fn=func.count(DiseaseRecord.ID).desc(),
+            sort_fn=func.count().desc(),
         )
         return {"data": data}
     except Exception as e:
@@ -335,3 +404,21 @@ def variant_counts_clnsig(
         return {"data": data}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/genes/suggest")
+def suggest_genes(
+    q: str = Query(..., min_length=1, description="Part of a gene symbol"),
+    limit: int = Query(SUGGEST_LIMIT, ge=1, le=100, description="Maximum suggestions"),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Gene symbols containing `q` for search autocomplete: prefix matches
+    first, then other matches, each by number of variants.
+
+    :param q: Text typed so far (case-insensitive).
+    :param limit: Maximum suggestions.
+    :param db: Database session.
+    :return: {'data': [{'gene', 'variants'}, ...]}
+    """
+    return {"data": gene_suggester.suggest(db, q, limit)}
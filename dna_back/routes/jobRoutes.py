@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from sqlalchemy.orm import Session
+
+from routes.modelRoutes import AttentionOptions, attention_options, build_attention_response
+from utils.dbHandler import get_db
+from utils.jobHandler import (
+    cancel_job,
+    get_job,
+    get_job_results,
+    serialize_job,
+    submit_job,
+)
+
+router = APIRouter()
+
+
+def client_identity(request: Request) -> str:
+    """
+    Identify the caller for the per-client job cap by its remote address.
+
+    The API has no authentication, and anything the client sends itself
+    (e.g. a header) could be changed on every submit. Behind a reverse
+    proxy, run uvicorn with --proxy-headers so this is the real client.
+    """
+    return request.client.host if request.client else "unknown"
+
+
+@router.post("", status_code=202, summary="Submit a FASTA file as a background prediction job")
+def submit_prediction_job(
+    fasta_file: UploadFile = File(...),
+    client_id: str = Depends(client_identity),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Store the upload and queue it on the prediction worker pool.
+
+    :param fasta_file: FASTA file to score.
+    :param client_id: Caller identity.
+    :param db: Database session.
+    :return: {'data': job status}
+    """
+    job = submit_job(client_id, fasta_file.filename, fasta_file.file, db)
+    return {"data": serialize_job(job)}
+
+
+@router.get("/{job_id}", summary="Job status and progress")
+def get_prediction_job(job_id: str, db: Session = Depends(get_db)) -> dict:
+    """
+    Get the status and number of processed records of a job.
+
+    :param job_id: Job ID returned on submission.
+    :param db: Database session.
+    :return: {'data': job status}
+    """
+    return {"data": serialize_job(get_job(job_id, db))}
+
+
+@router.get("/{job_id}/results", summary="One page of a job's results")
+def get_prediction_job_results(
+    job_id: str,
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(100, ge=1, le=1000, description="Results per page"),
+    options: AttentionOptions = Depends(attention_options),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Get stored results of a job in record order. Results are available
+    while the job is still running.
+
+    :param job_id: Job ID returned on submission.
+    :param page: Page number (1-based).
+    :param limit: Results per page.
+    :param options: include_attention / attention_format / attention_top_k.
+    :param db: Database session.
+    :return: {'data': results, 'meta': job status and paging}
+    """
+    try:
+        job, rows = get_job_results(job_id, page, limit, db=db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    data = [
+        {"record_id": rec_id, **build_attention_response(idx, probs, alphas, options).model_dump(exclude_none=True)}
+        for rec_id, idx, probs, alphas in rows
+    ]
+    return {
+        "data": data,
+        "meta": {
+            **serialize_job(job),
+            "page": page,
+            "limit": limit,
+            "total_pages": (job.PROCESSED_RECORDS + limit - 1) // limit,
+        },
+    }
+
+
+@router.delete("/{job_id}", summary="Cancel a job")
+def cancel_prediction_job(job_id: str, db: Session = Depends(get_db)) -> dict:
+    """
+    Cancel a queued or running job. Results stored so far are kept.
+
+    :param job_id: Job ID returned on submission.
+    :param db: Database session.
+    :return: {'data': job status}
+    """
+    return {"data": serialize_job(cancel_job(job_id, db))}
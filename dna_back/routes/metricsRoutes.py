@@ -0,0 +1,59 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from routes.modelRoutes import predict_batcher
+from utils import metrics
+from utils.countCache import count_cache
+from utils.inferenceExecutor import inference_executor
+from utils.predictor import cache_stats, registry_stats
+
+router = APIRouter()
+
+
+def _numeric_lines(prefix: str, stats: dict) -> list:
+    """
+    One sample per numeric field of a stats dict (the /model/registry and
+    /model/cache payloads), labelled by worker when they come from the
+    inference server.
+    """
+    per_worker = stats["workers"] if "workers" in stats else [stats]
+    fields: dict = {}
+    for entry in per_worker:
+        labels = {"worker": entry["worker"]} if "worker" in entry else {}
+        for key, value in entry.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                fields.setdefault(key, []).append((labels, value))
+    lines = []
+    for key, samples in sorted(fields.items()):
+        lines += metrics.gauge_lines(f"{prefix}_{key}", f"{prefix.replace('_', ' ')} {key.replace('_', ' ')}", samples, "untyped")
+    return lines
+
+
+def _batcher_lines() -> list:
+    stats = predict_batcher.stats()
+    lines = metrics.gauge_lines(
+        "dna_microbatch_queue_depth", "Requests waiting per model variant",
+        [({"variant": key}, depth) for key, depth in stats["queue_depth"].items()],
+    )
+    # batches/items are exactly the count and sum of the batch‐size histogram
+    lines += ["# HELP dna_microbatch_batch_size Requests per flushed micro‐batch", "# TYPE dna_microbatch_batch_size histogram"]
+    lines += [f'dna_microbatch_batch_size_bucket{{le="{bound}"}} {count}' for bound, count in stats["batch_size_histogram"].items()]
+    lines += [f"dna_microbatch_batch_size_sum {stats['items']}", f"dna_microbatch_batch_size_count {stats['batches']}"]
+    return lines
+
+
+metrics.register_collector(_batcher_lines)
+metrics.register_collector(lambda: _numeric_lines("dna_inference_executor", inference_executor.stats()))
+metrics.register_collector(lambda: _numeric_lines("dna_model_registry", registry_stats()))
+metrics.register_collector(lambda: _numeric_lines("dna_prediction_cache", cache_stats()))
+metrics.register_collector(lambda: _numeric_lines("dna_count_cache", count_cache.stats()))
+
+
+@router.get("", response_class=PlainTextResponse, summary="Prometheus metrics")
+def get_metrics() -> PlainTextResponse:
+    """
+    Stage and request latency histograms plus micro‐batching, inference
+    executor, model registry, prediction cache and count cache statistics, in the Prometheus text
+    exposition format.
+    """
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -1,17 +1,110 @@
+import asyncio
+import json
+import os
 import re
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from pydantic import BaseModel, field_validator
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError, field_validator
+from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
 from typing import List, Optional
-from Bio import SeqIO
 from io import StringIO
 
-from utils.modelHandler import (
-    attention_predict_auto,
-    label_map,
+from db.DiseaseRecord import DiseaseRecord
+from utils.attentionEncoding import (
+    ATTENTION_FLOAT16,
+    ATTENTION_FORMATS,
+    ATTENTION_LIST,
+    ATTENTION_TOPK,
+    ATTENTION_UINT8,
+    encode_float16,
+    encode_uint8,
+    top_k,
 )
+from utils.dbHandler import get_db
+from utils.fastaHandler import FastaRecord, FastaStreamParser, iter_fasta_records
+from utils.inferenceExecutor import ExecutorFull, inference_executor
+from utils.metrics import timed
+from utils.microBatcher import MicroBatcher
+from utils.modelOptions import select_variant, TILE_LONG_SEQUENCES, TRAIN_CHROMS
+from utils.uploadStream import iter_form_file
+from utils.predictor import (
+    attention_predict_batch,
+    cache_stats as model_cache_stats,
+    get_label_map,
+    model_version,
+    registry_stats as model_registry_stats,
+)
+from utils.variantPredictions import load_predictions, save_predictions, score_records
 
 router = APIRouter()
-TRAIN_CHROMS = {str(i) for i in range(1, 23)} | {"X"}
+MAX_BATCH_REQUESTS = 10000
+FASTA_STREAM_CHUNK = int(os.getenv("DNA_FASTA_STREAM_CHUNK", "256"))
+DEFAULT_ATTENTION_TOP_K = 10
+
+
+def _predict_items(items: List[tuple]) -> list:
+    """
+    Predict (sequence, chromosome, gene_info, tile_long, with_attention)
+    items in as few batched calls as possible, in item order. If a batch
+    fails validation, retry one by one so a single bad item does not fail
+    its neighbours; the failing items get their ValueError as result.
+    """
+    results: list = [None] * len(items)
+    for tile_long in {item[3] for item in items}:
+        rows = [i for i, item in enumerate(items) if item[3] == tile_long]
+        with_attention = any(items[i][4] for i in rows)
+        try:
+            outputs = attention_predict_batch(
+                sequences=[items[i][0] for i in rows],
+                chromosomes=[items[i][1] for i in rows],
+                gene_infos=[items[i][2] for i in rows],
+                tile_long=tile_long,
+                with_attention=with_attention,
+            )
+        except ValueError:
+            outputs = []
+            for i in rows:
+                seq, chrom, gene, _, _ = items[i]
+                try:
+                    outputs.extend(attention_predict_batch(
+                        [seq], [chrom], [gene], tile_long=tile_long, with_attention=with_attention,
+                    ))
+                except ValueError as e:
+                    outputs.append(e)
+        for i, output in zip(rows, outputs):
+            results[i] = output
+    return results
+
+
+# Concurrent /predict calls are coalesced per model variant
+predict_batcher = MicroBatcher(
+    batch_fn=_predict_items,
+    max_batch_size=int(os.getenv("DNA_MICROBATCH_MAX_SIZE", "32")),
+    max_wait_ms=float(os.getenv("DNA_MICROBATCH_MAX_WAIT_MS", "5")),
+    executor=inference_executor,
+)
+
+
+def _busy(e: ExecutorFull) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+async def run_inference(fn, *args):
+    """
+    Run `fn(*args)` on the bounded inference executor so the event loop
+    stays free for other requests; 503 with Retry‐After when it is full.
+    """
+    try:
+        return await asyncio.get_running_loop().run_in_executor(inference_executor, fn, *args)
+    except ExecutorFull as e:
+        raise _busy(e)
+
+
+def _json_list_response(responses: List["AttentionResponse"]) -> Response:
+    # Encoded here, on the inference thread, rather than by FastAPI on the event loop
+    body = "[" + ",".join(r.model_dump_json(exclude_none=True) for r in responses) + "]"
+    return Response(content=body, media_type="application/json")
 
 
 # attention‐based prediction
@@ -21,6 +114,12 @@ class AttentionResponseClassConf(BaseModel):
     confidence: float
 
 
+class AttentionPeak(BaseModel):
+    """One time step of a top‐k attention summary."""
+    position: int
+    weight:   float
+
+
 class AttentionResponse(BaseModel):
     """
     Response for attention‐based prediction:
@@ -28,19 +127,78 @@ class AttentionResponse(BaseModel):
       - prediction_label   (str)
       - confidence         (float)
       - confidences        (list of { label, confidence })
-      - attention_weights  (list of floats, one α per time step)
+      - attention_weights  (list of floats, one α per time step; attention_format="list")
+      - attention_encoded  (base64 α array; attention_format="float16" or "uint8")
+      - attention_dtype    ("float16" or "uint8", for attention_encoded)
+      - attention_scale    (α ≈ byte * scale; attention_format="uint8")
+      - attention_top_k    (largest α with positions; attention_format="topk")
+
+    Attention fields that do not apply are left out of the response.
     """
     prediction_idx:    int
     prediction_label:  str
     confidence:        float
     confidences:       List[AttentionResponseClassConf]
-    attention_weights: List[float]
+    attention_weights: Optional[List[float]] = None
+    attention_encoded: Optional[str] = None
+    attention_dtype:   Optional[str] = None
+    attention_scale:   Optional[float] = None
+    attention_top_k:   Optional[List[AttentionPeak]] = None
+
+
+class RecordPredictionResponse(BaseModel):
+    """
+    Predictions for a stored DiseaseRecord:
+      - normal / mutated (AttentionResponse for NormalSeq / MUTATED_SEQ;
+        left out if the record has no valid sequence in that column)
+      - source ("precomputed" from variant_predictions, or "live")
+    """
+    record_id:      int
+    model_version:  str
+    source:         str
+    normal:         Optional[AttentionResponse] = None
+    mutated:        Optional[AttentionResponse] = None
+
 
+class AttentionOptions(BaseModel):
+    """How (and whether) to return the attention weights."""
+    include_attention: bool = True
+    attention_format:  str = ATTENTION_LIST
+    attention_top_k:   int = DEFAULT_ATTENTION_TOP_K
 
-class PredictRequest(BaseModel):
+    @field_validator("attention_format")
+    def valid_format(cls, fmt):
+        if fmt not in ATTENTION_FORMATS:
+            raise ValueError(f"attention_format must be one of {list(ATTENTION_FORMATS)}")
+        return fmt
+
+    @field_validator("attention_top_k")
+    def valid_top_k(cls, k):
+        if k < 1:
+            raise ValueError("attention_top_k must be at least 1.")
+        return k
+
+
+def attention_options(
+    include_attention: bool = Query(True, description="Return attention weights at all"),
+    attention_format: str = Query(ATTENTION_LIST, description=f"One of {list(ATTENTION_FORMATS)}"),
+    attention_top_k: int = Query(DEFAULT_ATTENTION_TOP_K, ge=1, description="Positions for attention_format=topk"),
+) -> AttentionOptions:
+    """Query‐parameter form of AttentionOptions for the FASTA endpoints."""
+    if attention_format not in ATTENTION_FORMATS:
+        raise HTTPException(status_code=400, detail=f"attention_format must be one of {list(ATTENTION_FORMATS)}")
+    return AttentionOptions(
+        include_attention=include_attention,
+        attention_format=attention_format,
+        attention_top_k=attention_top_k,
+    )
+
+
+class PredictRequest(AttentionOptions):
     sequence:    str
     chromosome:  Optional[str] = None
     gene_info:   Optional[str] = None
+    tile_long:   bool = TILE_LONG_SEQUENCES   # sliding windows instead of truncating at MAX_LEN_BILSTM
 
     @field_validator("sequence")
     def only_atcg(cls, seq):
@@ -68,93 +226,389 @@ class PredictRequest(BaseModel):
         return gi2
 
 
+def validate_record_metadata(records: List[FastaRecord]) -> List[FastaRecord]:
+    """
+    Check the header chromosome/gene of FASTA records with the same rules as
+    PredictRequest and return the records with the normalized values.
+
+    Raises:
+        ValueError: Naming the first record with invalid metadata.
+    """
+    checked = []
+    for rec in records:
+        if rec.chromosome is None and rec.gene_info is None:
+            checked.append(rec)
+            continue
+        try:
+            req = PredictRequest(sequence=rec.sequence, chromosome=rec.chromosome, gene_info=rec.gene_info)
+        except ValidationError as e:
+            raise ValueError(f"Record {rec.record_id}: {e.errors()[0]['msg']}")
+        checked.append(rec._replace(chromosome=req.chromosome, gene_info=req.gene_info))
+    return checked
+
+
+def build_attention_response(idx: int, probs, alphas, options: AttentionOptions = None) -> AttentionResponse:
+    """
+    Turn one (idx, probs, alphas) model output into an AttentionResponse,
+    with the attention weights in the format asked for by `options`
+    (default: the full list).
+    """
+    label_map = get_label_map()
+    options = options or AttentionOptions()
+
+    # Build a list of {label, confidence}
+    confs = [
+        AttentionResponseClassConf(label=label_map[str(i)], confidence=float(p))
+        for i, p in enumerate(probs)
+    ]
+
+    attention = {}
+    if options.include_attention and alphas is not None:
+        if options.attention_format == ATTENTION_LIST:
+            attention["attention_weights"] = [float(a) for a in alphas]
+        elif options.attention_format == ATTENTION_FLOAT16:
+            attention["attention_encoded"] = encode_float16(alphas)
+            attention["attention_dtype"] = ATTENTION_FLOAT16
+        elif options.attention_format == ATTENTION_UINT8:
+            attention["attention_encoded"], attention["attention_scale"] = encode_uint8(alphas)
+            attention["attention_dtype"] = ATTENTION_UINT8
+        elif options.attention_format == ATTENTION_TOPK:
+            attention["attention_top_k"] = [
+                AttentionPeak(position=pos, weight=weight)
+                for pos, weight in top_k(alphas, options.attention_top_k)
+            ]
+
+    return AttentionResponse(
+        prediction_idx=idx,
+        prediction_label=label_map[str(idx)],
+        confidence=float(probs[idx]),
+        confidences=confs,
+        **attention,
+    )
+
+
 @router.post(
     "/predict",
     response_model=AttentionResponse,
+    response_model_exclude_none=True,
     summary="Predict on a DNA sequence (returns attention weights)",
 )
-def predict(req: PredictRequest) -> AttentionResponse:
+async def predict(req: PredictRequest) -> AttentionResponse:
     """
-    This endpoint always returns both class probabilities and the raw attention weights.
-    Internally, it calls `attention_predict_auto(...)` under the hood.
+    Returns class probabilities and, unless `include_attention` is false,
+    the attention weights in `attention_format`. Concurrent requests for the same model variant are micro‐batched into
+    one `attention_predict_batch(...)` call.
     """
     if not req.sequence:
         raise HTTPException(status_code=400, detail="Sequence cannot be empty.")
 
     try:
-        idx, probs, alphas = attention_predict_auto(
-            sequence=req.sequence,
-            chromosome=req.chromosome,
-            gene_info=req.gene_info,
+        idx, probs, alphas = await predict_batcher.submit(
+            select_variant(req.chromosome, req.gene_info) + ("+tiled" if req.tile_long else ""),
+            (req.sequence, req.chromosome, req.gene_info, req.tile_long, req.include_attention),
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorFull as e:
+        raise _busy(e)
 
-    # Build a list of {label, confidence}
-    confs = [
-        AttentionResponseClassConf(label=label_map[str(i)], confidence=float(p))
-        for i, p in enumerate(probs)
-    ]
+    with timed("serialize"):
+        return build_attention_response(idx, probs, alphas, req)
 
-    attention_list = [float(a) for a in alphas]
 
-    return AttentionResponse(
-        prediction_idx=idx,
-        prediction_label=label_map[str(idx)],
-        confidence=float(probs[idx]),
-        confidences=confs,
-        attention_weights=attention_list,
+@router.post(
+    "/predict/batch",
+    response_model=List[AttentionResponse],
+    response_model_exclude_none=True,
+    summary="Predict on many DNA sequences in one batched pass",
+)
+async def predict_batch(reqs: List[PredictRequest]) -> List[AttentionResponse]:
+    """
+    Same as `/predict`, but for a list of requests. Requests are grouped by
+    model variant and each group runs through the models in one batch on
+    the inference executor; responses come back in request order.
+    """
+    if not reqs:
+        raise HTTPException(status_code=400, detail="Request list cannot be empty.")
+    if len(reqs) > MAX_BATCH_REQUESTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_REQUESTS} sequences per batch.",
+        )
+
+    return await run_inference(_predict_batch_response, reqs)
+
+
+def _predict_batch_response(reqs: List[PredictRequest]) -> Response:
+    outputs = _predict_items(
+        [(r.sequence, r.chromosome, r.gene_info, r.tile_long, r.include_attention) for r in reqs]
     )
+    for i, output in enumerate(outputs):
+        if isinstance(output, ValueError):
+            raise HTTPException(status_code=400, detail=f"Request {i}: {output}")
+
+    with timed("serialize"):
+        return _json_list_response(
+            [build_attention_response(idx, probs, alphas, r) for r, (idx, probs, alphas) in zip(reqs, outputs)]
+        )
 
 
 @router.post(
     "/predict/fasta",
     response_model=List[AttentionResponse],
+    response_model_exclude_none=True,
     summary="Predict + return attention weights for each record in FASTA",
 )
 async def predict_fasta(
     fasta_file: UploadFile = File(...),
+    tile_long: bool = Query(TILE_LONG_SEQUENCES, description="Score long sequences with sliding windows"),
+    parse_headers: bool = Query(False, description="Use chrom=/gene= tokens from the record headers"),
+    options: AttentionOptions = Depends(attention_options),
 ) -> List[AttentionResponse]:
     """
     Accepts a FASTA file, processes each valid ATCG record, and returns
     AttentionResponse for each sequence. Invalid or non‐ATCG records are skipped.
+    Parsing, inference and encoding run on the inference executor.
+
+    With `parse_headers`, `chrom=` and `gene=` tokens in a record's header
+    (e.g. `>var1 chrom=17 gene=BRCA1`) select the model variant for that
+    record; they are validated like PredictRequest (400 if invalid). All
+    records of one variant run through the model as one batch, and results
+    keep the record order.
     """
+    contents = await fasta_file.read()
+    return await run_inference(_predict_fasta_response, contents, tile_long, parse_headers, options)
+
+
+def _predict_fasta_response(contents: bytes, tile_long: bool, parse_headers: bool, options: AttentionOptions) -> Response:
     try:
-        contents = fasta_file.file.read()
-        text = contents.decode("utf-8-sig")
-        records = list(SeqIO.parse(StringIO(text), "fasta"))
+        with timed("parse"):
+            text = contents.decode("utf-8-sig")
+            records = list(iter_fasta_records(StringIO(text), parse_headers))
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid FASTA format")
 
-    results: List[AttentionResponse] = []
-    for rec in records:
-        seq = str(rec.seq).strip().upper()
-        if not re.fullmatch(r"[ATCG]+", seq):
-            # Skip any record whose sequence is not purely ATCG
-            continue
+    try:
+        records = validate_record_metadata(records)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    results: List[AttentionResponse] = []
+    if records:
         try:
-            idx, probs, alphas = attention_predict_auto(sequence=seq)
+            # Grouped by variant (and length bucket) inside, one forward pass per group
+            outputs = attention_predict_batch(
+                sequences=[rec.sequence for rec in records],
+                chromosomes=[rec.chromosome for rec in records],
+                gene_infos=[rec.gene_info for rec in records],
+                tile_long=tile_long,
+                with_attention=options.include_attention,
+            )
         except ValueError:
-            # Skip sequences that fail preprocessing/validation
+            raise HTTPException(status_code=400, detail="Failed to preprocess FASTA sequences")
+        with timed("serialize"):
+            results = [build_attention_response(idx, probs, alphas, options) for idx, probs, alphas in outputs]
+
+    if not results:
+        raise HTTPException(status_code=400, detail="No valid ATCG sequences found in FASTA")
+    with timed("serialize"):
+        return _json_list_response(results)
+
+
+class _UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator reads the request body itself.
+
+    The base class also reads `receive` to notice a disconnect, which would
+    take upload chunks away from the body iterator; here a disconnect shows
+    up as ClientDisconnect from `request.stream()` instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+# Request body of /predict/fasta/stream for the OpenAPI docs; the handler
+# reads the multipart form itself
+_FASTA_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["fasta_file"],
+            "properties": {"fasta_file": {"type": "string", "format": "binary"}},
+        }}},
+    },
+}
+
+
+def _stream_chunk_lines(chunk: List[FastaRecord], tile_long: bool, options: AttentionOptions) -> str:
+    """Score one chunk of FASTA records and encode it as NDJSON lines."""
+    chunk = validate_record_metadata(chunk)
+    outputs = attention_predict_batch(
+        [rec.sequence for rec in chunk],
+        [rec.chromosome for rec in chunk],
+        [rec.gene_info for rec in chunk],
+        tile_long,
+        options.include_attention,
+    )
+    return "".join(
+        json.dumps({
+            "record_id": rec.record_id,
+            **build_attention_response(idx, probs, alphas, options).model_dump(exclude_none=True),
+        }) + "\n"
+        for rec, (idx, probs, alphas) in zip(chunk, outputs)
+    )
+
+
+@router.post(
+    "/predict/fasta/stream",
+    summary="Stream predictions for each record in FASTA as NDJSON",
+    openapi_extra=_FASTA_UPLOAD_BODY,
+)
+async def predict_fasta_stream(
+    request: Request,
+    tile_long: bool = Query(TILE_LONG_SEQUENCES, description="Score long sequences with sliding windows"),
+    parse_headers: bool = Query(False, description="Use chrom=/gene= tokens from the record headers"),
+    options: AttentionOptions = Depends(attention_options),
+) -> StreamingResponse:
+    """
+    Streaming variant of `/predict/fasta` (same `fasta_file` form field).
+    Records are parsed from the upload while it is still being received
+    and scored in chunks of `DNA_FASTA_STREAM_CHUNK`; every result is sent
+    as one JSON line (AttentionResponse fields plus `record_id`) as soon as
+    its chunk is done, so the first results arrive before the upload ends
+    and memory stays flat for any file size.
+
+    Invalid or non‐ATCG records are skipped. A failure mid‐stream, including
+    a malformed form and invalid header metadata with `parse_headers`, ends
+    the stream with a final `{"error": ...}` line.
+
+    Chunks are scored on the inference executor. A full executor is a 503
+    before the stream starts; once it has started, the stream waits for a
+    free slot instead.
+    """
+    if inference_executor.full():
+        raise _busy(ExecutorFull(inference_executor.retry_after()))
+    if not request.headers.get("content-type", "").lower().startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Upload the FASTA file as multipart/form-data field 'fasta_file'")
+
+    async def generate():
+        sent = 0
+        parser = FastaStreamParser(parse_headers)
+        pending: List[FastaRecord] = []
+        try:
+            async for data in iter_form_file(request, "fasta_file"):
+                pending.extend(parser.feed(data))
+                while len(pending) >= FASTA_STREAM_CHUNK:
+                    chunk, pending = pending[:FASTA_STREAM_CHUNK], pending[FASTA_STREAM_CHUNK:]
+                    yield await _run_waiting(_stream_chunk_lines, chunk, tile_long, options)
+                    sent += len(chunk)
+            pending.extend(parser.close())
+            for start in range(0, len(pending), FASTA_STREAM_CHUNK):
+                chunk = pending[start : start + FASTA_STREAM_CHUNK]
+                yield await _run_waiting(_stream_chunk_lines, chunk, tile_long, options)
+                sent += len(chunk)
+            if not sent:
+                yield json.dumps({"error": "No valid ATCG sequences found in FASTA"}) + "\n"
+        except (ValueError, UnicodeDecodeError) as e:
+            yield json.dumps({"error": f"Failed after {sent} records: {e}"}) + "\n"
+
+    return _UploadStreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+async def _run_waiting(fn, *args):
+    """Run `fn(*args)` on the inference executor, waiting while it is full."""
+    while True:
+        try:
+            future = inference_executor.submit(fn, *args)
+        except ExecutorFull as e:
+            await asyncio.sleep(min(e.retry_after, 1.0))
             continue
+        return await asyncio.wrap_future(future)
 
-        confs = [
-            AttentionResponseClassConf(label=label_map[str(i)], confidence=float(p))
-            for i, p in enumerate(probs)
-        ]
-        attention_list = [float(a) for a in alphas]
-
-        results.append(
-            AttentionResponse(
-                prediction_idx=idx,
-                prediction_label=label_map[str(idx)],
-                confidence=float(probs[idx]),
-                confidences=confs,
-                attention_weights=attention_list,
-            )
+
+@router.get(
+    "/predict/record/{record_id}",
+    response_model=RecordPredictionResponse,
+    response_model_exclude_none=True,
+    summary="Predictions for a stored disease record (precomputed or live)",
+)
+def predict_record(
+    record_id: int,
+    options: AttentionOptions = Depends(attention_options),
+    db: Session = Depends(get_db),
+) -> RecordPredictionResponse:
+    """
+    Serve the NormalSeq/MUTATED_SEQ predictions of a disease record from
+    variant_predictions (see scripts/backfill_predictions.py) for the
+    current model version. When there are none, or attention was asked for
+    but stored without it, the record is scored live (CHROM and the
+    GENEINFO symbol as model inputs) and the result is stored for next time.
+    """
+    version = model_version()
+    with timed("lookup"):
+        stored = load_predictions(db, record_id, version)
+    source = "precomputed"
+
+    if not stored or (options.include_attention and any(alphas is None for _, _, alphas in stored.values())):
+        record = db.get(DiseaseRecord, record_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Record not found")
+        row = (record.ID, record.CHROM, record.GENEINFO, record.NormalSeq, record.MUTATED_SEQ)
+        try:
+            rows = inference_executor.submit(score_records, [row], version, options.include_attention).result()
+        except ExecutorFull as e:
+            raise _busy(e)
+        if not rows:
+            raise HTTPException(status_code=404, detail="Record has no valid ATCG sequence")
+        save_predictions(db, rows)
+        stored = load_predictions(db, record_id, version)
+        source = "live"
+
+    with timed("serialize"):
+        return RecordPredictionResponse(
+            record_id=record_id,
+            model_version=version,
+            source=source,
+            **{kind: build_attention_response(idx, probs, alphas, options) for kind, (idx, probs, alphas) in stored.items()},
         )
 
-    if not results:
-        raise HTTPException(status_code=400, detail="No valid ATCG sequences found in FASTA")
-    return results
+
+@router.get("/registry", summary="Model registry load/hit/evict statistics")
+def registry_stats() -> dict:
+    """
+    Report which model variants are resident and how often they were
+    loaded, served from memory, or evicted.
+    """
+    return {"data": model_registry_stats()}
+
+
+@router.get("/batcher", summary="Micro‐batching queue depth and batch‐size histogram")
+def batcher_stats() -> dict:
+    """
+    Report queue depth per model variant and how large the flushed
+    /predict batches were.
+    """
+    return {"data": predict_batcher.stats()}
+
+
+@router.get("/executor", summary="Inference executor slots, queue and rejections")
+def executor_stats() -> dict:
+    """
+    Report running and queued inference calls, the limits, and how many
+    calls were turned away with 503.
+    """
+    return {"data": inference_executor.stats()}
+
+
+@router.get("/cache", summary="Prediction cache hit/miss statistics")
+def cache_stats() -> dict:
+    """
+    Report prediction cache hits (memory and disk tier), misses, size and
+    the model version the cached entries belong to.
+    """
+    return {"data": model_cache_stats()}
@@ -0,0 +1,131 @@
+"""
+Precompute predictions for every stored DiseaseRecord variant.
+
+Streams disease_records in ID order, `--chunk-size` records at a time,
+and scores NormalSeq and MUTATED_SEQ of each record with the batched
+models (CHROM and the GENEINFO symbol select the model variant where the
+models support them). Results go into variant_predictions keyed by
+record ID, model version and sequence kind, which `/model/predict/record/{id}`
+serves without running the models.
+
+Chunks are scored in parallel by `--workers` processes, each loading the
+models once; this process only reads records and writes results, one
+commit per chunk. Records that already have predictions for the current
+model version are skipped, so an interrupted run resumes where it
+stopped, and a new model version is backfilled from scratch.
+
+Usage (from dna_back/):
+    python -m scripts.backfill_predictions --workers 4 --chunk-size 512
+    python -m scripts.backfill_predictions --no-attention   # probabilities only, far smaller rows
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from sqlalchemy import exists, select
+
+from db.DiseaseRecord import DiseaseRecord
+from db.VariantPrediction import VariantPrediction
+from utils.database import SessionLocal
+from utils.variantPredictions import create_variant_prediction_table, save_predictions, score_records
+
+
+def _init_worker(threads: int) -> None:
+    os.environ["DNA_PREDICTION_CACHE_SIZE"] = "0"  # every sequence is seen once
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+    from utils.predictor import INFERENCE_SERVER
+    if not INFERENCE_SERVER:
+        from utils.modelHandler import MODEL_PATHS, model_registry
+        model_registry.preload(MODEL_PATHS)
+
+
+def _model_version() -> str:
+    from utils.predictor import model_version
+    return model_version()
+
+
+def _pending_chunks(db, model_version: str, chunk_size: int):
+    """Yield lists of record rows without predictions for `model_version`, by ascending ID."""
+    done = exists().where(
+        VariantPrediction.RECORD_ID == DiseaseRecord.ID,
+        VariantPrediction.MODEL_VERSION == model_version,
+    )
+    last_id = None
+    while True:
+        query = (
+            select(DiseaseRecord.ID, DiseaseRecord.CHROM, DiseaseRecord.GENEINFO, DiseaseRecord.NormalSeq, DiseaseRecord.MUTATED_SEQ)
+            .where(~done)
+            .order_by(DiseaseRecord.ID)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            query = query.where(DiseaseRecord.ID > last_id)
+        rows = [tuple(row) for row in db.execute(query)]
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def backfill(workers: int, chunk_size: int, with_attention: bool, limit: int = 0) -> None:
+    create_variant_prediction_table()
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    db = SessionLocal()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(threads,),
+    )
+    try:
+        model_version = pool.submit(_model_version).result()
+        print(f"Model version {model_version}; {workers} workers × {threads} threads")
+
+        start = time.perf_counter()
+        records = predictions = 0
+        in_flight = set()
+
+        def collect(futures) -> None:
+            nonlocal predictions
+            for future in futures:
+                rows = future.result()
+                save_predictions(db, rows)
+                predictions += len(rows)
+
+        for chunk in _pending_chunks(db, model_version, chunk_size):
+            if limit and records >= limit:
+                break
+            in_flight.add(pool.submit(score_records, chunk, model_version, with_attention))
+            records += len(chunk)
+            if len(in_flight) >= 2 * workers:  # bounded read‐ahead
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+                elapsed = time.perf_counter() - start
+                print(f"{records} records read, {predictions} predictions stored, {predictions / elapsed:.0f}/s", flush=True)
+        collect(in_flight)
+
+        elapsed = time.perf_counter() - start
+        print(f"Done: {records} records, {predictions} predictions in {elapsed:.0f}s")
+    finally:
+        pool.shutdown(cancel_futures=True)
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=512, help="Records per batch and per commit")
+    parser.add_argument("--no-attention", action="store_true", help="Store probabilities only")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after about this many records (0 = all)")
+    args = parser.parse_args()
+
+    backfill(args.workers, args.chunk_size, not args.no_attention, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Accuracy drift, throughput and memory of each inference backend.
+
+Every backend runs in its own spawned process (so its memory is measured
+on its own) on the same held‐out set through `attention_predict_batch`,
+with the prediction cache disabled. Outputs are compared with the Keras
+backend:
+
+    probs_max_abs / probs_mean_abs   drift of the class probabilities
+    top1_agreement                   fraction of rows with the same label
+    alphas_max_abs                   drift of the attention weights
+
+The held‐out set is sampled from disease_records (MUTATED_SEQ, CHROM and
+the GENEINFO symbol) with `--from-db`, or is random sequences otherwise.
+TFLite backends need `python -m scripts.export_tflite` first; missing
+exports are skipped.
+
+Usage (from dna_back/):
+    python -m scripts.bench_backends --samples 2000 --from-db --out backends.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import time
+
+import numpy as np
+
+# (report name, DNA_* environment for the worker)
+BACKENDS = [
+    ("keras",          {"DNA_INFERENCE_BACKEND": "keras"}),
+    ("graph",          {"DNA_INFERENCE_BACKEND": "graph"}),
+    ("tflite_none",    {"DNA_INFERENCE_BACKEND": "tflite", "DNA_TFLITE_QUANTIZATION": "none"}),
+    ("tflite_dynamic", {"DNA_INFERENCE_BACKEND": "tflite", "DNA_TFLITE_QUANTIZATION": "dynamic"}),
+    ("tflite_float16", {"DNA_INFERENCE_BACKEND": "tflite", "DNA_TFLITE_QUANTIZATION": "float16"}),
+]
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _held_out_set(samples: int, from_db: bool) -> tuple[list, list, list]:
+    if from_db:
+        from sqlalchemy import func
+        from db.DiseaseRecord import DiseaseRecord
+        from utils.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(DiseaseRecord.MUTATED_SEQ, DiseaseRecord.CHROM, DiseaseRecord.GENEINFO)
+                .filter(DiseaseRecord.MUTATED_SEQ.isnot(None))
+                .order_by(func.random())
+                .limit(samples)
+                .all()
+            )
+        finally:
+            db.close()
+        return (
+            [seq for seq, _, _ in rows],
+            [chrom for _, chrom, _ in rows],
+            [gene.split(":")[0] if gene else None for _, _, gene in rows],
+        )
+
+    rng = random.Random(0)
+    seqs = ["".join(rng.choice("ACGT") for _ in range(rng.randint(30, 402))) for _ in range(samples)]
+    return seqs, [None] * samples, [None] * samples
+
+
+def _init_worker(env: dict) -> None:
+    os.environ.update(env)
+    os.environ["DNA_PREDICTION_CACHE_SIZE"] = "0"
+    os.environ["DNA_PRELOAD_MODEL_VARIANTS"] = ""
+
+
+def _run_backend(seqs: list, chroms: list, genes: list, batch_size: int, repeats: int) -> dict:
+    from utils import modelHandler as mh
+
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    mh.model_registry.preload(mh.MODEL_PATHS)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = _rss_mb()
+
+    outputs = mh.attention_predict_batch(seqs, chroms, genes, batch_size=batch_size)  # warm
+    start = time.perf_counter()
+    for _ in range(repeats):
+        outputs = mh.attention_predict_batch(seqs, chroms, genes, batch_size=batch_size)
+    seconds = (time.perf_counter() - start) / repeats
+
+    return {
+        "probs":          np.stack([probs for _, probs, _ in outputs]),
+        "alphas":         np.stack([alphas for _, _, alphas in outputs]),
+        "load_seconds":   load_seconds,
+        "seq_per_second": len(seqs) / seconds,
+        "model_bytes":    mh.model_registry.resident_bytes(),
+        "rss_models_mb":  rss_loaded - rss_before,
+        "rss_peak_mb":    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--from-db", action="store_true", help="Sample the held‐out set from disease_records")
+    parser.add_argument("--backends", nargs="+", default=[name for name, _ in BACKENDS])
+    parser.add_argument("--out", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    seqs, chroms, genes = _held_out_set(args.samples, args.from_db)
+    ctx = multiprocessing.get_context("spawn")
+
+    results = {}
+    for name, env in BACKENDS:
+        if name not in args.backends:
+            continue
+        with ctx.Pool(1, initializer=_init_worker, initargs=(env,)) as pool:
+            try:
+                results[name] = pool.apply(_run_backend, (seqs, chroms, genes, args.batch_size, args.repeats))
+            except FileNotFoundError as e:
+                print(f"skipping {name}: {e}")
+
+    reference = results.get("keras")
+    report = {}
+    for name, r in results.items():
+        entry = {k: v for k, v in r.items() if k not in ("probs", "alphas")}
+        if reference is not None:
+            probs_diff = np.abs(r["probs"] - reference["probs"])
+            entry.update({
+                "probs_max_abs":  float(probs_diff.max()),
+                "probs_mean_abs": float(probs_diff.mean()),
+                "top1_agreement": float(np.mean(r["probs"].argmax(1) == reference["probs"].argmax(1))),
+                "alphas_max_abs": float(np.abs(r["alphas"] - reference["alphas"]).max()),
+            })
+        report[name] = entry
+
+    print(f"samples={len(seqs)}")
+    print(f"{'backend':16s} {'seq/s':>9s} {'models MB':>10s} {'peak MB':>9s} {'Δprobs max':>11s} {'top1':>7s} {'Δalphas max':>12s}")
+    for name, e in report.items():
+        print(
+            f"{name:16s} {e['seq_per_second']:9.0f} {e['rss_models_mb']:10.1f} {e['rss_peak_mb']:9.1f} "
+            f"{e.get('probs_max_abs', float('nan')):11.2e} {e.get('top1_agreement', float('nan')):7.3f} "
+            f"{e.get('alphas_max_abs', float('nan')):12.2e}"
+        )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"samples": len(seqs), "backends": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
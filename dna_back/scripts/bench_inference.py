@@ -0,0 +1,231 @@
+"""
+Inference benchmark over model variants, batch sizes, sequence lengths and
+client concurrency.
+
+Each configuration sends `--requests` requests of `batch size` random
+sequences of one length through the same stages as the prediction path,
+with `concurrency` client threads, and times every stage:
+
+    tokenize   k‐mer tokenization and padding
+    ohe        chromosome/gene one‐hot encoding and input assembly
+    forward    model forward pass (per length bucket, like the server)
+    serialize  AttentionResponse construction + JSON encoding
+
+It reports throughput, p50/p95/p99 request latency, mean stage times and
+process RSS, and writes everything (plus commit, versions and DNA_*
+settings) to a JSON file. `--compare` prints the change against an
+earlier result file.
+
+When the trained `.keras` files are missing (or with `--standin`),
+random stand‐in models from scripts/make_standin_models.py are generated
+in a temporary directory and used instead; the report records which.
+
+Usage (from dna_back/):
+    python -m scripts.bench_inference --batch-sizes 1 32 --lengths 100 400 --concurrency 1 4 --out bench.json
+    python -m scripts.bench_inference --out new.json --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+STAGES = ("tokenize", "ohe", "forward", "serialize")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return float("nan")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024.0  # bytes on macOS, KiB on Linux
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _prepare_models(force_standin: bool) -> bool:
+    """Point DNA_MODEL_DIR at stand‐ins if needed. Must run before modelHandler is imported."""
+    default_dir = Path(__file__).resolve().parent.parent / "Model" / "Attention"
+    model_dir = Path(os.getenv("DNA_MODEL_DIR", str(default_dir)))
+    if not force_standin and (model_dir / "seq_only_model.keras").exists():
+        return False
+
+    from scripts.make_standin_models import build_standin_models
+
+    out = build_standin_models(Path(tempfile.mkdtemp(prefix="dna-standin-")))
+    os.environ["DNA_MODEL_DIR"] = str(out)
+    print(f"Using stand‐in models in {out}")
+    return True
+
+
+def _request(mh, build_response, variant: str, batch_size: int, length: int, rng: random.Random) -> dict:
+    seqs = ["".join(rng.choice("ACGT") for _ in range(length)) for _ in range(batch_size)]
+    chroms = [rng.choice(["1", "7", "17", "X"]) if variant in (mh.VARIANT_CHR, mh.VARIANT_CHRGENE) else None] * batch_size
+    genes = [
+        str(mh.gene_ohe.categories_[0][0]) if variant in (mh.VARIANT_GENE, mh.VARIANT_CHRGENE) else None
+    ] * batch_size
+    runner = mh.model_registry.get(variant)
+    timings = dict.fromkeys(STAGES, 0.0)
+
+    t0 = time.perf_counter()
+    tokens = mh.preprocess_sequences(seqs, mh.MAX_LEN_BILSTM)
+    timings["tokenize"] = time.perf_counter() - t0
+
+    rows = list(range(batch_size))
+    groups = mh.bucket_rows(tokens, rows) if runner.variable_length else [(tokens.shape[1], rows)]
+    probs = np.empty((batch_size, len(mh.label_map)), dtype=np.float32)
+    alphas = np.empty((batch_size, mh.MAX_LEN_BILSTM), dtype=np.float32)
+    for width, group in groups:
+        t = time.perf_counter()
+        inputs = mh._build_inputs(variant, tokens[group, :width], [chroms[i] for i in group], [genes[i] for i in group])
+        timings["ohe"] += time.perf_counter() - t
+        t = time.perf_counter()
+        probs[group], alphas[group] = runner(inputs, mh.INFERENCE_BATCH_SIZE)
+        timings["forward"] += time.perf_counter() - t
+
+    t = time.perf_counter()
+    body = "[" + ",".join(
+        build_response(int(np.argmax(p)), p, a).model_dump_json() for p, a in zip(probs, alphas)
+    ) + "]"
+    timings["serialize"] = time.perf_counter() - t
+    timings["total"] = time.perf_counter() - t0
+    timings["bytes"] = len(body)
+    return timings
+
+
+def run_config(mh, build_response, variant: str, batch_size: int, length: int, concurrency: int, requests: int, seed: int) -> dict:
+    rngs = [random.Random(seed + i) for i in range(requests)]
+    _request(mh, build_response, variant, batch_size, length, random.Random(seed))  # warm
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(
+            lambda rng: _request(mh, build_response, variant, batch_size, length, rng), rngs
+        ))
+    wall = time.perf_counter() - start
+
+    latency_ms = np.array([s["total"] for s in samples]) * 1000.0
+    return {
+        "variant":          variant,
+        "batch_size":       batch_size,
+        "length":           length,
+        "concurrency":      concurrency,
+        "requests":         requests,
+        "throughput_seq_s": requests * batch_size / wall,
+        "latency_ms": {
+            "p50": float(np.percentile(latency_ms, 50)),
+            "p95": float(np.percentile(latency_ms, 95)),
+            "p99": float(np.percentile(latency_ms, 99)),
+        },
+        "stage_ms":         {stage: 1000.0 * float(np.mean([s[stage] for s in samples])) for stage in STAGES},
+        "response_bytes":   int(np.mean([s["bytes"] for s in samples])),
+        "rss_mb":           _rss_mb(),
+    }
+
+
+def _config_key(r: dict) -> tuple:
+    return (r["variant"], r["batch_size"], r["length"], r["concurrency"])
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """Print throughput and p95 changes against an earlier report."""
+    with open(baseline_path) as f:
+        baseline = {_config_key(r): r for r in json.load(f)["results"]}
+    print(f"\nvs {baseline_path}")
+    print(f"{'variant':9s} {'batch':>5s} {'len':>5s} {'conc':>4s} {'seq/s':>10s} {'Δ':>7s} {'p95 ms':>9s} {'Δ':>7s}")
+    for r in results:
+        old = baseline.get(_config_key(r))
+        if old is None:
+            continue
+        d_tput = r["throughput_seq_s"] / old["throughput_seq_s"] - 1.0
+        d_p95 = r["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1.0
+        print(
+            f"{r['variant']:9s} {r['batch_size']:5d} {r['length']:5d} {r['concurrency']:4d} "
+            f"{r['throughput_seq_s']:10.1f} {d_tput:+7.1%} {r['latency_ms']['p95']:9.2f} {d_p95:+7.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", nargs="+", default=["seq", "chr", "gene", "chr_gene"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 64])
+    parser.add_argument("--lengths", nargs="+", type=int, default=[100, 400])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per configuration")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--standin", action="store_true", help="Use stand‐in models even if trained ones exist")
+    parser.add_argument("--out", default="bench_inference.json", help="JSON report path")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    standin = _prepare_models(args.standin)
+    os.environ["DNA_PREDICTION_CACHE_SIZE"] = "0"
+    os.environ["DNA_PRELOAD_MODEL_VARIANTS"] = ""
+    os.environ.pop("DNA_INFERENCE_SERVER", None)  # measure in‐process inference
+
+    from utils import modelHandler as mh
+    from routes.modelRoutes import build_attention_response
+
+    rss_before_models = _rss_mb()
+    mh.model_registry.preload(args.variants)
+    report = {
+        "commit":      _git_commit(),
+        "timestamp":   time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "standin":     standin,
+        "backend":     mh.INFERENCE_BACKEND,
+        "python":      platform.python_version(),
+        "tensorflow":  mh.tf.__version__,
+        "cpu_count":   os.cpu_count(),
+        "settings":    {k: v for k, v in sorted(os.environ.items()) if k.startswith("DNA_")},
+        "models_rss_mb": _rss_mb() - rss_before_models,
+        "load_seconds": mh.model_registry.stats()["load_seconds"],
+        "results":     [],
+    }
+
+    print(f"{'variant':9s} {'batch':>5s} {'len':>5s} {'conc':>4s} {'seq/s':>10s} {'p50':>8s} {'p95':>8s} {'p99':>8s}  "
+          + " ".join(f"{s:>9s}" for s in STAGES))
+    for variant in args.variants:
+        for batch_size in args.batch_sizes:
+            for length in args.lengths:
+                for concurrency in args.concurrency:
+                    r = run_config(mh, build_attention_response, variant, batch_size, length, concurrency, args.requests, args.seed)
+                    report["results"].append(r)
+                    lat = r["latency_ms"]
+                    print(
+                        f"{variant:9s} {batch_size:5d} {length:5d} {concurrency:4d} {r['throughput_seq_s']:10.1f} "
+                        f"{lat['p50']:8.2f} {lat['p95']:8.2f} {lat['p99']:8.2f}  "
+                        + " ".join(f"{r['stage_ms'][s]:9.2f}" for s in STAGES)
+                    )
+
+    report["peak_rss_mb"] = _peak_rss_mb()
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\npeak RSS {report['peak_rss_mb']:.0f} MB; report written to {args.out}")
+
+    if args.compare:
+        compare(report["results"], args.compare)
+
+
+if __name__ == "__main__":
+    main()
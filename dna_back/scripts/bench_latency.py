@@ -0,0 +1,87 @@
+"""
+Batch‐of‐one latency of the inference backends, side by side.
+
+Times the same fused model served through `Model.predict` (the original
+path), a pre‐traced `tf.function`, and optionally the XLA‐compiled
+`tf.function`, and reports p50/p99 per backend.
+
+Usage (from dna_back/):
+    python -m scripts.bench_latency --variant seq --length 400 --runs 500 --xla
+"""
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from utils import modelHandler as mh
+from utils.inferenceBackends import GraphRunner, KerasRunner
+
+
+def _summarize(samples: list[float]) -> dict:
+    ms = np.asarray(samples) * 1000.0
+    return {
+        "runs": len(samples),
+        "mean_ms": float(ms.mean()),
+        "p50_ms":  float(np.percentile(ms, 50)),
+        "p99_ms":  float(np.percentile(ms, 99)),
+    }
+
+
+def _request_for(variant: str, length: int, rng: random.Random):
+    seq = "".join(rng.choice("ACGT") for _ in range(length))
+    chrom = "1" if variant in (mh.VARIANT_CHR, mh.VARIANT_CHRGENE) else None
+    gene = (
+        str(mh.gene_ohe.categories_[0][0])
+        if variant in (mh.VARIANT_GENE, mh.VARIANT_CHRGENE)
+        else None
+    )
+    return seq, chrom, gene
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variant", default=mh.VARIANT_SEQ, choices=list(mh.MODEL_PATHS))
+    parser.add_argument("--length", type=int, default=400, help="Sequence length in bases")
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--xla", action="store_true", help="Also time the XLA‐compiled graph")
+    parser.add_argument("--out", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    seq, chrom, gene = _request_for(args.variant, args.length, rng)
+    tokens = mh.preprocess_sequences([seq], mh.MAX_LEN_BILSTM)
+    inputs = mh._build_inputs(args.variant, tokens, [chrom], [gene])
+
+    model = mh.load_fused_model(args.variant)
+    runners = {"keras": KerasRunner(model), "graph": GraphRunner(model)}
+    if args.xla:
+        runners["graph+xla"] = GraphRunner(model, jit_compile=True)
+
+    report = {"variant": args.variant, "length": args.length, "backends": {}}
+    for name, runner in runners.items():
+        runner.warmup([tokens.shape[1]])
+        for _ in range(args.warmup):
+            runner(inputs, 1)
+
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            runner(inputs, 1)
+            samples.append(time.perf_counter() - start)
+        report["backends"][name] = _summarize(samples)
+
+    print(f"variant={args.variant} length={args.length} runs={args.runs}")
+    print(f"{'backend':<12}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for name, row in report["backends"].items():
+        print(f"{name:<12}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['mean_ms']:>10.2f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Full‐pad vs length‐bucketed inference on a realistic length distribution.
+
+Runs the same sequences through the fused model padded to MAX_LEN_BILSTM
+and through the bucketed clone (see `build_bucketed_model`) at each
+bucket's own width, then reports the max absolute difference of probs and
+alphas and the speedup.
+
+Lengths come from the stored `NormalSeq` values in disease_records when
+`--from-db` is given, otherwise from a synthetic amplicon mix that is
+mostly short.
+
+Usage (from dna_back/):
+    python -m scripts.bench_length_buckets --variant seq --samples 5000 --from-db
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from utils import modelHandler as mh
+from utils.inferenceBackends import GraphRunner
+
+
+def _lengths_from_db(samples: int) -> list[int]:
+    from sqlalchemy import func
+    from db.DiseaseRecord import DiseaseRecord
+    from utils.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(func.length(DiseaseRecord.NormalSeq))
+            .filter(DiseaseRecord.NormalSeq.isnot(None))
+            .order_by(func.random())
+            .limit(samples)
+            .all()
+        )
+    finally:
+        db.close()
+    return [int(r[0]) for r in rows]
+
+
+def _synthetic_lengths(samples: int, rng: random.Random) -> list[int]:
+    lengths = []
+    for _ in range(samples):
+        p = rng.random()
+        if p < 0.7:
+            lengths.append(rng.randint(40, 150))
+        elif p < 0.9:
+            lengths.append(rng.randint(150, 300))
+        else:
+            lengths.append(rng.randint(300, mh.MAX_LEN_BILSTM + mh.KMER_K - 1))
+    return lengths
+
+
+def _timed(fn, repeats: int) -> tuple[float, tuple]:
+    out = fn()  # warm
+    start = time.perf_counter()
+    for _ in range(repeats):
+        out = fn()
+    return (time.perf_counter() - start) / repeats, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variant", default=mh.VARIANT_SEQ, choices=list(mh.MODEL_PATHS))
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=mh.INFERENCE_BATCH_SIZE)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--from-db", action="store_true", help="Sample lengths from disease_records.NormalSeq")
+    args = parser.parse_args()
+
+    cls_path, _ = mh.MODEL_PATHS[args.variant]
+    fused = mh.build_fused_model(mh.load_model(cls_path, custom_objects={"AttentionLayer": mh.AttentionLayer}))
+    if not mh.masks_padding(fused):
+        print("The embedding does not mask padding; bucketed results would differ. Nothing to compare.")
+        sys.exit(1)
+    full, bucketed = GraphRunner(fused), GraphRunner(mh.build_bucketed_model(fused))
+
+    rng = random.Random(0)
+    lengths = _lengths_from_db(args.samples) if args.from_db else _synthetic_lengths(args.samples, rng)
+    seqs = ["".join(rng.choice("ACGT") for _ in range(n)) for n in lengths]
+    tokens = mh.preprocess_sequences(seqs, mh.MAX_LEN_BILSTM)
+    n = len(seqs)
+    chroms = ["1"] * n if args.variant in (mh.VARIANT_CHR, mh.VARIANT_CHRGENE) else [None] * n
+    genes = (
+        [str(mh.gene_ohe.categories_[0][0])] * n
+        if args.variant in (mh.VARIANT_GENE, mh.VARIANT_CHRGENE)
+        else [None] * n
+    )
+
+    def run_full():
+        return full(mh._build_inputs(args.variant, tokens, chroms, genes), args.batch_size)
+
+    def run_bucketed():
+        probs = np.empty((n, len(mh.label_map)), dtype=np.float32)
+        alphas = np.empty((n, mh.MAX_LEN_BILSTM), dtype=np.float32)
+        for width, rows in mh.bucket_rows(tokens, list(range(n))):
+            inputs = mh._build_inputs(args.variant, tokens[rows, :width], [chroms[i] for i in rows], [genes[i] for i in rows])
+            probs[rows], alphas[rows] = bucketed(inputs, args.batch_size)
+        return probs, alphas
+
+    t_full, (p_full, a_full) = _timed(run_full, args.repeats)
+    t_bucketed, (p_bucketed, a_bucketed) = _timed(run_bucketed, args.repeats)
+
+    counts = {width: len(rows) for width, rows in mh.bucket_rows(tokens, list(range(n)))}
+    print(f"variant={args.variant} samples={n} buckets={counts}")
+    print(f"full pad : {t_full * 1000:9.1f} ms  ({n / t_full:8.0f} seq/s)")
+    print(f"bucketed : {t_bucketed * 1000:9.1f} ms  ({n / t_bucketed:8.0f} seq/s)")
+    print(f"speedup  : {t_full / t_bucketed:.2f}x")
+    print(f"max |Δprobs|  = {np.abs(p_full - p_bucketed).max():.2e}")
+    print(f"max |Δalphas| = {np.abs(a_full - a_bucketed).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
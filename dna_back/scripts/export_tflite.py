@@ -0,0 +1,106 @@
+"""
+Export the fused (probs, alphas) model of each variant to TFLite.
+
+One file per variant and quantization replaces the `seq_*`/`attention_*`
+pair, because the fused model already returns both outputs (custom
+AttentionLayer included). Variables are frozen into constants and the
+batch size is fixed so the BiLSTM lowers to builtin TFLite ops; the
+runner pads the last chunk of a batch.
+
+Quantization:
+    none     float32 weights (what the tflite backend serves by default)
+    dynamic  int8 weights, float activations (dynamic‐range quantization)
+    float16  float16 weights
+
+The quantized files are only served when DNA_TFLITE_QUANTIZATION selects
+them; check their drift with `python -m scripts.bench_backends` first.
+
+Files are written as `<variant>_<quantization>.tflite` plus a sidecar
+`.json` (input order, output names, batch size) to DNA_TFLITE_DIR, which
+is what `DNA_INFERENCE_BACKEND=tflite` loads.
+
+Usage (from dna_back/):
+    python -m scripts.export_tflite --quantization none dynamic float16
+"""
+import argparse
+import json
+from pathlib import Path
+
+import tensorflow as tf
+from tensorflow.keras.models import Model, load_model
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+from utils import modelHandler as mh
+from utils.predictionCache import model_fingerprint
+from utils.tfliteRunner import QUANT_DYNAMIC, QUANT_FLOAT16, QUANTIZATIONS, metadata_path
+
+DEFAULT_BATCH_SIZE = 32
+
+
+def convert_fused_model(fused: Model, quantization: str, batch_size: int) -> tuple[bytes, dict]:
+    """
+    Convert a fused model to a TFLite flatbuffer.
+
+    Returns:
+      - (flatbuffer, metadata) where metadata maps the model's inputs and
+        outputs to TFLite tensor names
+    """
+    specs = [
+        tf.TensorSpec((batch_size,) + tuple(inp.shape[1:]), dtype=inp.dtype, name=inp.name)
+        for inp in fused.inputs
+    ]
+    single_input = len(specs) == 1
+
+    @tf.function(input_signature=specs)
+    def forward(*tensors):
+        return fused(tensors[0] if single_input else list(tensors), training=False)
+
+    frozen = convert_variables_to_constants_v2(forward.get_concrete_function())
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([frozen])
+    if quantization == QUANT_DYNAMIC:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif quantization == QUANT_FLOAT16:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+
+    probs, alphas = (t.name.split(":")[0] for t in frozen.outputs)
+    metadata = {
+        "quantization": quantization,
+        "batch_size":   batch_size,
+        "max_len":      mh.MAX_LEN_BILSTM,
+        "inputs":       [inp.name for inp in fused.inputs],
+        "outputs":      {"probs": probs, "alphas": alphas},
+    }
+    return converter.convert(), metadata
+
+
+def export_variant(variant: str, quantization: str, batch_size: int, out_dir: Path) -> Path:
+    """Convert one variant and write `<variant>_<quantization>.tflite` plus its sidecar."""
+    cls_path, _ = mh.MODEL_PATHS[variant]
+    fused = mh.build_fused_model(load_model(cls_path, custom_objects={"AttentionLayer": mh.AttentionLayer}))
+    flatbuffer, metadata = convert_fused_model(fused, quantization, batch_size)
+    metadata["source"] = {"file": Path(cls_path).name, "fingerprint": model_fingerprint([cls_path])}
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{variant}_{quantization}.tflite"
+    out_path.write_bytes(flatbuffer)
+    metadata_path(out_path).write_text(json.dumps(metadata, indent=2))
+    return out_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", nargs="+", default=list(mh.MODEL_PATHS), choices=list(mh.MODEL_PATHS))
+    parser.add_argument("--quantization", nargs="+", default=list(QUANTIZATIONS), choices=list(QUANTIZATIONS))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--out-dir", type=Path, default=mh.TFLITE_DIR)
+    args = parser.parse_args()
+
+    for variant in args.variants:
+        for quantization in args.quantization:
+            path = export_variant(variant, quantization, args.batch_size, args.out_dir)
+            print(f"{variant:9s} {quantization:8s} {path.stat().st_size / 1024:9.1f} KiB  {path}")
+
+
+if __name__ == "__main__":
+    main()
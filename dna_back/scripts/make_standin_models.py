@@ -0,0 +1,104 @@
+"""
+Write randomly initialized stand‐in models and preprocessors.
+
+Produces the same files as Model/Attention (four classification models,
+four attention models, tokenizer, chromosome/gene encoders and label map)
+with the same inputs and layer types, so the serving code and benchmarks
+run where the trained `.keras` files are not available. Predictions are
+meaningless; shapes and costs are realistic if `--embed-dim`/`--units`
+match the trained models.
+
+Point the app at them with DNA_MODEL_DIR.
+
+Usage (from dna_back/):
+    python -m scripts.make_standin_models /tmp/standin --units 64
+    DNA_MODEL_DIR=/tmp/standin uvicorn main:app
+"""
+import argparse
+import itertools
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import tensorflow as tf
+from sklearn.preprocessing import OneHotEncoder
+from tensorflow.keras.preprocessing.text import Tokenizer
+
+from utils.attentionLayer import AttentionLayer
+
+KMER_K          = 3
+MAX_LEN_BILSTM  = 400
+CHROMOSOMES     = [str(i) for i in range(1, 23)] + ["X"]
+GENES           = ["BRCA1", "BRCA2", "TP53", "CFTR", "MLH1", "MSH2", "APC", "ATM"]
+LABELS          = {"0": "Benign", "1": "Pathogenic", "2": "Uncertain"}
+
+# (classification file, attention file, extra inputs)
+MODEL_FILES = [
+    ("seq_only_model",     "attention_model_seq",           []),
+    ("seq_chr_model",      "attention_model_seq_chr",       ["chrom"]),
+    ("seq_gene_model",     "attention_model_seq_gene",      ["gene"]),
+    ("seq_chr_gene_model", "attention_model_seq_chr_gene",  ["chrom", "gene"]),
+]
+
+
+def _build_models(vocab_size: int, extra_dims: dict, embed_dim: int, units: int, mask_zero: bool):
+    seq = tf.keras.Input(shape=(MAX_LEN_BILSTM,), name="seq")
+    x = tf.keras.layers.Embedding(vocab_size, embed_dim, mask_zero=mask_zero)(seq)
+    x = tf.keras.layers.Bidirectional(tf.keras.layers.LSTM(units, return_sequences=True))(x)
+    context, alphas = AttentionLayer(name="attention")(x)
+
+    inputs, features = [seq], [context]
+    for name, dim in extra_dims.items():
+        extra = tf.keras.Input(shape=(dim,), name=name)
+        inputs.append(extra)
+        features.append(tf.keras.layers.Dense(16, activation="relu")(extra))
+    hidden = tf.keras.layers.Concatenate()(features) if len(features) > 1 else context
+    probs = tf.keras.layers.Dense(len(LABELS), activation="softmax")(hidden)
+    return tf.keras.Model(inputs, probs), tf.keras.Model(inputs, alphas)
+
+
+def build_standin_models(
+    out_dir: Path, embed_dim: int = 32, units: int = 64, mask_zero: bool = True, seed: int = 0
+) -> Path:
+    """Write every model and preprocessor file into `out_dir` and return it."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tf.keras.utils.set_random_seed(seed)
+
+    tokenizer = Tokenizer()
+    tokenizer.fit_on_texts([["".join(p) for p in itertools.product("ACGT", repeat=KMER_K)]])
+    chrom_ohe = OneHotEncoder(handle_unknown="ignore", sparse_output=False).fit(np.array(CHROMOSOMES)[:, None])
+    gene_ohe = OneHotEncoder(handle_unknown="ignore", sparse_output=False).fit(np.array(GENES)[:, None])
+
+    joblib.dump(tokenizer, out_dir / "tokenizer.pkl")
+    joblib.dump(chrom_ohe, out_dir / "chrom_ohe.pkl")
+    joblib.dump(gene_ohe, out_dir / "gene_ohe.pkl")
+    with open(out_dir / "label_map.json", "w") as f:
+        json.dump(LABELS, f)
+
+    dims = {"chrom": len(CHROMOSOMES), "gene": len(GENES)}
+    for cls_name, att_name, extras in MODEL_FILES:
+        cls_model, att_model = _build_models(
+            len(tokenizer.word_index) + 1, {name: dims[name] for name in extras}, embed_dim, units, mask_zero
+        )
+        cls_model.save(out_dir / f"{cls_name}.keras")
+        att_model.save(out_dir / f"{att_name}.keras")
+    return out_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--embed-dim", type=int, default=32)
+    parser.add_argument("--units", type=int, default=64, help="LSTM units per direction")
+    parser.add_argument("--no-mask", action="store_true", help="Embedding without mask_zero (disables length buckets)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    out = build_standin_models(args.out_dir, args.embed_dim, args.units, not args.no_mask, args.seed)
+    print(f"Stand‐in models written to {out}")
+
+
+if __name__ == "__main__":
+    main()
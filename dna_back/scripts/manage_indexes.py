@@ -0,0 +1,218 @@
+"""
+Create, rebuild and check the disease_records indexes.
+
+The index set is declared on the DiseaseRecord model (`__table_args__`),
+plus the GENEINFO trigram index of utils.geneSearch. This command brings
+an existing database in line with it and verifies that the /data and
+/metadata queries use it:
+
+    status   declared vs. existing indexes
+    create   create the declared indexes that are missing, then ANALYZE
+    rebuild  drop and recreate every declared index, then ANALYZE
+    analyze  refresh the planner statistics (ANALYZE)
+    check    EXPLAIN QUERY PLAN for each endpoint query; exits non‐zero
+             if one scans the table without an index, or a page that
+             should be read in index order is sorted in a temp B‐tree
+
+`--drop-stale` (with create/rebuild) also drops ix_disease_records_*
+indexes that are no longer declared.
+
+Usage (from dna_back/):
+    python -m scripts.manage_indexes create
+    python -m scripts.manage_indexes check
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import func, inspect, text
+
+from db.DiseaseRecord import DiseaseRecord
+from routes.dataRoute import VariantFilterParams, group_count_query
+from utils.database import SessionLocal, engine
+from utils.dbHandler import (
+    COLUMN_MAPPING, LABEL_TO_DB_COLUMN, advanced_filter_query, column_filter_query, encode_cursor, page_query,
+)
+from utils.geneSearch import FTS_TABLE, create_gene_search_index, gene_search_ready
+
+TABLE = DiseaseRecord.__table__
+INDEX_PREFIX = "ix_disease_records_"
+
+
+def existing_indexes() -> dict:
+    return {ix["name"]: ix["column_names"] for ix in inspect(engine).get_indexes(TABLE.name)}
+
+
+def status() -> None:
+    existing = existing_indexes()
+    for index in sorted(TABLE.indexes, key=lambda ix: ix.name):
+        state = "present" if index.name in existing else "MISSING"
+        print(f"{state:8s} {index.name} ({', '.join(c.name for c in index.columns)})")
+    declared = {index.name for index in TABLE.indexes}
+    for name in sorted(set(existing) - declared):
+        print(f"{'extra':8s} {name} ({', '.join(existing[name])})")
+    print(f"{'present' if gene_search_ready() else 'MISSING':8s} {FTS_TABLE} (GENEINFO trigram)")
+
+
+def create(rebuild: bool = False, drop_stale: bool = False) -> None:
+    existing = existing_indexes()
+    declared = {index.name for index in TABLE.indexes}
+    if drop_stale:
+        for name in sorted(set(existing) - declared):
+            if name.startswith(INDEX_PREFIX):
+                print(f"dropping stale {name}")
+                with engine.begin() as conn:
+                    conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+    for index in sorted(TABLE.indexes, key=lambda ix: ix.name):
+        if index.name in existing and not rebuild:
+            continue
+        start = time.perf_counter()
+        if index.name in existing:
+            index.drop(engine)
+        index.create(engine)
+        print(f"created {index.name} in {time.perf_counter() - start:.1f}s")
+    if not gene_search_ready() or rebuild:
+        start = time.perf_counter()
+        if create_gene_search_index(rebuild=rebuild):
+            print(f"built {FTS_TABLE} in {time.perf_counter() - start:.1f}s")
+        else:
+            print(f"{FTS_TABLE} unavailable (no FTS5 trigram tokenizer); gene search uses ILIKE")
+    analyze()
+
+
+def analyze() -> None:
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"ANALYZE in {time.perf_counter() - start:.1f}s")
+
+
+def _filters(**values) -> VariantFilterParams:
+    params = dict.fromkeys(
+        ("geneinfo", "position_start", "position_stop", "chrom", "alt_type",
+         "ref", "alt_value", "clnsig", "clndn", "category"),
+    )
+    params.update(values)
+    return VariantFilterParams(**params)
+
+
+def endpoint_queries(db) -> list:
+    """
+    (description, query, must use an index, must not sort) for the queries
+    behind the /data and /metadata endpoints. Pages are the statements
+    `paginate` runs (ORDER BY and LIMIT included), built by the same
+    helpers as the endpoints.
+    """
+    records = db.query(DiseaseRecord)
+    id_cursor = encode_cursor("ID", 1000, 1000)
+    pos_cursor = encode_cursor("Position", 43_000_000, 1000)
+
+    def advanced(**values):
+        f = _filters(**values)
+        return advanced_filter_query(
+            f.geneinfo, f.position_start, f.position_stop, f.chrom, f.alt_type,
+            f.ref, f.alt_value, f.clnsig, f.clndn, f.category, db,
+        )
+
+    def page(query, sort_by="ID", cursor=None):
+        return page_query(query, 1, 100, cursor, sort_by)
+
+    region = {"position_start": 43_000_000, "position_stop": 43_200_000}
+    queries = [
+        ("/data/all count", db.query(func.count(DiseaseRecord.ID)), True, False),
+        ("/data/all page", page(records), True, True),
+        ("/data/all cursor page", page(records, cursor=id_cursor), True, True),
+        ("/data/all cursor page sort_by=Position", page(records, "Position", pos_cursor), True, True),
+        ("/data/advanced-search chrom+position sort_by=Position", page(advanced(chrom=["17"], **region), "Position"), True, True),
+        ("/data/advanced-search position sort_by=Position", page(advanced(**region), "Position"), True, True),
+        ("/data/advanced-search alt_type", page(advanced(alt_type=["SNV"]), cursor=id_cursor), True, True),
+        ("/data/advanced-search clnsig", page(advanced(clnsig=["Pathogenic"]), cursor=id_cursor), True, True),
+        ("/data/advanced-search clndn", page(advanced(clndn=["Cystic_fibrosis"]), cursor=id_cursor), True, True),
+        ("/data/advanced-search category", page(advanced(category=["A"]), cursor=id_cursor), True, True),
+        # Several values or columns match in one index but not in ID order,
+        # so these pages sort their matches (see utils.dbHandler.page_query)
+        ("/data/advanced-search chrom+position", page(advanced(chrom=["17"], **region)), True, False),
+        ("/data/advanced-search position", page(advanced(**region)), True, False),
+        ("/data/advanced-search alt_type (2 values)", page(advanced(alt_type=["SNV", "Deletion"])), True, False),
+        ("/data/advanced-search ref+alt_value", page(advanced(ref=["A"], alt_value=["G"])), True, False),
+        # Served by the trigram index; shorter searches fall back to a
+        # leading‐wildcard LIKE, which no index can serve
+        ("/data/advanced-search geneinfo substring", page(advanced(geneinfo="BRCA")), True, False),
+        ("/data/advanced-search geneinfo short substring", page(advanced(geneinfo="BR")), False, False),
+        ("/data/variant-counts/genes ?geneinfo=BRCA", group_count_query("GENEINFO", _filters(geneinfo="BRCA"), db, 10, func.count().desc()), True, False),
+        ("/data/disease-counts", db.query(DiseaseRecord.Category, DiseaseRecord.CLNDN, func.count()).group_by(DiseaseRecord.Category, DiseaseRecord.CLNDN), True, False),
+    ]
+    for label, column in LABEL_TO_DB_COLUMN.items():
+        query = column_filter_query(label, "1" if column == "POS" else "x", db)
+        queries.append((f"/data/filter {label} page", page(query), True, True))
+        queries.append((f"/data/filter {label} cursor page", page(query, cursor=id_cursor), True, True))
+    for column in COLUMN_MAPPING:
+        queries.append((f"/metadata/unique-values {column}", db.query(getattr(DiseaseRecord, column)).distinct(), True, False))
+    for field, path in (("CHROM", "chromosomes"), ("ALT_TYPE", "alt-type"), ("GENEINFO", "genes"), ("CLNSIG", "clinical-significance")):
+        sort_fn = func.count().desc() if field == "GENEINFO" else None
+        limit = 10 if field == "GENEINFO" else None
+        queries.append((f"/data/variant-counts/{path}", group_count_query(field, _filters(), db, limit, sort_fn), True, False))
+        queries.append((f"/data/variant-counts/{path} ?chrom=17", group_count_query(field, _filters(chrom=["17"]), db, limit, sort_fn), True, False))
+    return queries
+
+
+def query_plan(query) -> list:
+    sql = str(query.statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def uses_index(plan: list) -> bool:
+    """False if any step reads disease_records without an index."""
+    return not any(
+        step.startswith(("SCAN disease_records", f"SCAN {TABLE.name}")) and "INDEX" not in step
+        for step in plan
+    )
+
+
+def sorts_rows(plan: list) -> bool:
+    """True if the ORDER BY is done in a temp B‐tree instead of by reading an index in order."""
+    return any("TEMP B-TREE" in step and "ORDER BY" in step for step in plan)
+
+
+def check(verbose: bool = False) -> bool:
+    db = SessionLocal()
+    try:
+        ok = True
+        for name, query, required, ordered in endpoint_queries(db):
+            plan = query_plan(query)
+            indexed = uses_index(plan)
+            unsorted = not (ordered and sorts_rows(plan))
+            if not indexed:
+                verdict = "FULL SCAN" if required else "scan (expected)"
+            else:
+                verdict = "ok" if unsorted else "TEMP SORT"
+            ok = ok and (indexed or not required) and unsorted
+            print(f"{verdict:16s} {name}")
+            if verbose or not indexed or not unsorted:
+                for step in plan:
+                    print(f"{'':16s}   {step}")
+        return ok
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["status", "create", "rebuild", "analyze", "check"])
+    parser.add_argument("--drop-stale", action="store_true", help="Drop ix_disease_records_* indexes no longer declared")
+    parser.add_argument("--verbose", action="store_true", help="Print every query plan")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        status()
+    elif args.command in ("create", "rebuild"):
+        create(rebuild=args.command == "rebuild", drop_stale=args.drop_stale)
+    elif args.command == "analyze":
+        analyze()
+    elif args.command == "check":
+        sys.exit(0 if check(args.verbose) else 1)
+
+
+if __name__ == "__main__":
+    main()
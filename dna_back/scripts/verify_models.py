@@ -0,0 +1,93 @@
+"""
+Smoke‐test the models the app serves.
+
+Loads every variant through `modelHandler.load_runner` (the configured
+backend and length buckets, exactly as the API loads them), warms it up
+again with the lengths it will serve, and runs one prediction per length,
+checking the output shapes and that the probabilities sum to one. Then
+compares the served (fused) model against the original classification
+and attention `.keras` models on random sequences with
+`modelHandler.verify_fused_model`. Exits non‐zero if any variant fails
+or differs by more than `--tolerance`.
+
+Usage (from dna_back/):
+    python -m scripts.verify_models --variant seq --variant chr
+    DNA_INFERENCE_BACKEND=tflite python -m scripts.verify_models --tolerance 0.05
+"""
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from utils import modelHandler as mh
+
+
+def _request_for(variant: str, length: int, rng: random.Random):
+    seq = "".join(rng.choice("ACGT") for _ in range(length + mh.KMER_K - 1))
+    chrom = "1" if variant in (mh.VARIANT_CHR, mh.VARIANT_CHRGENE) else None
+    gene = (
+        str(mh.gene_ohe.categories_[0][0])
+        if variant in (mh.VARIANT_GENE, mh.VARIANT_CHRGENE)
+        else None
+    )
+    return seq, chrom, gene
+
+
+def verify_warmup(variant: str, seed: int) -> bool:
+    rng = random.Random(seed)
+    try:
+        runner = mh.load_runner(variant)
+        lengths = (mh.LENGTH_BUCKETS or [mh.MAX_LEN_BILSTM]) if runner.variable_length else [mh.MAX_LEN_BILSTM]
+        runner.warmup(lengths)
+        for length in lengths:
+            seq, chrom, gene = _request_for(variant, length, rng)
+            tokens = mh.preprocess_sequences([seq], length)
+            probs, alphas = runner(mh._build_inputs(variant, tokens, [chrom], [gene]), 1)
+            if probs.shape[0] != 1 or alphas.shape != (1, mh.MAX_LEN_BILSTM):
+                raise AssertionError(f"length {length}: probs {probs.shape}, alphas {alphas.shape}")
+            if not np.isclose(probs.sum(), 1.0, atol=1e-3):
+                raise AssertionError(f"length {length}: probabilities sum to {probs.sum():.4f}")
+    except Exception as e:
+        print(f"{variant}: FAILED ({type(e).__name__}: {e})")
+        return False
+    print(f"{variant}: {runner.name} runner ok at lengths {list(lengths)}")
+    return True
+
+
+def verify_fused(variant: str, samples: int, seed: int, tolerance: float) -> bool:
+    rng = random.Random(seed)
+    _, chrom, gene = _request_for(variant, 0, rng)
+    lengths = [1, mh.KMER_K, mh.MAX_LEN_BILSTM // 3, mh.MAX_LEN_BILSTM + mh.KMER_K - 1]
+    sequences = [
+        "".join(rng.choice("ACGT") for _ in range(lengths[i] if i < len(lengths) else rng.randint(1, mh.MAX_LEN_BILSTM)))
+        for i in range(samples)
+    ]
+    diffs = mh.verify_fused_model(variant, sequences, chrom, gene)
+    ok = max(diffs.values()) <= tolerance
+    print(
+        f"{variant}: fused vs original, max |Δprobs| {diffs['probs_max_abs_diff']:.2e}, "
+        f"max |Δalphas| {diffs['alphas_max_abs_diff']:.2e}{'' if ok else f' > {tolerance:g}'}"
+    )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variant", action="append", choices=list(mh.MODEL_PATHS),
+                        help="Variant to check (repeatable); default: all")
+    parser.add_argument("--samples", type=int, default=64, help="Random sequences compared per variant")
+    parser.add_argument("--tolerance", type=float, default=1e-4,
+                        help="Largest accepted difference from the original models")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = True
+    for variant in args.variant or list(mh.MODEL_PATHS):
+        ok = verify_warmup(variant, args.seed) and ok
+        ok = verify_fused(variant, args.samples, args.seed, args.tolerance) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
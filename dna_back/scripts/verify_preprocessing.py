@@ -0,0 +1,94 @@
+"""
+Check that the fast preprocessing paths match the original ones exactly.
+
+Compares the vectorized k‐mer tokenizer against the Keras
+`texts_to_sequences` + `pad_sequences` path on random sequences of many
+lengths (shorter than k, around and beyond MAX_LEN_BILSTM, and with
+non‐ACGT characters), and the compiled chromosome/gene lookups against
+`chrom_ohe`/`gene_ohe.transform` on every category plus unknown values,
+then on encoders fitted with `drop`, infrequent categories and each
+`handle_unknown` mode. Exits non‐zero on any mismatch.
+
+Usage (from dna_back/):
+    python -m scripts.verify_preprocessing --samples 5000
+"""
+import argparse
+import random
+import sys
+
+import numpy as np
+from sklearn.preprocessing import OneHotEncoder
+
+from utils import categoryEncoders
+from utils import modelHandler as mh
+from utils.kmerTokenizer import verify_against
+
+
+def _random_sequences(n: int, rng: random.Random) -> list[str]:
+    lengths = [0, 1, mh.KMER_K - 1, mh.KMER_K, mh.MAX_LEN_BILSTM, mh.MAX_LEN_BILSTM + mh.KMER_K, 5000]
+    seqs = []
+    for i in range(n):
+        length = lengths[i] if i < len(lengths) else rng.randint(0, 2 * mh.MAX_LEN_BILSTM)
+        seq = "".join(rng.choice("ACGTacgt") for _ in range(length))
+        if i % 50 == 0 and seq:
+            pos = rng.randrange(len(seq))
+            seq = seq[:pos] + rng.choice("NRY-") + seq[pos + 1 :]
+        seqs.append(seq)
+    return seqs
+
+
+def verify_tokenizer(samples: int, seed: int) -> bool:
+    seqs = _random_sequences(samples, random.Random(seed))
+    mismatches = verify_against(mh.kmer_tokenizer, mh.preprocess_sequences_keras, seqs, mh.MAX_LEN_BILSTM)
+    print(f"k‐mer tokenizer: {mismatches} / {len(seqs)} sequences differ")
+    return mismatches == 0
+
+
+def _encoder_values(categories, rng: random.Random) -> list:
+    values = [str(c) for c in categories]
+    values += ["", "UNKNOWN", "CHR1", "MT", "0", " "]
+    values += [rng.choice(values) for _ in range(200)]
+    return values
+
+
+def verify_encoders(seed: int) -> bool:
+    rng = random.Random(seed)
+    ok = True
+    cases = [("chrom_ohe", mh.chrom_ohe, mh.chrom_encoder), ("gene_ohe", mh.gene_ohe, mh.gene_encoder)]
+
+    # The pickled encoders only exercise their own settings; cover the rest too
+    train = np.array([rng.choice("ABCDEFGH") * rng.randint(1, 3) for _ in range(300)] + ["RARE"], dtype=object)[:, None]
+    for params in (
+        {"handle_unknown": "error"},
+        {"handle_unknown": "ignore", "drop": "first"},
+        {"handle_unknown": "ignore", "sparse_output": True, "dtype": np.float32},
+        {"handle_unknown": "infrequent_if_exist", "min_frequency": 2},
+        {"handle_unknown": "error", "drop": "if_binary", "max_categories": 4},
+    ):
+        ohe = OneHotEncoder(**{"sparse_output": False, **params}).fit(train)
+        cases.append((f"OneHotEncoder({params})", ohe, categoryEncoders.OneHotLookup.from_sklearn(ohe)))
+
+    for name, ohe, lookup in cases:
+        values = _encoder_values(ohe.categories_[0], rng)
+        known = [v for v in values if v in lookup.index]
+        problems = [categoryEncoders.verify_against(lookup, ohe, batch) for batch in (values, known)]
+        problems += [categoryEncoders.verify_against(lookup, ohe, [v]) for v in values[:50]]
+        problems = [p for p in problems if p]
+        print(f"{name}: {problems[0] if problems else 'identical'}")
+        ok = ok and not problems
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = verify_tokenizer(args.samples, args.seed)
+    ok = verify_encoders(args.seed) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import base64
+
+import numpy as np
+
+# Values accepted for `attention_format`
+ATTENTION_LIST     = "list"      # JSON list of floats (original format)
+ATTENTION_FLOAT16  = "float16"   # base64 of little‐endian float16
+ATTENTION_UINT8    = "uint8"     # base64 of bytes; weight ≈ byte * scale
+ATTENTION_TOPK     = "topk"      # only the k largest weights with their positions
+ATTENTION_FORMATS  = (ATTENTION_LIST, ATTENTION_FLOAT16, ATTENTION_UINT8, ATTENTION_TOPK)
+
+
+def encode_float16(alphas: np.ndarray) -> str:
+    """Base64 of the weights as little‐endian float16 (2 bytes per step)."""
+    return base64.b64encode(np.asarray(alphas, dtype="<f2").tobytes()).decode("ascii")
+
+
+def encode_uint8(alphas: np.ndarray) -> tuple[str, float]:
+    """
+    Quantize the weights to one byte per step, scaled so the largest
+    weight maps to 255.
+
+    Returns:
+      - (base64 bytes, scale) where weight ≈ byte * scale
+    """
+    alphas = np.asarray(alphas, dtype=np.float32)
+    peak = float(alphas.max()) if alphas.size else 0.0
+    scale = peak / 255.0 if peak > 0 else 1.0
+    quantized = np.clip(np.rint(alphas / scale), 0, 255).astype(np.uint8)
+    return base64.b64encode(quantized.tobytes()).decode("ascii"), scale
+
+
+def top_k(alphas: np.ndarray, k: int) -> list[tuple[int, float]]:
+    """The k largest weights as (position, weight), largest first."""
+    alphas = np.asarray(alphas)
+    k = min(k, alphas.size)
+    if k <= 0:
+        return []
+    positions = np.argpartition(alphas, -k)[-k:]
+    positions = positions[np.argsort(alphas[positions])[::-1]]
+    return [(int(p), float(alphas[p])) for p in positions]
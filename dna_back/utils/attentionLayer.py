@@ -0,0 +1,76 @@
+import tensorflow as tf
+
+
+# Custom AttentionLayer
+class AttentionLayer(tf.keras.layers.Layer):
+    """
+    Exactly the same implementation you already have.
+    It returns (context_vector, alphas) in call(...)
+    """
+    def __init__(self, **kwargs):
+        super(AttentionLayer, self).__init__(**kwargs)
+
+    def build(self, input_shape):
+        self.W = self.add_weight(
+            name="att_weight",
+            shape=(input_shape[-1], input_shape[-1]),
+            initializer="glorot_uniform",
+            trainable=True,
+        )
+        self.b = self.add_weight(
+            name="att_bias",
+            shape=(input_shape[-1],),
+            initializer="zeros",
+            trainable=True,
+        )
+        self.u = self.add_weight(
+            name="att_u",
+            shape=(input_shape[-1],),
+            initializer="glorot_uniform",
+            trainable=True,
+        )
+        super(AttentionLayer, self).build(input_shape)
+
+    def call(self, inputs):
+        # inputs shape: (batch_size, time_steps, hidden_dim)
+        v = tf.tanh(tf.tensordot(inputs, self.W, axes=1) + self.b)  # (batch, time, hidden)
+        vu = tf.tensordot(v, self.u, axes=1)                         # (batch, time)
+        alphas = tf.nn.softmax(vu)                                   # (batch, time)
+        # Weighted sum
+        output = tf.reduce_sum(inputs * tf.expand_dims(alphas, -1), axis=1)  # (batch, hidden)
+        return output, alphas
+
+
+class PaddedAttentionLayer(AttentionLayer):
+    """
+    AttentionLayer for inputs shorter than the length the model was served at.
+
+    With a masking embedding, the BiLSTM outputs exact zeros at padded time
+    steps, so each padded step scores tanh(b)·u. This layer adds the
+    (padded_length - time_steps) missing steps to the softmax analytically
+    and returns α padded back to `padded_length`, which makes a short
+    input give the same output as the same input padded to `padded_length`.
+    """
+    def __init__(self, padded_length: int, **kwargs):
+        super(PaddedAttentionLayer, self).__init__(**kwargs)
+        self.padded_length = padded_length
+
+    def call(self, inputs):
+        v = tf.tanh(tf.tensordot(inputs, self.W, axes=1) + self.b)  # (batch, time, hidden)
+        vu = tf.tensordot(v, self.u, axes=1)                         # (batch, time)
+        pad_score = tf.tensordot(tf.tanh(self.b), self.u, axes=1)    # score of a zero input
+        n_missing = self.padded_length - tf.shape(inputs)[1]
+
+        m = tf.maximum(tf.reduce_max(vu, axis=1, keepdims=True), pad_score)
+        e = tf.exp(vu - m)                                           # (batch, time)
+        e_pad = tf.exp(pad_score - m)                                # (batch, 1)
+        denom = tf.reduce_sum(e, axis=1, keepdims=True) + tf.cast(n_missing, e.dtype) * e_pad
+        alphas = e / denom
+        output = tf.reduce_sum(inputs * tf.expand_dims(alphas, -1), axis=1)  # (batch, hidden)
+        pad_alphas = tf.tile(e_pad / denom, tf.stack([1, n_missing]))
+        return output, tf.concat([alphas, pad_alphas], axis=1)
+
+    def get_config(self):
+        config = super(PaddedAttentionLayer, self).get_config()
+        config["padded_length"] = self.padded_length
+        return config
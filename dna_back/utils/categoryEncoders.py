@@ -0,0 +1,129 @@
+import warnings
+from typing import Hashable, Iterable, Optional
+
+import numpy as np
+
+# Column index markers for values without a one‐hot column
+ALL_ZEROS   = -1  # dropped category, or unknown with handle_unknown="ignore"
+RAISE       = -2  # unknown with handle_unknown="error"
+
+# Stands in for "a category the encoder has never seen" while compiling
+_UNSEEN = "\x00unseen\x00"
+
+
+class OneHotLookup:
+    """
+    Dictionary replacement for `OneHotEncoder.transform` on one feature.
+
+    Every category is mapped once to the output column it sets, so a batch
+    is encoded with one dict lookup per value and a single NumPy scatter
+    instead of sklearn's validation and per‐call machinery.
+
+    The mapping is compiled by running the fitted encoder itself on every
+    category and on one unseen value, so dropped categories (`drop`),
+    infrequent categories and unknown values (`handle_unknown` "error",
+    "ignore" or "infrequent_if_exist") come out exactly as sklearn encodes
+    them. The output is always a dense array of the encoder's dtype; a
+    `sparse_output` encoder holds the same values in a sparse container.
+
+    Args:
+        index (dict): Category → output column, or ALL_ZEROS.
+        width (int): Number of output columns.
+        unknown (int): Column for unseen values, ALL_ZEROS, or RAISE.
+        dtype: Output dtype.
+    """
+
+    def __init__(self, index: dict, width: int, unknown: int = RAISE, dtype=np.float64):
+        self.index = index
+        self.width = width
+        self.unknown = unknown
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def from_sklearn(cls, ohe) -> "OneHotLookup":
+        """Compile the lookup from a fitted single‐feature OneHotEncoder."""
+        if len(ohe.categories_) != 1:
+            raise ValueError("Only single‐feature encoders can be compiled")
+        categories = list(ohe.categories_[0])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # unknown categories with `drop` set warn
+            encoded = _dense(ohe.transform(np.array(categories, dtype=object)[:, None]))
+            try:
+                unseen = _dense(ohe.transform(np.array([[_UNSEEN]], dtype=object)))
+                unknown = _column(unseen[0])
+            except ValueError:
+                unknown = RAISE
+
+        index = {category: _column(row) for category, row in zip(categories, encoded)}
+        return cls(index, encoded.shape[1], unknown, dtype=encoded.dtype)
+
+    def indices(self, values: Iterable[Hashable]) -> np.ndarray:
+        """
+        Output column per value (ALL_ZEROS where no column is set), for
+        models that take category indices instead of one‐hot rows.
+
+        Raises:
+            ValueError: For unknown values when the encoder was fitted with
+                handle_unknown="error".
+        """
+        values = list(values)
+        idx = np.fromiter((self.index.get(v, self.unknown) for v in values), dtype=np.int64, count=len(values))
+        if self.unknown == RAISE and (idx == RAISE).any():
+            unknown = sorted({str(v) for v, i in zip(values, idx) if i == RAISE})
+            raise ValueError(f"Found unknown categories {unknown} in column 0 during transform")
+        return idx
+
+    def transform(self, values: Iterable[Hashable]) -> np.ndarray:
+        """
+        One‐hot encode a batch of values.
+
+        Returns:
+            np.ndarray: shape (len(values), width), same values and dtype as
+            the sklearn encoder's (densified) output.
+        """
+        idx = self.indices(values)
+        out = np.zeros((len(idx), self.width), dtype=self.dtype)
+        rows = np.flatnonzero(idx >= 0)
+        out[rows, idx[rows]] = 1
+        return out
+
+
+def _dense(matrix) -> np.ndarray:
+    return matrix.toarray() if hasattr(matrix, "toarray") else np.asarray(matrix)
+
+
+def _column(row: np.ndarray) -> int:
+    hot = np.flatnonzero(row)
+    return int(hot[0]) if len(hot) else ALL_ZEROS
+
+
+def verify_against(lookup: OneHotLookup, ohe, values: list) -> Optional[str]:
+    """
+    Compare `lookup` with the sklearn encoder on `values`.
+
+    Returns:
+        None if both give bit‐identical output (or both reject the batch),
+        otherwise a description of the difference.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = _dense(ohe.transform(np.array(values, dtype=object)[:, None]))
+    except ValueError:
+        expected = None
+    try:
+        actual = lookup.transform(values)
+    except ValueError:
+        actual = None
+
+    if expected is None or actual is None:
+        return None if expected is None and actual is None else "only one of them rejected the batch"
+    if expected.dtype != actual.dtype:
+        return f"dtype {actual.dtype} != {expected.dtype}"
+    if expected.shape != actual.shape:
+        return f"shape {actual.shape} != {expected.shape}"
+    rows = np.flatnonzero((expected != actual).any(axis=1))
+    if len(rows):
+        return f"{len(rows)} rows differ, first for {values[rows[0]]!r}"
+    return None
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import func, inspect, text
+from sqlalchemy.orm import Session
+
+from db.DataVersion import DataVersion
+from db.DiseaseRecord import DiseaseRecord
+from utils.database import Base, engine
+
+# Cached totals (0 = always count)
+COUNT_CACHE_SIZE      = int(os.getenv("DNA_COUNT_CACHE_SIZE", "1024"))
+# exact_count=false counts at most this many pages past the requested one
+COUNT_ESTIMATE_PAGES  = int(os.getenv("DNA_COUNT_ESTIMATE_PAGES", "10"))
+
+RECORDS_TABLE = DiseaseRecord.__tablename__
+
+
+def create_data_version_table() -> None:
+    """
+    Create data_versions and the triggers that bump the disease_records
+    version on every insert, update and delete, whoever writes the table
+    (the API, an import script or the sqlite3 shell).
+
+    Without a disease_records table there is nothing to version yet; no
+    version row is written, so totals are not cached until the next start.
+    """
+    Base.metadata.create_all(engine, tables=[DataVersion.__table__])
+    if not inspect(engine).has_table(RECORDS_TABLE):
+        return
+    with engine.begin() as conn:
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {RECORDS_TABLE}_version_{event.lower()} "
+                f"AFTER {event} ON {RECORDS_TABLE} BEGIN "
+                f"UPDATE data_versions SET VERSION = VERSION + 1 WHERE TABLE_NAME = '{RECORDS_TABLE}'; "
+                f"END"
+            ))
+        conn.execute(text(
+            "INSERT OR IGNORE INTO data_versions (TABLE_NAME, VERSION) VALUES (:table, 0)"
+        ), {"table": RECORDS_TABLE})
+
+
+def data_version(db: Session) -> Optional[int]:
+    """Current disease_records version, or None if versioning is not set up."""
+    return db.query(DataVersion.VERSION).filter(DataVersion.TABLE_NAME == RECORDS_TABLE).scalar()
+
+
+def filter_signature(kind: str, **filters) -> str:
+    """
+    Cache key for the rows a filter selects: empty filters are dropped and
+    list filters sorted and de‐duplicated, so the same filter in another
+    order or with repeated values shares one entry.
+    """
+    normalized = {}
+    for name, value in filters.items():
+        if value is None or value == "" or value == []:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted({str(v) for v in value})
+        normalized[name] = value
+    return json.dumps([kind, normalized], sort_keys=True, default=str)
+
+
+class CountCache:
+    """
+    LRU of query totals keyed by (filter signature, data version).
+
+    A write to disease_records bumps its data version, so totals counted
+    before it are never served again; they age out of the LRU.
+
+    Args:
+        max_entries (int): Capacity; 0 disables the cache.
+    """
+
+    def __init__(self, max_entries: int = COUNT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], int]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "estimates": 0}
+
+    def get(self, signature: Optional[str], version: Optional[int]) -> Optional[int]:
+        if not self.max_entries or signature is None or version is None:
+            return None
+        with self._lock:
+            count = self._entries.get((signature, version))
+            if count is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end((signature, version))
+            self._stats["hits"] += 1
+            return count
+
+    def put(self, signature: Optional[str], version: Optional[int], count: int) -> None:
+        if not self.max_entries or signature is None or version is None:
+            return
+        with self._lock:
+            self._entries[(signature, version)] = count
+            self._entries.move_to_end((signature, version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, query, signature: Optional[str], cap: Optional[int] = None) -> Tuple[int, bool]:
+        """
+        Total rows of `query`, from the cache when possible (never for a
+        None signature).
+
+        With `cap`, at most `cap` + 1 rows are counted: if there are more
+        than `cap`, the result is (cap, False), meaning "more than cap",
+        and is not cached.
+
+        Returns:
+            Tuple[int, bool]: (total, whether it is exact).
+        """
+        version = data_version(query.session) if signature is not None else None
+        count = self.get(signature, version)
+        if count is not None:
+            return count, True
+
+        query = query.order_by(None)
+        if cap is None:
+            count = query.count()
+        else:
+            capped = query.with_entities(DiseaseRecord.ID).limit(cap + 1).subquery()
+            count = query.session.query(func.count()).select_from(capped).scalar()
+            if count > cap:
+                with self._lock:
+                    self._stats["estimates"] += 1
+                return cap, False
+        self.put(signature, version, count)
+        return count, True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+# Shared by the paginated /data endpoints of this process
+count_cache = CountCache()
@@ -1,8 +1,14 @@
+import base64
+import binascii
+import json
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from utils.database import SessionLocal
+from utils.countCache import COUNT_ESTIMATE_PAGES, count_cache, filter_signature
+from utils.geneSearch import gene_filter
+from utils.metrics import timed
 from db.DiseaseRecord import DiseaseRecord
 from typing import List, Optional
 
@@ -35,35 +41,250 @@ COLUMN_MAPPING = {
 
 LABEL_TO_DB_COLUMN = {v: k for k, v in COLUMN_MAPPING.items()}
 
-def serialize_record(record: DiseaseRecord) -> dict:
+# Response field → DiseaseRecord column, in response order
+RECORD_FIELDS = {
+    "ID":                    "ID",
+    "Chromosome":            "CHROM",
+    "Position":              "POS",
+    "Reference":             "REF",
+    "Alternate":             "ALT",
+    "Clinical Significance": "CLNSIG",
+    "Gene Info":             "GENEINFO",
+    "Variant Class":         "CLNVC",
+    "Sequence Ontology":     "CLNVCSO",
+    "Disease":               "CLNDN",
+    "Type":                  "ALT_TYPE",
+    "Value":                 "ALT_VALUE",
+    "Normal Sequence":       "NormalSeq",
+    "Mutated Sequence":      "MUTATED_SEQ",
+    "Category":              "Category",
+    "Origin":                "ORIGIN",
+}
+# The large columns, served on their own by /data/records/{id}/sequences
+SEQUENCE_FIELDS = ["Normal Sequence", "Mutated Sequence"]
+
+# Orders the paginated endpoints accept (`sort_by`); ID breaks ties
+SORT_COLUMNS = {"ID": "ID", "Position": "POS"}
+
+
+def encode_cursor(sort_by: str, value, record_id: int) -> str:
+    """Opaque cursor for the row after (value, record_id) in `sort_by` order."""
+    payload = json.dumps({"s": sort_by, "v": value, "id": record_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> tuple:
+    """
+    Decode a cursor from `encode_cursor`.
+
+    Returns:
+        tuple: (last sort value, last ID).
+
+    Raises:
+        HTTPException: If the cursor is malformed or was made for another sort order.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value, record_id = payload["v"], int(payload["id"])
+        made_for = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if made_for != sort_by:
+        raise HTTPException(status_code=400, detail=f"Cursor was created for sort_by={made_for}")
+    return value, record_id
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma‐separated `fields=` value into RECORD_FIELDS names.
+
+    Returns:
+        List[str] | None: The fields in RECORD_FIELDS order, always with
+        ID; None (all fields) for an empty value.
+
+    Raises:
+        HTTPException: On an unknown field.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - RECORD_FIELDS.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}; choose from {list(RECORD_FIELDS)}")
+    return [name for name in RECORD_FIELDS if name in requested or name == "ID"]
+
+
+def page_query(
+    query,
+    page: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    sort_by: str = "ID",
+    fields: Optional[List[str]] = None,
+):
+    """
+    The statement `paginate` runs for one page of a record query: the
+    columns of `fields` (and the sort key), ordered by `sort_by` then ID,
+    starting after `cursor` or at `page`, with one row more than `limit`
+    to tell whether another page follows.
+
+    A page is read in index order without sorting when the query has no
+    filter, a filter on a single value of one column (its (column, ID)
+    index), or a chromosome filter with sort_by=Position. Other filters
+    (several values, several columns, a gene search) still sort their
+    matching rows in a temp B‐tree for every page.
+
+    Raises:
+        HTTPException: On an unknown sort_by or an invalid cursor.
+    """
+    if sort_by not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {list(SORT_COLUMNS)}")
+    sort_column = getattr(DiseaseRecord, SORT_COLUMNS[sort_by])
+    fields = fields or list(RECORD_FIELDS)
+    columns = {RECORD_FIELDS[name] for name in fields} | {SORT_COLUMNS[sort_by]}
+    rows = query.with_entities(*(getattr(DiseaseRecord, column) for column in sorted(columns)))
+
+    if sort_column is DiseaseRecord.ID:
+        ordered = rows.order_by(DiseaseRecord.ID)
+    else:
+        ordered = rows.order_by(sort_column, DiseaseRecord.ID)  # NULLs first, as SQLite sorts them
+
+    if not cursor:
+        return ordered.offset((page - 1) * limit).limit(limit + 1)
+    value, last_id = decode_cursor(cursor, sort_by)
+    if sort_column is DiseaseRecord.ID:
+        ordered = ordered.filter(DiseaseRecord.ID > last_id)
+    elif value is None:
+        ordered = ordered.filter(or_(
+            sort_column.isnot(None),
+            and_(sort_column.is_(None), DiseaseRecord.ID > last_id),
+        ))
+    else:
+        # Written as a range on sort_column so it is an index seek
+        ordered = ordered.filter(
+            sort_column >= value,
+            or_(sort_column > value, DiseaseRecord.ID > last_id),
+        )
+    return ordered.limit(limit + 1)
+
+
+def paginate(
+    query,
+    page: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    sort_by: str = "ID",
+    signature: Optional[str] = None,
+    exact_count: bool = True,
+    fields: Optional[List[str]] = None,
+) -> dict:
     """
-    Serialize a DiseaseRecord  instance into a dictionary.
+    Order a record query by `sort_by` then ID and return one page of it
+    (the statement of `page_query`).
+
+    With `cursor`, the page starts right after the row the cursor points
+    at (keyset pagination: an index seek, so every page costs the same);
+    otherwise `page` is used as an offset. Either way the response carries
+    `next_cursor` (None on the last page).
+
+    The total comes from `count_cache` under `signature` when the data has
+    not changed since it was counted. With `exact_count` False, a total
+    that is not cached is counted only up to COUNT_ESTIMATE_PAGES pages
+    past this one; `total_exact` is then False and `total_records` is a
+    lower bound ("more than").
+
+    Only the columns of `fields` (and the sort key) are selected, as plain
+    rows rather than ORM objects, so pages that leave out the sequences
+    never load them.
+
+    The response has the same keys in both modes; `page` is None with a
+    cursor.
 
     Args:
-        record (DiseaseRecord): The record to serialize.
+        query: SQLAlchemy Query of DiseaseRecord.
+        page (int): 1‐based page number, used without a cursor.
+        limit (int): Records per page.
+        cursor (str, optional): `next_cursor` of the previous page.
+        sort_by (str): Key of SORT_COLUMNS.
+        signature (str, optional): `filter_signature` of the query's filters;
+            None counts without the cache.
+        exact_count (bool): Count every matching row if the total is not cached.
+        fields (List[str], optional): RECORD_FIELDS to return; None = all.
 
     Returns:
-        dict: A dictionary representation of the record.
+        dict: Pagination info and serialized data.
+
+    Raises:
+        HTTPException: On an unknown sort_by or an invalid cursor.
     """
+    fields = fields or list(RECORD_FIELDS)
+    ordered = page_query(query, page, limit, cursor, sort_by, fields)
+
+    cap = None
+    if not exact_count:
+        cap = (0 if cursor else (page - 1) * limit) + limit * COUNT_ESTIMATE_PAGES
+    with timed("count"):
+        total_records, total_exact = count_cache.count(query, signature, cap)
+    records = query.session.execute(ordered.statement).all()
+
+    has_more = len(records) > limit
+    records = records[:limit]
+    next_cursor = None
+    if has_more:
+        last = records[-1]
+        next_cursor = encode_cursor(sort_by, getattr(last, SORT_COLUMNS[sort_by]), last.ID)
+
+    with timed("serialize"):
+        data = [serialize_record(record, fields) for record in records]
     return {
-        "ID":               record.ID,
-        "Chromosome":       record.CHROM,
-        "Position":         record.POS,
-        "Reference":        record.REF,
-        "Alternate":        record.ALT,
-        "Clinical Significance": record.CLNSIG,
-        "Gene Info":        record.GENEINFO,
-        "Variant Class":    record.CLNVC,
-        "Sequence Ontology":record.CLNVCSO,
-        "Disease":          record.CLNDN,
-        "Type":             record.ALT_TYPE,
-        "Value":            record.ALT_VALUE,
-        "Normal Sequence":  record.NormalSeq,
-        "Mutated Sequence": record.MUTATED_SEQ,
-        "Category":         record.Category,
-        "Origin":           record.ORIGIN,
+        "page": None if cursor else page,
+        "limit": limit,
+        "sort_by": sort_by,
+        "total_records": total_records,
+        "total_pages": (total_records + limit - 1) // limit,
+        "total_exact": total_exact,
+        "next_cursor": next_cursor,
+        "data": data,
     }
 
+def serialize_record(record, fields: Optional[List[str]] = None) -> dict:
+    """
+    Serialize a DiseaseRecord instance, or a row of its columns, into a dictionary.
+
+    Args:
+        record: The DiseaseRecord, or a row with (at least) the columns of `fields`.
+        fields (List[str], optional): RECORD_FIELDS to include; None = all.
+
+    Returns:
+        dict: A dictionary representation of the record.
+    """
+    return {name: getattr(record, RECORD_FIELDS[name]) for name in (fields or RECORD_FIELDS)}
+
+
+def get_record_sequences(record_id: int, db: Session = None) -> dict:
+    """
+    Retrieve the normal and mutated sequences of one record.
+
+    Args:
+        record_id (int): DiseaseRecord ID.
+        db (Session): Database session.
+
+    Returns:
+        dict: ID and the SEQUENCE_FIELDS of the record.
+
+    Raises:
+        HTTPException: If db session is not provided or the record does not exist.
+    """
+    validate_db(db)
+    fields = ["ID"] + SEQUENCE_FIELDS
+    row = db.execute(
+        select(*(getattr(DiseaseRecord, RECORD_FIELDS[name]) for name in fields))
+        .where(DiseaseRecord.ID == record_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Record {record_id} not found")
+    return serialize_record(row, fields)
+
 
 def validate_db(db: Session) -> None:
     """
@@ -99,7 +320,8 @@ def apply_filters(
 
     Args:
         query: SQLAlchemy Query object to filter.
-        geneinfo (str, optional): Substring to match in GENEINFO.
+        geneinfo (str, optional): Substring to match in GENEINFO (trigram
+            index from 3 characters, ILIKE below).
         position_start (int, optional): Minimum position value.
         position_stop (int, optional): Maximum position value.
         chrom (List[str], optional): List of chromosomes to include.
@@ -115,7 +337,7 @@ def apply_filters(
         The filtered SQLAlchemy Query object.
     """
     if geneinfo:
-        query = query.filter(DiseaseRecord.GENEINFO.ilike(f"%{geneinfo}%"))
+        query = query.filter(gene_filter(geneinfo))
     
     if between_positions:
         if position_start is not None and position_stop is not None:
@@ -157,7 +379,11 @@ def filter_data_advanced(
     category: Optional[List[str]],
     page: int = 1,
     limit: int = 100,
-    db: Session = None
+    db: Session = None,
+    cursor: Optional[str] = None,
+    sort_by: str = "ID",
+    exact_count: bool = True,
+    fields: Optional[List[str]] = None,
 ) -> dict:
     """
     Retrieve paginated and filtered disease records using between() on positions.
@@ -176,35 +402,31 @@ def filter_data_advanced(
         page (int): Page number for pagination.
         limit (int): Number of records per page.
         db (Session): Database session.
+        cursor (str, optional): Cursor from a previous page; replaces `page`.
+        sort_by (str): Key of SORT_COLUMNS.
+        exact_count (bool): False allows an estimated total (see `paginate`).
+        fields (List[str], optional): RECORD_FIELDS to return; None = all.
 
     Returns:
         dict: A dictionary containing pagination info and serialized data.
 
     Raises:
-        HTTPException: If db session is not provided.
+        HTTPException: If db session is not provided or the cursor is invalid.
     """
-    validate_db(db)
-    query = db.query(DiseaseRecord)
-    query = apply_filters(
-        query,
+    query = advanced_filter_query(
         geneinfo, position_start, position_stop,
         chrom, alt_type, ref, alt_value,
         clnsig, clndn, category,
-        between_positions=True
+        db
     )
-    
-    total_records = query.count()
-    records = query.offset((page - 1) * limit).limit(limit).all()
-    data = [serialize_record(record) for record in records]
-    total_pages = (total_records + limit - 1) // limit
-    
-    return {
-        "page": page,
-        "limit": limit,
-        "total_records": total_records,
-        "total_pages": total_pages,
-        "data": data,
-    }
+    signature = filter_signature(
+        "advanced",
+        geneinfo=geneinfo.lower() if geneinfo else None,  # ILIKE ignores case
+        position=f"{position_start}:{position_stop}" if position_start is not None and position_stop is not None else None,
+        chrom=chrom, alt_type=alt_type, ref=ref, alt_value=alt_value,
+        clnsig=clnsig, clndn=clndn, category=category,
+    )
+    return paginate(query, page, limit, cursor, sort_by, signature, exact_count, fields)
 
 
 def filter_data_by_column(
@@ -212,7 +434,11 @@ def filter_data_by_column(
     value: str,
     page: int = 1,
     limit: int = 100,
-    db: Session = None
+    db: Session = None,
+    cursor: Optional[str] = None,
+    sort_by: str = "ID",
+    exact_count: bool = True,
+    fields: Optional[List[str]] = None,
 ) -> dict:
     """
     Retrieve paginated disease records filtered by a single column.
@@ -223,6 +449,10 @@ def filter_data_by_column(
         page (int): Page number for pagination.
         limit (int): Number of records per page.
         db (Session): Database session.
+        cursor (str, optional): Cursor from a previous page; replaces `page`.
+        sort_by (str): Key of SORT_COLUMNS.
+        exact_count (bool): False allows an estimated total (see `paginate`).
+        fields (List[str], optional): RECORD_FIELDS to return; None = all.
 
     Returns:
         dict: A dictionary containing pagination info and serialized data.
@@ -230,36 +460,12 @@ def filter_data_by_column(
     Raises:
         HTTPException: If db session is None or column is invalid or a database error occurs.
     """
-    validate_db(db)
-
-    if column not in LABEL_TO_DB_COLUMN:
-        raise HTTPException(status_code=400, detail=f"Column '{column}' does not exist.")
-
-    db_column = LABEL_TO_DB_COLUMN[column]
-    
+    query = column_filter_query(column, value, db)
     try:
-        filters = {db_column: value}
-        total_records = db.query(DiseaseRecord).filter_by(**filters).count()
-        records = (
-            db.query(DiseaseRecord)
-            .filter_by(**filters)
-            .offset((page - 1) * limit)
-            .limit(limit)
-            .all()
-        )
+        signature = filter_signature("column", **{LABEL_TO_DB_COLUMN[column]: value})
+        return paginate(query, page, limit, cursor, sort_by, signature, exact_count, fields)
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error occurred")
-    
-    data = [serialize_record(record) for record in records]
-    total_pages = (total_records + limit - 1) // limit
-
-    return {
-        "page": page,
-        "limit": limit,
-        "total_records": total_records,
-        "total_pages": total_pages,
-        "data": data,
-    }
 
 def sort_chromosomes(chromosomes: list) -> list:
     allowed = [str(i) for i in range(1, 23)] + ['X']
@@ -302,7 +508,15 @@ def get_unique_values(column: str, db: Session = None) -> List:
         raise HTTPException(status_code=500, detail=f"Database error occurred: {str(e)}")
 
 
-def get_all_records(page: int = 1, limit: int = 100, db: Session = None) -> dict:
+def get_all_records(
+    page: int = 1,
+    limit: int = 100,
+    db: Session = None,
+    cursor: Optional[str] = None,
+    sort_by: str = "ID",
+    exact_count: bool = True,
+    fields: Optional[List[str]] = None,
+) -> dict:
     """
     Retrieve all disease records paginated without filtering.
 
@@ -310,6 +524,10 @@ def get_all_records(page: int = 1, limit: int = 100, db: Session = None) -> dict
         page (int): Page number for pagination.
         limit (int): Number of records per page.
         db (Session): Database session.
+        cursor (str, optional): Cursor from a previous page; replaces `page`.
+        sort_by (str): Key of SORT_COLUMNS.
+        exact_count (bool): False allows an estimated total (see `paginate`).
+        fields (List[str], optional): RECORD_FIELDS to return; None = all.
 
     Returns:
         dict: A dictionary containing pagination info and serialized data.
@@ -319,17 +537,7 @@ def get_all_records(page: int = 1, limit: int = 100, db: Session = None) -> dict
     """
     validate_db(db)
     try:
-        offset = (page - 1) * limit
-        total_records = db.query(func.count(DiseaseRecord.ID)).scalar()
-        records = db.query(DiseaseRecord).offset(offset).limit(limit).all()
-        data = [serialize_record(record) for record in records]
-        return {
-            "page": page,
-            "limit": limit,
-            "total_records": total_records,
-            "total_pages": (total_records + limit - 1) // limit,
-            "data": data,
-        }
+        return paginate(db.query(DiseaseRecord), page, limit, cursor, sort_by, filter_signature("all"), exact_count, fields)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Database error occurred: {str(e)}")
 
@@ -352,7 +560,7 @@ def get_disease_counts_grouped_by_category(db: Session = None) -> dict:
             db.query(
                 DiseaseRecord.Category,
                 DiseaseRecord.CLNDN,
-                func.count(DiseaseRecord.ID).label("count")
+                func.count().label("count")
             )
             .group_by(DiseaseRecord.Category, DiseaseRecord.CLNDN)
             .all()
@@ -423,3 +631,50 @@ def filter_query(
         between_positions=False
     )
     return query
+
+
+def advanced_filter_query(
+    geneinfo, position_start, position_stop,
+    chrom, alt_type, ref, alt_value,
+    clnsig, clndn, category,
+    db: Session
+):
+    """
+    Build the query of `filter_data_advanced`: the filters with between()
+    for positions, before ordering and pagination.
+
+    Returns:
+        query: The constructed SQLAlchemy Query object.
+
+    Raises:
+        HTTPException: If db session is None.
+    """
+    validate_db(db)
+    return apply_filters(
+        db.query(DiseaseRecord),
+        geneinfo, position_start, position_stop,
+        chrom, alt_type, ref, alt_value,
+        clnsig, clndn, category,
+        between_positions=True
+    )
+
+
+def column_filter_query(column: str, value: str, db: Session):
+    """
+    Build the query of `filter_data_by_column`, before ordering and pagination.
+
+    Args:
+        column (str): Column label to filter by (value of COLUMN_MAPPING).
+        value (str): Value to filter the column on.
+        db (Session): Database session.
+
+    Returns:
+        query: The constructed SQLAlchemy Query object.
+
+    Raises:
+        HTTPException: If db session is None or the column is invalid.
+    """
+    validate_db(db)
+    if column not in LABEL_TO_DB_COLUMN:
+        raise HTTPException(status_code=400, detail=f"Column '{column}' does not exist.")
+    return db.query(DiseaseRecord).filter_by(**{LABEL_TO_DB_COLUMN[column]: value})
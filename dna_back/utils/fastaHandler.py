@@ -0,0 +1,137 @@
+import codecs
+import io
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from Bio import SeqIO
+
+ATCG_RE = re.compile(r"[ATCG]+")
+# `chrom=7` / `gene=BRCA1` tokens in a FASTA header
+HEADER_TOKEN_RE = re.compile(r"(?:^|\s)(chrom|gene)=(\S+)", re.IGNORECASE)
+# Dropped from sequence lines, as SeqIO's "fasta" parser does
+SEQUENCE_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+class FastaRecord(NamedTuple):
+    record_id:  str
+    sequence:   str
+    chromosome: Optional[str] = None
+    gene_info:  Optional[str] = None
+
+
+def parse_header_metadata(description: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read `chrom=` and `gene=` tokens from a FASTA header line, e.g.
+    `>var1 chrom=17 gene=BRCA1`. Keys are case‐insensitive; the last
+    occurrence wins. Values are returned as written, unvalidated.
+
+    Returns:
+        (chromosome, gene_info), None for tokens that are absent.
+    """
+    found = {key.lower(): value for key, value in HEADER_TOKEN_RE.findall(description)}
+    return found.get("chrom"), found.get("gene")
+
+
+def iter_fasta_records(handle, parse_headers: bool = False) -> Iterator[FastaRecord]:
+    """
+    Parse FASTA records lazily, skipping non‐ATCG ones.
+
+    Args:
+        handle: Text file handle positioned at the start of the FASTA data.
+        parse_headers (bool): Fill chromosome/gene_info from header tokens.
+
+    Yields:
+        FastaRecord: Upper‐cased sequence with its record id.
+    """
+    for rec in SeqIO.parse(handle, "fasta"):
+        record = _to_record(rec.id, rec.description, str(rec.seq), parse_headers)
+        if record is not None:
+            yield record
+
+
+def _to_record(record_id: str, description: str, sequence: str, parse_headers: bool) -> Optional[FastaRecord]:
+    seq = sequence.strip().upper()
+    if not ATCG_RE.fullmatch(seq):
+        # Skip any record whose sequence is not purely ATCG
+        return None
+    if parse_headers:
+        return FastaRecord(record_id, seq, *parse_header_metadata(description))
+    return FastaRecord(record_id, seq)
+
+
+def iter_fasta_chunks(handle, chunk_size: int, parse_headers: bool = False) -> Iterator[List[FastaRecord]]:
+    """
+    Parse FASTA records lazily and yield lists of at most `chunk_size`
+    valid ATCG records.
+
+    Args:
+        handle: Text file handle positioned at the start of the FASTA data.
+        chunk_size (int): Maximum number of records per chunk.
+        parse_headers (bool): Fill chromosome/gene_info from header tokens.
+
+    Yields:
+        List[FastaRecord]: Upper‐cased records; non‐ATCG records are skipped.
+    """
+    chunk = []
+    for record in iter_fasta_records(handle, parse_headers):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class FastaStreamParser:
+    """
+    Push parser for FASTA bytes that arrive in pieces (e.g. an upload
+    still being received): `feed` each piece and get back the records it
+    completed. Reads the same records as `iter_fasta_records` (SeqIO's
+    "fasta" format, UTF‐8 with or without BOM, any newline style).
+
+    Args:
+        parse_headers (bool): Fill chromosome/gene_info from header tokens.
+
+    Raises:
+        ValueError: From `feed` if the data does not start with a '>' header line.
+        UnicodeDecodeError: From `feed` on bytes that are not UTF‐8.
+    """
+
+    def __init__(self, parse_headers: bool = False):
+        self.parse_headers = parse_headers
+        self._decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8-sig")(), translate=True)
+        self._partial = ""  # text after the last complete line
+        self._title: Optional[str] = None
+        self._lines: List[str] = []
+
+    def feed(self, data: bytes, final: bool = False) -> List[FastaRecord]:
+        """Parse the next piece of data; `final` marks the end of the input."""
+        lines = (self._partial + self._decoder.decode(data, final)).split("\n")
+        self._partial = "" if final else lines.pop()
+        if final and lines and not lines[-1]:
+            lines.pop()  # after the last newline
+
+        records = []
+        for line in lines:
+            if line.startswith(">"):
+                records.append(self._finish())
+                self._title = line[1:].rstrip()
+            elif self._title is None:
+                raise ValueError("FASTA data must start with a '>' header line")
+            else:
+                self._lines.append(line)
+        if final:
+            records.append(self._finish())
+        return [record for record in records if record is not None]
+
+    def close(self) -> List[FastaRecord]:
+        """End of input: the records still pending."""
+        return self.feed(b"", final=True)
+
+    def _finish(self) -> Optional[FastaRecord]:
+        if self._title is None:
+            return None
+        title, sequence = self._title, "".join(self._lines).translate(SEQUENCE_WHITESPACE)
+        self._title, self._lines = None, []
+        record_id = title.split(None, 1)[0] if title else ""
+        return _to_record(record_id, title, sequence, self.parse_headers)
@@ -0,0 +1,205 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from sqlalchemy import column, func, inspect, literal_column, select, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from db.DiseaseRecord import DiseaseRecord
+from utils.countCache import data_version
+from utils.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Shortest text the trigram index can match; shorter searches use ILIKE
+MIN_INDEXED_LENGTH  = 3
+# Suggestions per /data/genes/suggest call, unless the request asks for fewer
+SUGGEST_LIMIT       = int(os.getenv("DNA_GENE_SUGGEST_LIMIT", "10"))
+# Seconds a symbol list is reused when there is no data version to tell
+# whether disease_records changed
+SUGGEST_TTL         = float(os.getenv("DNA_GENE_SUGGEST_TTL", "300"))
+
+RECORDS_TABLE = DiseaseRecord.__tablename__
+FTS_TABLE     = f"{RECORDS_TABLE}_fts"
+
+# External‐content FTS5 index: stores only the trigram index, the text stays
+# in disease_records and the FTS rowid is the record ID
+fts = table(FTS_TABLE, column("rowid"), column("GENEINFO"))
+
+_CREATE_FTS = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"GENEINFO, content='{RECORDS_TABLE}', content_rowid='ID', tokenize='trigram')"
+)
+# Keep the index in step with every write to disease_records
+_TRIGGERS = {
+    "insert": (
+        f"AFTER INSERT ON {RECORDS_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, GENEINFO) VALUES (new.ID, new.GENEINFO); END"
+    ),
+    "delete": (
+        f"AFTER DELETE ON {RECORDS_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, GENEINFO) VALUES ('delete', old.ID, old.GENEINFO); END"
+    ),
+    "update": (
+        f"AFTER UPDATE OF ID, GENEINFO ON {RECORDS_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, GENEINFO) VALUES ('delete', old.ID, old.GENEINFO); "
+        f"INSERT INTO {FTS_TABLE}(rowid, GENEINFO) VALUES (new.ID, new.GENEINFO); END"
+    ),
+}
+
+_ready = False
+
+
+def create_gene_search_index(rebuild: bool = False) -> bool:
+    """
+    Create the GENEINFO trigram index and its sync triggers if missing,
+    filling it from the existing rows; `rebuild` refills an existing one.
+
+    Returns:
+        bool: False if there is no disease_records table yet or this SQLite
+        build has no FTS5 trigram tokenizer, in which case gene searches
+        keep using ILIKE.
+    """
+    global _ready
+    if not inspect(engine).has_table(RECORDS_TABLE):
+        return False
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+            ).first() is not None
+            if not exists:
+                conn.execute(text(_CREATE_FTS))
+            for event, body in _TRIGGERS.items():
+                conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{event} {body}"))
+            if rebuild or not exists:
+                start = time.perf_counter()
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                logger.info("Built %s in %.1fs", FTS_TABLE, time.perf_counter() - start)
+    except OperationalError as e:
+        logger.warning("Gene search index unavailable, using ILIKE: %s", e)
+        return False
+    _ready = True
+    return True
+
+
+def gene_search_ready() -> bool:
+    """True once the trigram index and its triggers exist (created by this or another process)."""
+    global _ready
+    if not _ready:
+        with engine.connect() as conn:
+            _ready = conn.execute(
+                text("SELECT count(*) FROM sqlite_master WHERE name IN (:table, :trigger)"),
+                {"table": FTS_TABLE, "trigger": f"{FTS_TABLE}_update"},
+            ).scalar() == 2
+    return _ready
+
+
+def match_expression(search: str) -> str:
+    """FTS5 query matching `search` anywhere in GENEINFO, as one quoted phrase."""
+    return 'GENEINFO : "' + search.replace('"', '""') + '"'
+
+
+def gene_filter(search: str):
+    """
+    WHERE clause for records whose GENEINFO contains `search` (case
+    insensitive, like ILIKE '%search%'), through the trigram index when
+    the search is long enough and the index exists.
+    """
+    if len(search) >= MIN_INDEXED_LENGTH and gene_search_ready():
+        matches = select(fts.c.rowid).where(literal_column(FTS_TABLE).op("MATCH")(match_expression(search)))
+        return DiseaseRecord.ID.in_(matches)
+    return DiseaseRecord.GENEINFO.ilike(f"%{search}%")
+
+
+class GeneSuggester:
+    """
+    In‐memory autocomplete over the gene symbols of GENEINFO.
+
+    Symbols are kept in one newline‐joined string, most variants first,
+    so the top N matches are the first N hits of `str.find`: prefix
+    matches ("\\nBRC") first, then other substring matches. The symbol
+    list is rebuilt when the disease_records data version changes, or
+    every `ttl_seconds` while there is no data version.
+
+    Args:
+        ttl_seconds (float): Lifetime of the symbol list without a data version.
+    """
+
+    def __init__(self, ttl_seconds: float = SUGGEST_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._built = False
+        self._built_at = 0.0
+        # (symbols, variant counts, haystack, offset of each symbol in haystack),
+        # replaced as a whole so readers never see half a rebuild
+        self._index = ([], [], "\n", [])
+
+    def suggest(self, db: Session, search: str, limit: int = SUGGEST_LIMIT) -> List[dict]:
+        """
+        Gene symbols containing `search` (case insensitive), prefix
+        matches first, each group by number of variants.
+
+        Returns:
+            List[dict]: [{"gene": symbol, "variants": count}, ...]
+        """
+        self._refresh(db)
+        needle = search.strip().upper()
+        if not needle or limit < 1 or "\n" in needle:
+            return []
+        symbols, counts, haystack, starts = self._index
+
+        found: List[int] = []
+        for pattern, shift in (("\n" + needle, 1), (needle, 0)):
+            pos = haystack.find(pattern)
+            while pos != -1 and len(found) < limit:
+                i = bisect.bisect_right(starts, pos + shift) - 1
+                if i not in found:
+                    found.append(i)
+                pos = haystack.find(pattern, starts[i + 1] if i + 1 < len(starts) else len(haystack))
+            if len(found) >= limit:
+                break
+        return [{"gene": symbols[i], "variants": counts[i]} for i in found]
+
+    def _fresh(self, version: Optional[int]) -> bool:
+        if not self._built or version != self._version:
+            return False
+        return version is not None or time.monotonic() - self._built_at < self.ttl_seconds
+
+    def _refresh(self, db: Session) -> None:
+        version = data_version(db)
+        if self._fresh(version):
+            return
+        with self._lock:
+            if self._fresh(version):
+                return
+            counts: Counter = Counter()
+            rows = db.query(DiseaseRecord.GENEINFO, func.count()).group_by(DiseaseRecord.GENEINFO)
+            for geneinfo, n in rows:
+                for entry in (geneinfo or "").split("|"):
+                    symbol = entry.split(":", 1)[0].strip().upper()
+                    if symbol:
+                        counts[symbol] += n
+            ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            starts, offset = [], 1
+            for symbol, _ in ranked:
+                starts.append(offset)
+                offset += len(symbol) + 1
+            symbols = [symbol for symbol, _ in ranked]
+            self._index = (symbols, [n for _, n in ranked], "\n" + "\n".join(symbols) + "\n", starts)
+            self._version = version
+            self._built_at = time.monotonic()
+            self._built = True
+
+    def stats(self) -> dict:
+        return {"symbols": len(self._index[0]), "data_version": self._version}
+
+
+# Shared by /data/genes/suggest in this process
+gene_suggester = GeneSuggester()
@@ -0,0 +1,138 @@
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import Model
+
+# Backend names accepted by make_runner / DNA_INFERENCE_BACKEND
+# ("tflite" is served by utils.tfliteRunner from exported files instead)
+BACKEND_KERAS = "keras"
+BACKEND_GRAPH = "graph"
+
+
+def _as_list(inputs) -> list:
+    return list(inputs) if isinstance(inputs, (list, tuple)) else [inputs]
+
+
+def _dense(x, dtype) -> np.ndarray:
+    # OneHotEncoder may hand back a scipy sparse matrix
+    if hasattr(x, "toarray"):
+        x = x.toarray()
+    return np.asarray(x, dtype=dtype)
+
+
+class KerasRunner:
+    """
+    Serve a fused (probs, alphas) model through `Model.predict`.
+
+    This is the original path: simple, but `predict` builds a data adapter
+    and callback list on every call.
+    """
+    name = BACKEND_KERAS
+
+    def __init__(self, model: Model):
+        self.model = model
+        self.nbytes = int(model.count_params()) * 4  # float32 weights
+
+    @property
+    def variable_length(self) -> bool:
+        return self.model.inputs[0].shape[1] is None
+
+    def warmup(self, lengths=None) -> None:
+        pass
+
+    def __call__(self, inputs, batch_size: int) -> tuple[np.ndarray, np.ndarray]:
+        probs, alphas = self.model.predict(inputs, batch_size=batch_size, verbose=0)
+        return probs, alphas
+
+
+class GraphRunner:
+    """
+    Serve a fused (probs, alphas) model through a pre‐traced `tf.function`.
+
+    The function has a fixed input signature (only the batch dimension, and
+    the sequence length of a bucketed model, is free), so it is traced up
+    front and every later call, including batch‐of‐one requests, goes
+    straight to the compiled graph. With `jit_compile=True` the graph is
+    also compiled by XLA.
+
+    Args:
+        model (Model): Fused model with inputs [sequence, (chromosome), (gene)].
+        jit_compile (bool): Compile the traced graph with XLA.
+    """
+    name = BACKEND_GRAPH
+
+    def __init__(self, model: Model, jit_compile: bool = False):
+        self.model = model
+        self.nbytes = int(model.count_params()) * 4  # float32 weights
+        self.jit_compile = jit_compile
+        self._specs = [
+            tf.TensorSpec(shape=(None,) + tuple(inp.shape[1:]), dtype=inp.dtype)
+            for inp in model.inputs
+        ]
+        single_input = len(self._specs) == 1
+
+        @tf.function(input_signature=self._specs, jit_compile=jit_compile)
+        def forward(*tensors):
+            probs, alphas = model(tensors[0] if single_input else list(tensors), training=False)
+            return probs, alphas
+
+        self._forward = forward
+        self._forward.get_concrete_function()  # trace now, not on the first request
+
+    @property
+    def variable_length(self) -> bool:
+        return self.model.inputs[0].shape[1] is None
+
+    def warmup(self, lengths=None) -> None:
+        """
+        Run one batch‐of‐one call per sequence length so XLA/kernels are
+        ready before traffic. `lengths` (the padded lengths that will be
+        served) is required for a variable‐length sequence input and
+        ignored otherwise.
+
+        Raises:
+            ValueError: If the model is variable‐length and no lengths are given.
+        """
+        if not self.variable_length:
+            lengths = (None,)
+        elif not lengths or any(length is None for length in lengths):
+            raise ValueError("Variable‐length model: warmup() needs the padded sequence lengths to trace")
+        for length in lengths:
+            zeros = [
+                np.zeros(
+                    (1,) + tuple(length if dim is None else dim for dim in spec.shape[1:]),
+                    dtype=spec.dtype.as_numpy_dtype,
+                )
+                for spec in self._specs
+            ]
+            self._forward(*zeros)
+
+    def __call__(self, inputs, batch_size: int) -> tuple[np.ndarray, np.ndarray]:
+        arrays = [
+            _dense(x, spec.dtype.as_numpy_dtype)
+            for x, spec in zip(_as_list(inputs), self._specs)
+        ]
+        n = arrays[0].shape[0]
+        probs_parts, alphas_parts = [], []
+        for start in range(0, n, batch_size):
+            probs, alphas = self._forward(*[a[start : start + batch_size] for a in arrays])
+            probs_parts.append(probs.numpy())
+            alphas_parts.append(alphas.numpy())
+        return np.concatenate(probs_parts), np.concatenate(alphas_parts)
+
+
+def make_runner(model: Model, backend: str, jit_compile: bool = False, warmup_lengths=None):
+    """
+    Wrap a fused model in the runner for `backend` and warm it up (once per
+    entry of `warmup_lengths` for variable‐length models).
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if backend == BACKEND_KERAS:
+        runner = KerasRunner(model)
+    elif backend == BACKEND_GRAPH:
+        runner = GraphRunner(model, jit_compile=jit_compile)
+    else:
+        raise ValueError(f"Unknown inference backend '{backend}'")
+    runner.warmup(warmup_lengths)
+    return runner
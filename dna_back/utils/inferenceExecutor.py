@@ -0,0 +1,118 @@
+import contextvars
+import math
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from utils import metrics
+
+# Inference calls running at once; TensorFlow already spreads one call over
+# the cores, so a few are enough to keep them busy
+INFERENCE_CONCURRENCY = int(os.getenv("DNA_INFERENCE_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+# Calls allowed to wait for a free slot before new ones are turned away
+INFERENCE_QUEUE_SIZE  = int(os.getenv("DNA_INFERENCE_QUEUE_SIZE", "64"))
+
+
+class ExecutorFull(RuntimeError):
+    """Raised by `BoundedExecutor.submit` when every slot and queue place is taken."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor(Executor):
+    """
+    Thread pool for CPU‐bound inference with a fixed number of workers and a
+    bounded wait queue.
+
+    `submit` fails fast with ExecutorFull instead of queueing without limit,
+    so an overloaded server sheds load instead of piling up requests that
+    would time out anyway. Tasks run in a copy of the submitter's context,
+    so request timings (utils.metrics) reach the right request, and the
+    time a task waited for a worker is recorded as the "wait" stage.
+
+    Args:
+        max_workers (int): Tasks running at once.
+        max_queue (int): Tasks waiting for a worker before submit fails.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_CONCURRENCY, max_queue: int = INFERENCE_QUEUE_SIZE):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0             # running + queued
+        self._mean_seconds = 0.0      # moving average of task run time
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    def full(self) -> bool:
+        with self._lock:
+            return self._pending >= self.max_workers + self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until a queue place is likely free, from the average task time."""
+        with self._lock:
+            backlog = self._pending - self.max_workers + 1
+            return max(1, math.ceil(self._mean_seconds * max(backlog, 1) / self.max_workers))
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                full = True
+            else:
+                self._pending += 1
+                self._stats["submitted"] += 1
+                full = False
+        if full:
+            raise ExecutorFull(self.retry_after())
+
+        context = contextvars.copy_context()
+        queued_at = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            metrics.record("wait", started - queued_at)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                self._finish(time.perf_counter() - started, ok)
+
+        try:
+            future = self._pool.submit(context.run, task)
+        except RuntimeError:  # pool shut down
+            self._finish(0.0, False)
+            raise
+        # A task cancelled while queued (e.g. the client went away) never runs
+        future.add_done_callback(lambda f: self._finish(0.0, False) if f.cancelled() else None)
+        return future
+
+    def _finish(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._stats["completed" if ok else "failed"] += 1
+            if seconds:  # 0 = never ran
+                self._mean_seconds = seconds if not self._mean_seconds else 0.9 * self._mean_seconds + 0.1 * seconds
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": min(self._pending, self.max_workers),
+                "queued": max(0, self._pending - self.max_workers),
+                "mean_task_ms": 1000.0 * self._mean_seconds,
+            }
+
+
+# Shared by every prediction endpoint of this process
+inference_executor = BoundedExecutor()
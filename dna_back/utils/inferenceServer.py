@@ -0,0 +1,452 @@
+"""
+Inference server: model‐owning worker processes that the API processes
+talk to over local sockets.
+
+A supervisor (no TensorFlow in it) starts `DNA_INFERENCE_WORKERS` worker
+processes and restarts any that die. Each worker loads the models once,
+listens on its own unix socket `<address>.<n>` and serves every client
+connection in a thread. API processes use `InferenceClient`, which keeps a
+small pool of connections spread over the workers, so they import no
+TensorFlow and inference capacity scales with the number of workers,
+not the number of uvicorn workers.
+
+Workers are spawned rather than forked after loading, because the
+TensorFlow runtime does not survive a fork. The server therefore serves
+the TFLite backend by default (export the models first with
+`python -m scripts.export_tflite`): the interpreters memory‐map the same
+`.tflite` files, so all workers share one copy of the weights in the page
+cache. Like the in‐process backends it serves the float32 export; a
+quantized one is only used when DNA_TFLITE_QUANTIZATION asks for it. The Keras/graph backends would load a private copy of every model
+per worker, so they are only accepted with a single worker.
+
+Connections are unpickled, so whoever can connect can run code in a
+worker. The sockets therefore live in a private (0700) directory owned by
+the server's user, and the handshake key is never a built‐in default: it
+is DNA_INFERENCE_AUTHKEY if set, otherwise a random key the supervisor
+writes to `<address>.key` (mode 0600) for clients of the same user.
+
+Usage (from dna_back/):
+    python -m utils.inferenceServer --address /run/dna/inference.sock --workers 4
+    DNA_INFERENCE_SERVER=/run/dna/inference.sock uvicorn main:app --workers 8
+"""
+import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import queue
+import secrets
+import signal
+import stat
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from utils import metrics
+from utils.tfliteRunner import BACKEND_TFLITE, QUANT_NONE
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_WORKERS         = int(os.getenv("DNA_INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+INFERENCE_WORKER_THREADS  = int(os.getenv("DNA_INFERENCE_WORKER_THREADS", "1"))
+# Shared handshake secret; empty = the supervisor generates one per start
+INFERENCE_AUTHKEY         = os.getenv("DNA_INFERENCE_AUTHKEY", "").encode()
+INFERENCE_TIMEOUT         = float(os.getenv("DNA_INFERENCE_TIMEOUT", "60"))
+# Backend of the workers; anything but tflite costs one copy of the weights per worker.
+# Unquantized by default, so predictions match the in‐process float32 models
+SERVER_BACKEND            = os.getenv("DNA_INFERENCE_BACKEND", BACKEND_TFLITE)
+SERVER_QUANTIZATION       = os.getenv("DNA_TFLITE_QUANTIZATION", QUANT_NONE)
+
+LOG_FORMAT  = "%(asctime)s %(processName)s %(message)s"
+
+OP_PREDICT  = "predict"
+OP_INFO     = "info"
+OP_STATS    = "stats"
+
+
+def worker_address(address: str, index: int) -> str:
+    return f"{address}.{index}"
+
+
+def key_path(address: str) -> Path:
+    return Path(f"{address}.key")
+
+
+def default_address() -> str:
+    """A socket path in a per‐user directory, never directly in a shared one."""
+    base = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"dna-inference-{os.getuid()}", "inference.sock")
+
+
+def prepare_socket_dir(address: str) -> None:
+    """
+    Create the directory of `address` with mode 0700, or check that an
+    existing one is a private directory of this user.
+
+    Raises:
+        ValueError: If the directory is a symlink, belongs to someone else
+            or is accessible to the group or others (e.g. bare /tmp).
+    """
+    directory = Path(address).parent
+    try:
+        directory.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    info = directory.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ValueError(
+            f"Inference sockets need a private directory: {directory} must be a directory "
+            f"owned by uid {os.getuid()} with mode 0700 (not a shared one like /tmp)"
+        )
+
+
+def load_authkey(address: str) -> bytes:
+    """
+    DNA_INFERENCE_AUTHKEY, or the key the supervisor of `address` wrote.
+
+    Raises:
+        ConnectionError: If neither exists (server not running).
+    """
+    if INFERENCE_AUTHKEY:
+        return INFERENCE_AUTHKEY
+    try:
+        return key_path(address).read_bytes()
+    except OSError as e:
+        raise ConnectionError(f"No inference server key at {key_path(address)}: {e}")
+
+
+def _write_authkey(address: str, authkey: bytes) -> None:
+    path = key_path(address)
+    path.unlink(missing_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(authkey)
+
+
+# Worker side
+
+def _handle_connection(conn: Connection, mh) -> None:
+    with conn:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                conn.send(("ok", _dispatch(request, mh)))
+            except Exception as e:
+                conn.send(("error", type(e).__name__, str(e)))
+
+
+def _dispatch(request: dict, mh):
+    op = request["op"]
+    if op == OP_PREDICT:
+        timings: dict = {}
+        with_attention = request.get("with_attention", True)
+        outputs = metrics.run_with_sinks(
+            [timings],
+            mh.attention_predict_batch,
+            request["sequences"],
+            request["chromosomes"],
+            request["gene_infos"],
+            mh.INFERENCE_BATCH_SIZE,
+            request["tile_long"],
+            with_attention,
+        )
+        # Three arrays pickle much faster than a list of tuples; the stage
+        # timings go back so the API process can report them
+        alphas = None
+        if with_attention:
+            alphas = [a for _, _, a in outputs]
+            # Tiled sequences have one α per k‐mer, so lengths can differ
+            if len({a.shape for a in alphas}) == 1:
+                alphas = np.stack(alphas).astype(np.float32, copy=False)
+        return (
+            np.asarray([idx for idx, _, _ in outputs], dtype=np.int64),
+            np.stack([probs for _, probs, _ in outputs]).astype(np.float32, copy=False),
+            alphas,
+            timings,
+        )
+    if op == OP_INFO:
+        return {
+            "pid": os.getpid(),
+            "backend": mh.INFERENCE_BACKEND,
+            "quantization": mh.TFLITE_QUANTIZATION if mh.INFERENCE_BACKEND == BACKEND_TFLITE else None,
+            "label_map": mh.label_map,
+            "model_version": mh.prediction_cache.model_version,
+        }
+    if op == OP_STATS:
+        return {"pid": os.getpid(), "registry": mh.model_registry.stats(), "cache": mh.prediction_cache.stats()}
+    raise ValueError(f"Unknown operation '{op}'")
+
+
+def _serve_worker(address: str, authkey: bytes, threads: int, backend: str, quantization: str) -> None:
+    """Worker process entry point: load the models, then serve `address`."""
+    os.environ["DNA_INFERENCE_BACKEND"] = backend
+    os.environ["DNA_TFLITE_QUANTIZATION"] = quantization
+    # Spawned: the supervisor's logging configuration is not inherited
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    os.environ.setdefault("DNA_TFLITE_THREADS", str(threads))
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+    from utils import modelHandler as mh
+    mh.model_registry.preload(mh.MODEL_PATHS)
+
+    Path(address).unlink(missing_ok=True)
+    listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    logger.info(
+        "Inference worker %d serving %s (backend %s, quantization %s)",
+        os.getpid(), address, mh.INFERENCE_BACKEND, mh.TFLITE_QUANTIZATION,
+    )
+    while True:
+        try:
+            conn = listener.accept()
+        except Exception:  # failed handshake; keep serving
+            continue
+        threading.Thread(target=_handle_connection, args=(conn, mh), daemon=True).start()
+
+
+def serve(
+    address: str,
+    workers: int = INFERENCE_WORKERS,
+    authkey: bytes = INFERENCE_AUTHKEY,
+    backend: str = SERVER_BACKEND,
+    quantization: str = SERVER_QUANTIZATION,
+) -> None:
+    """
+    Run the supervisor until SIGINT/SIGTERM: start the workers, restart
+    any that exit, and remove their sockets on shutdown.
+
+    Without an `authkey` a random one is generated and written to
+    `<address>.key` for the clients.
+
+    Raises:
+        ValueError: If more than one worker would serve a non‐TFLite backend,
+            or the socket directory is not private (see prepare_socket_dir).
+    """
+    if backend != BACKEND_TFLITE and workers > 1:
+        raise ValueError(
+            f"The '{backend}' backend loads a private copy of the models in every worker; "
+            f"use DNA_INFERENCE_BACKEND={BACKEND_TFLITE} (shared, memory‐mapped weights) or a single worker"
+        )
+    prepare_socket_dir(address)
+    generated = not authkey
+    if generated:
+        authkey = secrets.token_bytes(32)
+        _write_authkey(address, authkey)
+    logger.info(
+        "Starting %d inference workers: backend %s, quantization %s",
+        workers, backend, quantization if backend == BACKEND_TFLITE else "n/a",
+    )
+    ctx = multiprocessing.get_context("spawn")
+    procs: List[Optional[multiprocessing.Process]] = [None] * workers
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        while not stopping.is_set():
+            for i, proc in enumerate(procs):
+                if proc is None or not proc.is_alive():
+                    if proc is not None:
+                        logger.warning("Inference worker %d exited with %s; restarting", i, proc.exitcode)
+                    procs[i] = ctx.Process(
+                        target=_serve_worker,
+                        args=(worker_address(address, i), authkey, INFERENCE_WORKER_THREADS, backend, quantization),
+                        daemon=True,
+                    )
+                    procs[i].start()
+            stopping.wait(1.0)
+    finally:
+        for proc in procs:
+            if proc is not None and proc.is_alive():
+                proc.terminate()
+        for i, proc in enumerate(procs):
+            if proc is not None:
+                proc.join(timeout=10)
+            Path(worker_address(address, i)).unlink(missing_ok=True)
+        if generated:
+            key_path(address).unlink(missing_ok=True)
+
+
+# Client side
+
+class InferenceClient:
+    """
+    Connection pool to the workers of one inference server.
+
+    Each call borrows an idle connection (opening one to the next worker
+    round‐robin if fewer than one per worker are open), sends the request
+    and waits for the reply. A connection that fails is dropped and the
+    call is retried once on another worker.
+
+    Args:
+        address (str): Base socket path the server was started with.
+        authkey (bytes, optional): Shared secret for the connection handshake;
+            default is `load_authkey(address)`, read again on every connect
+            because a restarted server generates a new one.
+        timeout (float): Seconds to wait for a reply.
+
+    Raises:
+        ConnectionError: If no worker can be reached or a reply times out.
+    """
+
+    def __init__(self, address: str, authkey: Optional[bytes] = None, timeout: float = INFERENCE_TIMEOUT):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+        self._next = 0
+        self._pid = os.getpid()
+
+    def _workers(self) -> List[str]:
+        # `<address>.<n>`; not the `<address>.key` next to them
+        return sorted(glob.glob(glob.escape(self.address) + ".[0-9]*"))
+
+    def _authkey(self) -> bytes:
+        return self.authkey or load_authkey(self.address)
+
+    def _connect(self) -> Connection:
+        workers = self._workers()
+        if not workers:
+            raise ConnectionError(f"No inference workers listening at {self.address}.*")
+        authkey = self._authkey()
+        last_error: Exception = ConnectionError("unreachable")
+        for _ in range(len(workers)):
+            with self._lock:
+                address = workers[self._next % len(workers)]
+                self._next += 1
+            try:
+                return Client(address, family="AF_UNIX", authkey=authkey)
+            except (OSError, EOFError, AuthenticationError) as e:
+                last_error = e
+        raise ConnectionError(f"No inference worker reachable at {self.address}.*: {last_error}")
+
+    def _acquire(self) -> Connection:
+        if os.getpid() != self._pid:
+            # Forked after connecting: never share sockets with the parent
+            self._idle, self._open, self._pid = queue.LifoQueue(), 0, os.getpid()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._open < max(1, len(self._workers()))
+            if grow:
+                self._open += 1
+        if grow:
+            try:
+                return self._connect()
+            except ConnectionError:
+                with self._lock:
+                    self._open -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise ConnectionError("Timed out waiting for a free inference connection")
+
+    def _discard(self, conn: Connection) -> None:
+        try:
+            conn.close()
+        except OSError:
+            pass
+        with self._lock:
+            self._open -= 1
+
+    def _call(self, request: dict):
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.send(request)
+                if not conn.poll(self.timeout):
+                    raise TimeoutError(f"No reply from the inference server within {self.timeout:.0f}s")
+                reply = conn.recv()
+            except (OSError, EOFError, TimeoutError) as e:
+                self._discard(conn)
+                if attempt or isinstance(e, TimeoutError):
+                    raise ConnectionError(str(e)) from e
+                continue
+            self._idle.put(conn)
+            if reply[0] == "ok":
+                return reply[1]
+            _, kind, message = reply
+            if kind == "ValueError":
+                raise ValueError(message)
+            raise RuntimeError(f"Inference server error ({kind}): {message}")
+
+    def predict(
+        self, sequences, chromosomes=None, gene_infos=None, tile_long: bool = False, with_attention: bool = True
+    ) -> list:
+        """
+        Remote `attention_predict_batch`: list of (idx, probs, alphas).
+        Without `with_attention` the weights are not sent back and alphas is None.
+        The worker's stage timings are recorded in this process.
+        """
+        n = len(sequences)
+        idx, probs, alphas, timings = self._call({
+            "op":             OP_PREDICT,
+            "sequences":      list(sequences),
+            "chromosomes":    list(chromosomes) if chromosomes is not None else [None] * n,
+            "gene_infos":     list(gene_infos) if gene_infos is not None else [None] * n,
+            "tile_long":      tile_long,
+            "with_attention": with_attention,
+        })
+        for stage, seconds in timings.items():
+            metrics.record(stage, seconds)
+        return [(int(idx[i]), probs[i], alphas[i] if alphas is not None else None) for i in range(n)]
+
+    def info(self) -> dict:
+        return self._call({"op": OP_INFO})
+
+    def stats(self) -> List[dict]:
+        """Registry and cache statistics of every worker."""
+        results = []
+        try:
+            authkey = self._authkey()
+        except ConnectionError:
+            return results
+        for address in self._workers():
+            try:
+                with Client(address, family="AF_UNIX", authkey=authkey) as conn:
+                    conn.send({"op": OP_STATS})
+                    if conn.poll(self.timeout):
+                        status, *payload = conn.recv()
+                        if status == "ok":
+                            results.append({"worker": address, **payload[0]})
+            except (OSError, EOFError, AuthenticationError):
+                continue
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--address", default=os.getenv("DNA_INFERENCE_SERVER") or default_address())
+    parser.add_argument("--workers", type=int, default=INFERENCE_WORKERS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    start = time.time()
+    try:
+        serve(args.address, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    logger.info("Inference server stopped after %.0fs", time.time() - start)
+
+
+if __name__ == "__main__":
+    main()
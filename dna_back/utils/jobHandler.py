@@ -0,0 +1,509 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import and_, func, insert, inspect, literal, or_, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from db.PredictionJob import PredictionJob
+from db.PredictionJobResult import PredictionJobResult
+from utils.database import Base, SessionLocal, engine
+from utils.fastaHandler import iter_fasta_chunks
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+JOBS_DIR = BASE_DIR / "jobs"
+
+JOB_WORKERS                 = int(os.getenv("DNA_JOB_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+MAX_ACTIVE_JOBS_PER_CLIENT  = int(os.getenv("DNA_JOBS_PER_CLIENT", "2"))
+# Server‐wide caps on queued/running jobs and on the uploads they keep in JOBS_DIR
+MAX_ACTIVE_JOBS             = int(os.getenv("DNA_MAX_ACTIVE_JOBS", "32"))
+MAX_ACTIVE_UPLOAD_MB        = float(os.getenv("DNA_JOBS_MAX_ACTIVE_UPLOAD_MB", "2048"))
+MAX_JOB_UPLOAD_MB           = float(os.getenv("DNA_JOB_MAX_UPLOAD_MB", "256"))
+JOB_CHUNK_SIZE              = int(os.getenv("DNA_JOB_CHUNK_SIZE", "512"))
+# A running job whose lease is not renewed for this long is taken over on the next start
+JOB_LEASE_SECONDS           = float(os.getenv("DNA_JOB_LEASE_SECONDS", "60"))
+
+STATUS_QUEUED     = "queued"
+STATUS_RUNNING    = "running"
+STATUS_COMPLETED  = "completed"
+STATUS_FAILED     = "failed"
+STATUS_CANCELLED  = "cancelled"
+ACTIVE_STATUSES   = (STATUS_QUEUED, STATUS_RUNNING)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+    """
+    Process‐pool initializer: load every model variant once per worker,
+    unless predictions go to the inference server.
+    """
+    from utils.predictor import INFERENCE_SERVER
+    if not INFERENCE_SERVER:
+        from utils.modelHandler import MODEL_PATHS, model_registry
+        model_registry.preload(MODEL_PATHS)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool that a crashed worker process broke; the next submit starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_executor() -> None:
+    """Stop the worker pool without waiting; unfinished jobs resume on next start."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_run(job_id: str, retries: int = 1) -> None:
+    """
+    Hand a job to the worker pool as a new run with its own owner ID.
+
+    The run only proceeds if it can claim the job (see `run_job`), so
+    submitting a job twice, e.g. from two API workers, runs it once. A
+    pool broken by a crashed worker process is replaced; the run that was
+    scoring the job in it fails, while runs that had not started yet are
+    resubmitted up to `retries` times.
+    """
+    owner = uuid.uuid4().hex
+    executor = _get_executor()
+    try:
+        future = executor.submit(run_job, job_id, owner)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        executor = _get_executor()
+        future = executor.submit(run_job, job_id, owner)
+    future.add_done_callback(partial(_on_run_done, executor, job_id, owner, retries))
+
+
+def _on_run_done(executor: ProcessPoolExecutor, job_id: str, owner: str, retries: int, future: Future) -> None:
+    if future.cancelled() or not isinstance(future.exception(), BrokenProcessPool):
+        return
+    _discard_executor(executor)
+    db = SessionLocal()
+    try:
+        if _release(db, job_id, owner, STATUS_FAILED, "Prediction worker process crashed"):
+            return
+        if retries <= 0:
+            # Never started: the pool keeps breaking (e.g. the models fail to load)
+            failed = (
+                db.query(PredictionJob)
+                .filter(PredictionJob.ID == job_id, PredictionJob.STATUS == STATUS_QUEUED)
+                .update({PredictionJob.STATUS: STATUS_FAILED, PredictionJob.ERROR: "Prediction worker pool is broken"},
+                        synchronize_session=False)
+            )
+            db.commit()
+            if failed:
+                _remove_upload(db, job_id)
+            return
+    finally:
+        db.close()
+    submit_run(job_id, retries - 1)
+
+
+def create_job_tables() -> None:
+    """
+    Create the job tables if they do not exist yet, and add columns that
+    newer versions introduced (OWNER, LEASE_UNTIL, UPLOAD_BYTES) to an
+    existing table.
+    """
+    Base.metadata.create_all(engine, tables=[PredictionJob.__table__, PredictionJobResult.__table__])
+    existing = {column["name"] for column in inspect(engine).get_columns(PredictionJob.__tablename__)}
+    with engine.begin() as conn:
+        for column in PredictionJob.__table__.columns:
+            if column.name not in existing:
+                conn.execute(text(
+                    f'ALTER TABLE {PredictionJob.__tablename__} ADD COLUMN "{column.name}" {column.type.compile(engine.dialect)}'
+                ))
+
+
+def serialize_job(job: PredictionJob) -> dict:
+    """
+    Serialize a PredictionJob instance into a dictionary.
+
+    Args:
+        job (PredictionJob): The job to serialize.
+
+    Returns:
+        dict: A dictionary representation of the job.
+    """
+    return {
+        "job_id":            job.ID,
+        "status":            job.STATUS,
+        "filename":          job.FILENAME,
+        "processed_records": job.PROCESSED_RECORDS,
+        "cancel_requested":  bool(job.CANCEL_REQUESTED),
+        "error":             job.ERROR,
+        "created_at":        job.CREATED_AT.isoformat() if job.CREATED_AT else None,
+        "updated_at":        job.UPDATED_AT.isoformat() if job.UPDATED_AT else None,
+    }
+
+
+def _capacity(client_id: str) -> tuple:
+    """Scalar subqueries: the client's active jobs, all active jobs and their upload bytes."""
+    active = PredictionJob.STATUS.in_(ACTIVE_STATUSES)
+    client_jobs = (
+        select(func.count()).select_from(PredictionJob)
+        .where(PredictionJob.CLIENT_ID == client_id, active)
+        .scalar_subquery()
+    )
+    all_jobs = select(func.count()).select_from(PredictionJob).where(active).scalar_subquery()
+    upload_bytes = select(func.coalesce(func.sum(PredictionJob.UPLOAD_BYTES), 0)).where(active).scalar_subquery()
+    return client_jobs, all_jobs, upload_bytes
+
+
+def _check_capacity(db: Session, client_id: str, size: int = 0) -> None:
+    """Raise the 429 for whichever cap a new job of `size` bytes would exceed."""
+    client_jobs, all_jobs, upload_bytes = db.execute(select(*_capacity(client_id))).one()
+    if client_jobs >= MAX_ACTIVE_JOBS_PER_CLIENT:
+        raise HTTPException(status_code=429, detail=f"At most {MAX_ACTIVE_JOBS_PER_CLIENT} active jobs per client.")
+    if all_jobs >= MAX_ACTIVE_JOBS or upload_bytes + size > MAX_ACTIVE_UPLOAD_MB * 2**20:
+        raise HTTPException(status_code=429, detail="Too many active jobs on the server; try again later.")
+
+
+def _store_upload(fileobj: BinaryIO, path: Path, max_bytes: int) -> int:
+    """
+    Copy an upload to `path`, giving up once it is larger than `max_bytes`.
+
+    Raises:
+        HTTPException: 413 if the upload is too large (nothing is kept).
+    """
+    size = 0
+    with open(path, "wb") as f:
+        while chunk := fileobj.read(1 << 20):
+            size += len(chunk)
+            if size > max_bytes:
+                break
+            f.write(chunk)
+    if size > max_bytes:
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=413, detail=f"Job uploads are limited to {MAX_JOB_UPLOAD_MB:g} MB.")
+    return size
+
+
+def submit_job(client_id: str, filename: str, fileobj: BinaryIO, db: Session) -> PredictionJob:
+    """
+    Store an uploaded FASTA file, record a queued job and hand it to the pool.
+
+    A job is only accepted while the client has fewer than
+    MAX_ACTIVE_JOBS_PER_CLIENT active jobs, the server fewer than
+    MAX_ACTIVE_JOBS, and the active uploads including this one stay
+    within MAX_ACTIVE_UPLOAD_MB.
+
+    Args:
+        client_id (str): Caller identity used for the concurrency cap.
+        filename (str): Original upload name.
+        fileobj (BinaryIO): Uploaded file contents.
+        db (Session): Database session.
+
+    Returns:
+        PredictionJob: The new job.
+
+    Raises:
+        HTTPException: 429 if a job cap is reached, 413 if the upload is
+            larger than MAX_JOB_UPLOAD_MB.
+    """
+    # Cheap early answer; the insert below enforces the caps
+    _check_capacity(db, client_id)
+
+    job_id = uuid.uuid4().hex
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    upload_path = JOBS_DIR / f"{job_id}.fasta"
+    size = _store_upload(fileobj, upload_path, int(MAX_JOB_UPLOAD_MB * 2**20))
+
+    values = {
+        "ID": job_id,
+        "CLIENT_ID": client_id,
+        "STATUS": STATUS_QUEUED,
+        "FILENAME": filename,
+        "UPLOAD_PATH": str(upload_path),
+        "UPLOAD_BYTES": size,
+        "PROCESSED_RECORDS": 0,
+        "CANCEL_REQUESTED": False,
+    }
+    # One INSERT ... SELECT ... WHERE <caps hold>: concurrent submits cannot
+    # both pass the check, as SQLite runs the statement under its write lock
+    client_jobs, all_jobs, upload_bytes = _capacity(client_id)
+    stmt = insert(PredictionJob).from_select(
+        list(values),
+        select(*(literal(value, PredictionJob.__table__.c[name].type) for name, value in values.items()))
+        .where(
+            client_jobs < MAX_ACTIVE_JOBS_PER_CLIENT,
+            all_jobs < MAX_ACTIVE_JOBS,
+            upload_bytes + size <= MAX_ACTIVE_UPLOAD_MB * 2**20,
+        ),
+    )
+    try:
+        inserted = db.execute(stmt).rowcount
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        upload_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    if not inserted:
+        upload_path.unlink(missing_ok=True)
+        _check_capacity(db, client_id, size)
+        # Freed up in the meantime: report it as busy rather than retrying
+        raise HTTPException(status_code=429, detail="Too many active jobs on the server; try again later.")
+
+    submit_run(job_id)
+    return db.get(PredictionJob, job_id)
+
+
+def _claimable(now: float):
+    """Jobs a new run may take: queued, or running under an expired lease."""
+    return or_(
+        PredictionJob.STATUS == STATUS_QUEUED,
+        and_(
+            PredictionJob.STATUS == STATUS_RUNNING,
+            or_(PredictionJob.LEASE_UNTIL.is_(None), PredictionJob.LEASE_UNTIL < now),
+        ),
+    )
+
+
+def resume_jobs(db: Session) -> int:
+    """
+    Resubmit jobs left queued, or running under an expired lease, e.g.
+    by a server that stopped.
+
+    Every API worker calls this at startup. Jobs another worker is still
+    running keep a fresh lease and are left alone, and a job submitted by
+    several workers is claimed by one run only (see `run_job`).
+
+    Returns:
+        int: Number of jobs handed to the pool.
+    """
+    job_ids = [job_id for (job_id,) in db.query(PredictionJob.ID).filter(_claimable(time.time()))]
+    for job_id in job_ids:
+        submit_run(job_id)
+    return len(job_ids)
+
+
+def _remove_upload(db: Session, job_id: str) -> None:
+    job = db.get(PredictionJob, job_id)
+    if job is not None and job.UPLOAD_PATH:
+        Path(job.UPLOAD_PATH).unlink(missing_ok=True)
+
+
+def _finish(db: Session, job: PredictionJob, status: str, error: Optional[str] = None) -> None:
+    job.STATUS = status
+    job.ERROR = error
+    db.commit()
+    if job.UPLOAD_PATH:
+        Path(job.UPLOAD_PATH).unlink(missing_ok=True)
+
+
+def _release(db: Session, job_id: str, owner: str, status: str, error: Optional[str] = None) -> bool:
+    """Finish a job if run `owner` still holds it. Returns whether it did."""
+    released = (
+        db.query(PredictionJob)
+        .filter(PredictionJob.ID == job_id, PredictionJob.OWNER == owner, PredictionJob.STATUS == STATUS_RUNNING)
+        .update({PredictionJob.STATUS: status, PredictionJob.ERROR: error, PredictionJob.LEASE_UNTIL: None},
+                synchronize_session=False)
+    )
+    db.commit()
+    if released:
+        _remove_upload(db, job_id)
+    return bool(released)
+
+
+def _renew_lease(db: Session, job_id: str, owner: str, **values) -> bool:
+    """Extend the lease of run `owner` (and set `values`) in the current transaction; False if it lost the job."""
+    values = {getattr(PredictionJob, name): value for name, value in values.items()}
+    values[PredictionJob.LEASE_UNTIL] = time.time() + JOB_LEASE_SECONDS
+    return bool(
+        db.query(PredictionJob)
+        .filter(PredictionJob.ID == job_id, PredictionJob.OWNER == owner, PredictionJob.STATUS == STATUS_RUNNING)
+        .update(values, synchronize_session=False)
+    )
+
+
+def _heartbeat(job_id: str, owner: str, stop: threading.Event) -> None:
+    """Keep the lease of a run alive while a long chunk is being scored."""
+    while not stop.wait(JOB_LEASE_SECONDS / 3):
+        db = SessionLocal()
+        try:
+            held = _renew_lease(db, job_id, owner)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            held = True  # e.g. database busy; try again next beat
+        finally:
+            db.close()
+        if not held:
+            return
+
+
+def run_job(job_id: str, owner: str) -> str:
+    """
+    Score one job inside a pool worker, resuming after the records already
+    stored. Progress is committed after every chunk, and a cancel request
+    is honoured between chunks.
+
+    The run first claims the job with one conditional UPDATE (status
+    running, OWNER = `owner`, a lease of JOB_LEASE_SECONDS), which fails
+    if another run holds it. The lease is renewed by a heartbeat and with
+    every chunk; a chunk's results are committed only together with a
+    renewal that still finds this run as the owner.
+
+    Returns:
+        str: Final job status, or the current one if the job was not claimed.
+    """
+    from utils.predictor import attention_predict_batch
+
+    db = SessionLocal()
+    stop = threading.Event()
+    try:
+        now = time.time()
+        claimed = (
+            db.query(PredictionJob)
+            .filter(PredictionJob.ID == job_id, _claimable(now))
+            .update(
+                {
+                    PredictionJob.STATUS: STATUS_RUNNING,
+                    PredictionJob.OWNER: owner,
+                    PredictionJob.LEASE_UNTIL: now + JOB_LEASE_SECONDS,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        job = db.get(PredictionJob, job_id)
+        if not claimed:
+            return job.STATUS if job else STATUS_FAILED
+        if job.CANCEL_REQUESTED:
+            _release(db, job_id, owner, STATUS_CANCELLED)
+            return STATUS_CANCELLED
+        threading.Thread(target=_heartbeat, args=(job_id, owner, stop), daemon=True).start()
+
+        skip = job.PROCESSED_RECORDS or 0
+        index = 0
+        with io.open(job.UPLOAD_PATH, "r", encoding="utf-8-sig") as handle:
+            for chunk in iter_fasta_chunks(handle, JOB_CHUNK_SIZE):
+                if index + len(chunk) <= skip:
+                    index += len(chunk)
+                    continue
+                if index < skip:
+                    chunk = chunk[skip - index :]
+                    index = skip
+
+                db.refresh(job)
+                if job.CANCEL_REQUESTED:
+                    _release(db, job_id, owner, STATUS_CANCELLED)
+                    return STATUS_CANCELLED
+
+                outputs = attention_predict_batch(sequences=[rec.sequence for rec in chunk])
+                if not _renew_lease(db, job_id, owner, PROCESSED_RECORDS=index + len(chunk)):
+                    db.rollback()  # taken over after the lease expired; that run stores these records
+                    return STATUS_RUNNING
+                db.add_all(
+                    PredictionJobResult(
+                        JOB_ID=job_id,
+                        RECORD_INDEX=index + offset,
+                        RECORD_ID=rec.record_id,
+                        PREDICTION_IDX=idx,
+                        PROBS=np.asarray(probs, dtype=np.float32).tobytes(),
+                        ALPHAS=np.asarray(alphas, dtype=np.float32).tobytes(),
+                    )
+                    for offset, (rec, (idx, probs, alphas)) in enumerate(zip(chunk, outputs))
+                )
+                index += len(chunk)
+                db.commit()
+
+        _release(db, job_id, owner, STATUS_COMPLETED)
+        return STATUS_COMPLETED
+    except Exception as e:
+        db.rollback()
+        _release(db, job_id, owner, STATUS_FAILED, error=str(e))
+        return STATUS_FAILED
+    finally:
+        stop.set()
+        db.close()
+
+
+def get_job(job_id: str, db: Session) -> PredictionJob:
+    """
+    Fetch a job by ID.
+
+    Raises:
+        HTTPException: 404 if the job does not exist.
+    """
+    job = db.get(PredictionJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+
+def get_job_results(
+    job_id: str, page: int = 1, limit: int = 100, db: Session = None
+) -> Tuple[PredictionJob, List[Tuple[str, int, np.ndarray, np.ndarray]]]:
+    """
+    Fetch one page of a job's stored results, in record order.
+
+    Returns:
+        Tuple: (job, [(record_id, idx, probs, alphas), ...])
+    """
+    job = get_job(job_id, db)
+    rows = (
+        db.query(PredictionJobResult)
+        .filter(PredictionJobResult.JOB_ID == job_id)
+        .order_by(PredictionJobResult.RECORD_INDEX)
+        .offset((page - 1) * limit)
+        .limit(limit)
+        .all()
+    )
+    return job, [
+        (
+            row.RECORD_ID,
+            row.PREDICTION_IDX,
+            np.frombuffer(row.PROBS, dtype=np.float32),
+            np.frombuffer(row.ALPHAS, dtype=np.float32),
+        )
+        for row in rows
+    ]
+
+
+def cancel_job(job_id: str, db: Session) -> PredictionJob:
+    """
+    Ask a job to stop. Queued jobs are cancelled at once; running jobs stop
+    after their current chunk. Results stored so far are kept.
+    """
+    job = get_job(job_id, db)
+    if job.STATUS in ACTIVE_STATUSES:
+        job.CANCEL_REQUESTED = True
+        if job.STATUS == STATUS_QUEUED:
+            _finish(db, job, STATUS_CANCELLED)
+        else:
+            db.commit()
+    return job
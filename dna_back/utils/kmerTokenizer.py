@@ -0,0 +1,127 @@
+from typing import Callable, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+BASES = "ACGT"
+
+
+class KmerTokenizer:
+    """
+    Vectorized replacement for `Tokenizer.texts_to_sequences` on k‐mer lists.
+
+    Bases are mapped to 2‐bit codes (A=0, C=1, G=2, T=3), so every k‐mer is
+    an integer in [0, 4**k). Rolling k‐mer indices are computed with NumPy
+    strides and translated through a lookup array built once from the
+    fitted Keras tokenizer, following its exact rules (lower‐casing,
+    `num_words`, `oov_token`, and dropping unknown k‐mers).
+
+    Sequences containing anything other than A/C/G/T are handed to
+    `fallback`, which should be the original Keras path.
+
+    Args:
+        lookup (np.ndarray): Token index per k‐mer code, -1 where the
+            tokenizer would drop the k‐mer.
+        k (int): K‐mer size.
+        fallback (Callable, optional): (sequences, max_len) → padded matrix.
+    """
+
+    def __init__(self, lookup: np.ndarray, k: int, fallback: Optional[Callable] = None):
+        self.k = k
+        self.lookup = lookup.astype(np.int32)
+        self.fallback = fallback
+        self._drops = bool((self.lookup < 0).any())
+        self._powers = 4 ** np.arange(k - 1, -1, -1, dtype=np.int64)
+
+        self._codes = np.full(256, -1, dtype=np.int64)
+        for code, base in enumerate(BASES):
+            self._codes[ord(base)] = code
+
+    @classmethod
+    def from_keras(cls, tokenizer, k: int, fallback: Optional[Callable] = None) -> "KmerTokenizer":
+        """Build the k‐mer code → token index table from a fitted Keras Tokenizer."""
+        word_index = tokenizer.word_index
+        num_words = getattr(tokenizer, "num_words", None)
+        oov_token = getattr(tokenizer, "oov_token", None)
+        oov_index = word_index.get(oov_token) if oov_token is not None else None
+        lower = getattr(tokenizer, "lower", True)
+
+        lookup = np.full(4 ** k, -1, dtype=np.int32)
+        for code in range(4 ** k):
+            kmer = "".join(BASES[(code >> (2 * (k - 1 - j))) & 3] for j in range(k))
+            i = word_index.get(kmer.lower() if lower else kmer)
+            if i is not None:
+                if num_words and i >= num_words:
+                    if oov_index is not None:
+                        lookup[code] = oov_index
+                else:
+                    lookup[code] = i
+            elif oov_index is not None:
+                lookup[code] = oov_index
+        return cls(lookup, k, fallback=fallback)
+
+    def encode_batch(self, sequences: list[str], max_len: int) -> np.ndarray:
+        """
+        Tokenize, post‐truncate and post‐pad sequences into an int32 matrix.
+
+        Returns:
+            np.ndarray: shape (len(sequences), max_len), 0 = padding.
+        """
+        n = len(sequences)
+        out = np.zeros((n, max_len), dtype=np.int32)
+        if n == 0:
+            return out
+
+        encoded = [seq.upper().encode("ascii", errors="replace") for seq in sequences]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=n)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        codes = self._codes[np.frombuffer(b"".join(encoded), dtype=np.uint8)]
+
+        # Rows with non‐ACGT characters go through the reference path
+        invalid = codes < 0
+        fallback_rows = np.zeros(n, dtype=bool)
+        if invalid.any():
+            row_of_base = np.repeat(np.arange(n), lengths)
+            fallback_rows[np.unique(row_of_base[invalid])] = True
+
+        n_kmers = np.where(fallback_rows, 0, np.maximum(lengths - self.k + 1, 0))
+        if not self._drops:
+            n_kmers = np.minimum(n_kmers, max_len)
+
+        total = int(n_kmers.sum())
+        if total and len(codes) >= self.k:
+            kmer_codes = sliding_window_view(codes, self.k) @ self._powers  # rolling k‐mer index
+
+            rows = np.repeat(np.arange(n), n_kmers)
+            row_starts = np.concatenate(([0], np.cumsum(n_kmers)[:-1]))
+            within = np.arange(total) - np.repeat(row_starts, n_kmers)
+            tokens = self.lookup[kmer_codes[np.repeat(offsets, n_kmers) + within]]
+
+            if self._drops:
+                # Unknown k‐mers are dropped, so later tokens shift left
+                keep = tokens >= 0
+                rows, tokens = rows[keep], tokens[keep]
+                kept_starts = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))[:-1]))
+                within = np.arange(len(tokens)) - kept_starts[rows]
+                fits = within < max_len
+                rows, within, tokens = rows[fits], within[fits], tokens[fits]
+
+            out[rows, within] = tokens
+
+        if fallback_rows.any():
+            if self.fallback is None:
+                raise ValueError("Sequence contains characters other than A, C, G or T")
+            idx = np.flatnonzero(fallback_rows)
+            out[idx] = self.fallback([sequences[i] for i in idx], max_len)
+
+        return out
+
+
+def verify_against(kmer_tokenizer: KmerTokenizer, reference: Callable, sequences: list[str], max_len: int) -> int:
+    """
+    Count the sequences whose tokens differ between `kmer_tokenizer` and the
+    reference (sequences, max_len) → matrix implementation.
+    """
+    fast = kmer_tokenizer.encode_batch(sequences, max_len)
+    slow = np.asarray(reference(sequences, max_len), dtype=np.int32)
+    return int((fast != slow).any(axis=1).sum())
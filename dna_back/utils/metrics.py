@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, List, Optional
+
+from starlette.datastructures import MutableHeaders
+
+# Request instrumentation: per‐stage timers that feed latency histograms
+# (rendered at /metrics in Prometheus text format) and the `Server-Timing`
+# header of the request that did the work. A timer costs two clock reads
+# and one locked counter update, so it stays on in production.
+
+# Set to "0" to turn the timers and the Server-Timing header off
+METRICS_ENABLED = os.getenv("DNA_METRICS", "1") == "1"
+
+# Upper bounds (seconds) of the latency histogram buckets (last bucket is +Inf)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Thread‐safe labelled histogram with Prometheus semantics: cumulative
+    bucket counts, a sum and a count per label set.
+
+    Args:
+        name (str): Metric name.
+        help (str): One‐line description.
+        labelnames (tuple): Label names; `observe` takes one value per name.
+        buckets (tuple): Upper bounds, ascending.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict = {}  # label values → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        b = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[b] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels)]
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], series):
+                cumulative += count
+                le = ",".join(pairs + [f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{le}}} {cumulative}")
+            suffix = "{" + ",".join(pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+stage_seconds = Histogram(
+    "dna_stage_seconds", "Time spent in each prediction stage", ("stage",)
+)
+request_seconds = Histogram(
+    "dna_http_request_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+
+# Timing dicts of the requests the current code is working for: one for a
+# plain request, several when a micro‐batch serves many requests at once
+_request_timings: ContextVar[Optional[List[dict]]] = ContextVar("dna_request_timings", default=None)
+
+
+def record(stage: str, seconds: float, sinks: Optional[Iterable[dict]] = None) -> None:
+    """Add `seconds` to the `stage` histogram and to the timings of the current requests (or `sinks`)."""
+    if not METRICS_ENABLED:
+        return
+    stage_seconds.observe(seconds, stage)
+    for timings in sinks if sinks is not None else (_request_timings.get() or ()):
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    """Time the enclosed block as `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def current_sinks() -> List[dict]:
+    """Timing dicts of the current requests, to hand work over to another thread or batch."""
+    return list(_request_timings.get() or ())
+
+
+def run_with_sinks(sinks: List[dict], fn: Callable, *args):
+    """Call `fn(*args)` with its stage timings going to `sinks`."""
+    token = _request_timings.set(sinks)
+    try:
+        return fn(*args)
+    finally:
+        _request_timings.reset(token)
+
+
+def server_timing(timings: dict, total: float) -> str:
+    """`Server-Timing` header value, durations in milliseconds."""
+    entries = [f"{stage};dur={seconds * 1000.0:.2f}" for stage, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000.0:.2f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects the stage timings of each HTTP request,
+    returns them in a `Server-Timing` header and records the request
+    latency by route template. Streaming responses only carry the stages
+    finished before the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict = {}
+        status = [500]
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", server_timing(timings, time.perf_counter() - start)
+                )
+            await send(message)
+
+        token = _request_timings.set([timings])
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            route = scope.get("route")
+            request_seconds.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status[0]),
+            )
+
+
+# Extra metric sources for /metrics (batcher, cache and registry stats)
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def register_collector(collect: Callable[[], List[str]]) -> None:
+    """Add a function returning exposition lines to every /metrics render."""
+    _collectors.append(collect)
+
+
+def gauge_lines(name: str, help: str, samples: Iterable[tuple], kind: str = "gauge") -> List[str]:
+    """
+    Exposition lines for one metric.
+
+    Args:
+        samples: (labels dict, value) pairs.
+    """
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        lines.append(f"{name}{{{pairs}}} {value}" if pairs else f"{name} {value}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines = stage_seconds.render() + request_seconds.render()
+    for collect in _collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,175 @@
+import asyncio
+import functools
+import logging
+import time
+from bisect import bisect_left
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch‐size histogram buckets (last bucket is +Inf)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single requests into batched calls.
+
+    Requests are queued per key (for example the model variant). A worker
+    per key takes the first waiting request, keeps collecting until it has
+    `max_batch_size` items or `max_wait_ms` has passed since the first one,
+    runs `batch_fn` once on the whole batch in `executor`, and resolves every
+    caller's future with its own result. Queue wait and the stage timings
+    of `batch_fn` are reported to every request in the batch (see
+    utils.metrics).
+
+    `batch_fn` gets the list of items and must return one result per item,
+    in order. A returned Exception instance is raised to that caller only.
+    Any other failure while handling a batch fails that batch's callers
+    only, and a worker that dies anyway is restarted.
+
+    Args:
+        batch_fn (Callable[[List[Any]], List[Any]]): Batched implementation.
+        max_batch_size (int): Flush as soon as this many items are queued.
+        max_wait_ms (float): Flush at the latest this long after the first item.
+        executor (Executor, optional): Where `batch_fn` runs; default is the loop's.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Optional[Executor] = None,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.executor = executor
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: Dict[Hashable, asyncio.Queue] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+
+        self._batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._batches = 0
+        self._items = 0
+        self._wait_seconds_total = 0.0
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """Queue `item` under `key` and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (e.g. after a reload): start fresh
+            self._loop = loop
+            self._queues = {}
+            self._workers = {}
+
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+            self._start_worker(key, queue)
+
+        future = loop.create_future()
+        await queue.put((item, future, time.perf_counter(), metrics.current_sinks()))
+        return await future
+
+    def _start_worker(self, key: Hashable, queue: asyncio.Queue) -> None:
+        task = self._loop.create_task(self._run(queue))
+        task.add_done_callback(functools.partial(self._worker_done, key, queue))
+        self._workers[key] = task
+
+    def _worker_done(self, key: Hashable, queue: asyncio.Queue, task: asyncio.Task) -> None:
+        # Cancelled on shutdown, or replaced after a loop change: leave it
+        if task.cancelled() or self._queues.get(key) is not queue:
+            return
+        logger.error("Micro-batch worker for %r died; restarting", key, exc_info=task.exception())
+        self._start_worker(key, queue)
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [entry for entry in batch if not entry[1].cancelled()]
+            if not batch:
+                continue
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.exception("Micro-batch of %d items failed", len(batch))
+                for _, future, _, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            except BaseException:
+                # The worker is going down (cancelled or worse): release its callers
+                for _, future, _, _ in batch:
+                    future.cancel()
+                raise
+
+    async def _flush(self, batch: list) -> None:
+        """Run `batch_fn` on a batch and resolve its futures."""
+        loop = asyncio.get_running_loop()
+        self._record(batch)
+
+        items = [item for item, _, _, _ in batch]
+        sinks = [timings for _, _, _, item_sinks in batch for timings in item_sinks]
+        try:
+            results = await loop.run_in_executor(
+                self.executor, functools.partial(metrics.run_with_sinks, sinks, self.batch_fn, items)
+            )
+        except Exception as e:
+            for _, future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        results = list(results)
+        if len(results) != len(batch):
+            raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+        for (_, future, _, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _record(self, batch: list) -> None:
+        now = time.perf_counter()
+        self._batches += 1
+        self._items += len(batch)
+        for _, _, queued_at, sinks in batch:
+            self._wait_seconds_total += now - queued_at
+            metrics.record("queue", now - queued_at, sinks)
+        self._batch_size_counts[bisect_left(BATCH_SIZE_BUCKETS, len(batch))] += 1
+
+    def stats(self) -> dict:
+        """Queue depth per key and a histogram of flushed batch sizes."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(list(BATCH_SIZE_BUCKETS) + ["+Inf"], self._batch_size_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": {str(key): queue.qsize() for key, queue in self._queues.items()},
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch_size": self._items / self._batches if self._batches else 0.0,
+            "mean_queue_wait_ms": 1000.0 * self._wait_seconds_total / self._items if self._items else 0.0,
+            "batch_size_histogram": buckets,
+        }
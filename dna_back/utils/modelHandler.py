@@ -1,14 +1,35 @@
 import joblib
 import json
+import logging
+import os
 import tensorflow as tf
 import numpy as np
 from pathlib import Path
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 from tensorflow.keras.models import load_model, Model
 
+from utils.attentionLayer import AttentionLayer, PaddedAttentionLayer
+from utils.categoryEncoders import OneHotLookup
+from utils.inferenceBackends import make_runner
+from utils.kmerTokenizer import KmerTokenizer
+from utils.metrics import timed
+from utils.modelOptions import (
+    TILE_LONG_SEQUENCES,
+    VARIANT_CHR,
+    VARIANT_CHRGENE,
+    VARIANT_GENE,
+    VARIANT_SEQ,
+    select_variant,
+)
+from utils.modelRegistry import ModelRegistry
+from utils.predictionCache import PredictionCache, model_fingerprint
+from utils.tfliteRunner import BACKEND_TFLITE, QUANT_NONE, TFLiteRunner
+
+logger = logging.getLogger(__name__)
+
 # Directories & Paths
 BASE_DIR       = Path(__file__).resolve().parent.parent
-MODEL_DIR      = BASE_DIR / "Model" / "Attention"
+MODEL_DIR      = Path(os.getenv("DNA_MODEL_DIR", str(BASE_DIR / "Model" / "Attention")))
 
 # Classification‐only models (output: softmax probabilities)
 SEQ_ONLY_MODEL_PATH      = MODEL_DIR / "seq_only_model.keras"
@@ -32,58 +53,166 @@ LABEL_MAP_PATH   = MODEL_DIR / "label_map.json"
 KMER_K           = 3
 MAX_LEN_BILSTM   = 400
 
+# Model registry settings (0 = no memory budget)
+MODEL_MEMORY_BUDGET_MB  = float(os.getenv("DNA_MODEL_MEMORY_BUDGET_MB", "0"))
+PINNED_MODEL_VARIANTS   = [v for v in os.getenv("DNA_PINNED_MODEL_VARIANTS", "seq").split(",") if v]
+PRELOAD_MODEL_VARIANTS  = [v for v in os.getenv("DNA_PRELOAD_MODEL_VARIANTS", "").split(",") if v]
+
+# Inference backend: "graph" (pre‐traced tf.function), "keras" (Model.predict)
+# or "tflite" (files exported by scripts/export_tflite.py). TFLite serves the
+# float32 export unless DNA_TFLITE_QUANTIZATION opts in to "dynamic"/"float16"
+INFERENCE_BACKEND       = os.getenv("DNA_INFERENCE_BACKEND", "graph")
+XLA_COMPILE             = os.getenv("DNA_XLA_COMPILE", "0") == "1"
+TFLITE_DIR              = Path(os.getenv("DNA_TFLITE_DIR", str(MODEL_DIR / "tflite")))
+TFLITE_QUANTIZATION     = os.getenv("DNA_TFLITE_QUANTIZATION", QUANT_NONE)
+TFLITE_THREADS          = int(os.getenv("DNA_TFLITE_THREADS", "0")) or None
+
+# Sliding‐window inference for sequences longer than MAX_LEN_BILSTM k‐mers
+# (switched on by TILE_LONG_SEQUENCES)
+WINDOW_STRIDE           = int(os.getenv("DNA_WINDOW_STRIDE", str(MAX_LEN_BILSTM // 2)))
+WINDOW_AGGREGATE        = os.getenv("DNA_WINDOW_AGGREGATE", "mean")
+
+# Token‐length buckets for the batch path ("" = always pad to MAX_LEN_BILSTM)
+_LENGTH_BUCKETS_ENV     = os.getenv("DNA_LENGTH_BUCKETS", "64,128,256,400")
+LENGTH_BUCKETS          = sorted(
+    {min(int(b), MAX_LEN_BILSTM) for b in _LENGTH_BUCKETS_ENV.split(",") if b.strip()} | {MAX_LEN_BILSTM}
+) if _LENGTH_BUCKETS_ENV.strip() else []
+
+# Prediction cache settings (size 0 = disabled, empty DB path = memory only)
+PREDICTION_CACHE_SIZE   = int(os.getenv("DNA_PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL    = float(os.getenv("DNA_PREDICTION_CACHE_TTL", "3600"))
+PREDICTION_CACHE_DB     = os.getenv("DNA_PREDICTION_CACHE_DB", "")
+
+
+# (classification model, attention‐only model) files per variant
+MODEL_PATHS = {
+    VARIANT_SEQ:     (SEQ_ONLY_MODEL_PATH,    ATT_SEQ_MODEL_PATH),
+    VARIANT_CHR:     (SEQ_CHR_MODEL_PATH,     ATT_CHR_MODEL_PATH),
+    VARIANT_GENE:    (SEQ_GENE_MODEL_PATH,    ATT_GENE_MODEL_PATH),
+    VARIANT_CHRGENE: (SEQ_CHRGENE_MODEL_PATH, ATT_CHRGENE_MODEL_PATH),
+}
 
-# Custom AttentionLayer
-class AttentionLayer(tf.keras.layers.Layer):
+
+def build_fused_model(cls_model: Model) -> Model:
     """
-    Exactly the same implementation you already have.
-    It returns (context_vector, alphas) in call(...)
+    Turn a classification model into one that returns (probs, alphas)
+    from a single forward pass. The α vector is read from the model's own
+    AttentionLayer, so both outputs share the embedding + BiLSTM backbone.
     """
-    def __init__(self, **kwargs):
-        super(AttentionLayer, self).__init__(**kwargs)
+    att_layer = next(
+        (layer for layer in cls_model.layers if isinstance(layer, AttentionLayer)),
+        None,
+    )
+    if att_layer is None:
+        raise ValueError(f"Model '{cls_model.name}' has no AttentionLayer")
 
-    def build(self, input_shape):
-        self.W = self.add_weight(
-            name="att_weight",
-            shape=(input_shape[-1], input_shape[-1]),
-            initializer="glorot_uniform",
-            trainable=True,
-        )
-        self.b = self.add_weight(
-            name="att_bias",
-            shape=(input_shape[-1],),
-            initializer="zeros",
-            trainable=True,
-        )
-        self.u = self.add_weight(
-            name="att_u",
-            shape=(input_shape[-1],),
-            initializer="glorot_uniform",
-            trainable=True,
+    _, alphas = att_layer.output
+    return Model(
+        inputs=cls_model.inputs,
+        outputs=[cls_model.output, alphas],
+        name=f"{cls_model.name}_fused",
+    )
+
+
+def masks_padding(model: Model) -> bool:
+    """True if the model's embedding masks token 0, so padding does not reach the BiLSTM state."""
+    return any(
+        isinstance(layer, tf.keras.layers.Embedding) and layer.mask_zero
+        for layer in model.layers
+    )
+
+
+def build_bucketed_model(fused: Model) -> Model:
+    """
+    Clone a fused model with a variable‐length sequence input. Its
+    AttentionLayer is replaced by PaddedAttentionLayer, so running it on a
+    shorter padded length gives the same (probs, alphas) as the original
+    at MAX_LEN_BILSTM. Only valid when `masks_padding(fused)`.
+    """
+    seq_input, *other_inputs = fused.inputs
+    inputs = [tf.keras.Input(shape=(None,), dtype=seq_input.dtype, name=seq_input.name)] + [
+        tf.keras.Input(shape=tuple(inp.shape[1:]), dtype=inp.dtype, name=inp.name)
+        for inp in other_inputs
+    ]
+
+    def clone_layer(layer):
+        if isinstance(layer, AttentionLayer):
+            return PaddedAttentionLayer(padded_length=MAX_LEN_BILSTM, **layer.get_config())
+        return layer.__class__.from_config(layer.get_config())
+
+    bucketed = tf.keras.models.clone_model(
+        fused,
+        input_tensors=inputs if isinstance(fused.input, list) else inputs[0],
+        clone_function=clone_layer,
+    )
+    bucketed.set_weights(fused.get_weights())
+    return bucketed
+
+
+def load_fused_model(variant: str) -> Model:
+    """
+    Load the classification model of a variant and fuse its attention output.
+    With LENGTH_BUCKETS set and a masking embedding, the model accepts any
+    padded length up to MAX_LEN_BILSTM.
+    """
+    cls_path, _ = MODEL_PATHS[variant]
+    cls_model = load_model(cls_path, custom_objects={'AttentionLayer': AttentionLayer})
+    fused = build_fused_model(cls_model)
+    if LENGTH_BUCKETS and len(LENGTH_BUCKETS) > 1:
+        if masks_padding(fused):
+            return build_bucketed_model(fused)
+        logger.warning(
+            "Length buckets disabled for '%s': its embedding does not mask padding, "
+            "so a shorter padded length would change the results", variant,
         )
-        super(AttentionLayer, self).build(input_shape)
+    return fused
 
-    def call(self, inputs):
-        # inputs shape: (batch_size, time_steps, hidden_dim)
-        v = tf.tanh(tf.tensordot(inputs, self.W, axes=1) + self.b)  # (batch, time, hidden)
-        vu = tf.tensordot(v, self.u, axes=1)                         # (batch, time)
-        alphas = tf.nn.softmax(vu)                                   # (batch, time)
-        # Weighted sum
-        output = tf.reduce_sum(inputs * tf.expand_dims(alphas, -1), axis=1)  # (batch, hidden)
-        return output, alphas
 
+def tflite_model_path(variant: str, quantization: str = TFLITE_QUANTIZATION) -> Path:
+    """Where scripts/export_tflite.py writes the fused model of a variant."""
+    return TFLITE_DIR / f"{variant}_{quantization}.tflite"
+
+
+def load_runner(variant: str):
+    """Load the fused model of a variant behind the configured inference backend."""
+    if INFERENCE_BACKEND == BACKEND_TFLITE:
+        return TFLiteRunner(tflite_model_path(variant), num_threads=TFLITE_THREADS)
+    return make_runner(
+        load_fused_model(variant),
+        INFERENCE_BACKEND,
+        jit_compile=XLA_COMPILE,
+        warmup_lengths=LENGTH_BUCKETS or [MAX_LEN_BILSTM],
+    )
 
-# Load Classification‐Only Models
-seq_only_model      = load_model(SEQ_ONLY_MODEL_PATH,    custom_objects={'AttentionLayer': AttentionLayer})
-seq_chr_model       = load_model(SEQ_CHR_MODEL_PATH,     custom_objects={'AttentionLayer': AttentionLayer})
-seq_gene_model      = load_model(SEQ_GENE_MODEL_PATH,    custom_objects={'AttentionLayer': AttentionLayer})
-seq_chrgene_model   = load_model(SEQ_CHRGENE_MODEL_PATH, custom_objects={'AttentionLayer': AttentionLayer})
 
-# Load Attention‐Only Models 
-att_seq_model       = load_model(ATT_SEQ_MODEL_PATH,      custom_objects={'AttentionLayer': AttentionLayer})
-att_chr_model       = load_model(ATT_CHR_MODEL_PATH,      custom_objects={'AttentionLayer': AttentionLayer})
-att_gene_model      = load_model(ATT_GENE_MODEL_PATH,     custom_objects={'AttentionLayer': AttentionLayer})
-att_chrgene_model   = load_model(ATT_CHRGENE_MODEL_PATH,  custom_objects={'AttentionLayer': AttentionLayer})
+# Runners are loaded (and warmed) on first use and evicted under the memory budget
+model_registry = ModelRegistry(
+    loader=load_runner,
+    size_fn=lambda runner: runner.nbytes,
+    memory_budget_bytes=int(MODEL_MEMORY_BUDGET_MB * 2**20),
+    pinned=PINNED_MODEL_VARIANTS,
+)
+model_registry.preload(PRELOAD_MODEL_VARIANTS)
+
+
+# Files whose change invalidates cached predictions
+MODEL_FILES = [cls_path for cls_path, _ in MODEL_PATHS.values()] + [
+    TOKENIZER_PATH, CHROM_OHE_PATH, GENE_OHE_PATH, LABEL_MAP_PATH,
+]
+if INFERENCE_BACKEND == BACKEND_TFLITE:
+    MODEL_FILES += [tflite_model_path(variant) for variant in MODEL_PATHS]
+
+# Results keyed by (sequence, chromosome, gene, model version)
+prediction_cache = PredictionCache(
+    version_fn=lambda: model_fingerprint(MODEL_FILES),
+    max_entries=PREDICTION_CACHE_SIZE,
+    ttl_seconds=PREDICTION_CACHE_TTL,
+    disk_path=PREDICTION_CACHE_DB or None,
+    on_version_change=model_registry.clear,
+)
+
+# Rows per forward pass inside Model.predict for batched inference
+INFERENCE_BATCH_SIZE = 256
 
 
 # Load Tokenizer / OHEs / Label Map
@@ -105,16 +234,14 @@ def _extract_kmers(seq: str, k: int) -> list[str]:
     return [seq[i : i + k] for i in range(len(seq) - k + 1)]
 
 
-def preprocess_sequence(raw_seq: str, max_len: int) -> np.ndarray:
+def preprocess_sequences_keras(raw_seqs: list[str], max_len: int) -> np.ndarray:
     """
-    1) Upper‐case
-    2) Extract K‐mers of size = KMER_K
-    3) tokenizer.texts_to_sequences →  integer indices per k‐mer
-    4) pad_sequences to length = max_len
+    Reference tokenizer path: k‐mer strings → tokenizer.texts_to_sequences →
+    pad_sequences. Used for sequences the vectorized tokenizer cannot encode
+    and to verify it.
     """
-    seq = raw_seq.upper()
-    kmers = _extract_kmers(seq, KMER_K)
-    seqs = tokenizer.texts_to_sequences([kmers])  # → list of lists
+    kmers = [_extract_kmers(seq.upper(), KMER_K) for seq in raw_seqs]
+    seqs = tokenizer.texts_to_sequences(kmers)  # → list of lists
     padded = pad_sequences(
         seqs,
         maxlen=max_len,
@@ -122,16 +249,307 @@ def preprocess_sequence(raw_seq: str, max_len: int) -> np.ndarray:
         truncating="post",
         value=0,
     )
-    return padded  # shape = (1, max_len)
+    return padded  # shape = (n, max_len)
+
+
+def preprocess_sequences(raw_seqs: list[str], max_len: int) -> np.ndarray:
+    """
+    Batched version of `preprocess_sequence`: every sequence is tokenized
+    and padded into one (n, max_len) int32 matrix by the vectorized k‐mer
+    tokenizer.
+    """
+    return kmer_tokenizer.encode_batch(raw_seqs, max_len)  # shape = (n, max_len)
+
+
+# Vectorized k‐mer tokenizer compiled from the pickled tokenizer's word_index
+kmer_tokenizer = KmerTokenizer.from_keras(tokenizer, KMER_K, fallback=preprocess_sequences_keras)
+
+# Category → column lookups compiled from the pickled one‐hot encoders
+chrom_encoder = OneHotLookup.from_sklearn(chrom_ohe)
+gene_encoder  = OneHotLookup.from_sklearn(gene_ohe)
+
+
+def preprocess_sequence(raw_seq: str, max_len: int) -> np.ndarray:
+    """
+    1) Upper‐case
+    2) Extract K‐mers of size = KMER_K
+    3) tokenizer.texts_to_sequences →  integer indices per k‐mer
+    4) pad_sequences to length = max_len
+    """
+    return preprocess_sequences([raw_seq], max_len)  # shape = (1, max_len)
+
 
 def preprocess_chrom(chrom: str) -> np.ndarray:
-    chrom_val = str(chrom).strip().upper()
-    return chrom_ohe.transform([[chrom_val]])  # shape = (1, chrom_dim)
+    return preprocess_chroms([chrom])  # shape = (1, chrom_dim)
 
 
 def preprocess_gene(gene: str) -> np.ndarray:
-    gene_val = str(gene).strip().upper()
-    return gene_ohe.transform([[gene_val]])    # shape = (1, gene_dim)
+    return preprocess_genes([gene])    # shape = (1, gene_dim)
+
+
+def preprocess_chroms(chroms: list[str]) -> np.ndarray:
+    values = [str(chrom).strip().upper() for chrom in chroms]
+    return chrom_encoder.transform(values)  # shape = (n, chrom_dim)
+
+
+def preprocess_genes(genes: list[str]) -> np.ndarray:
+    values = [str(gene).strip().upper() for gene in genes]
+    return gene_encoder.transform(values)   # shape = (n, gene_dim)
+
+
+def _build_inputs(
+    variant: str,
+    tokens: np.ndarray,
+    chromosomes: list[str],
+    gene_infos: list[str],
+):
+    """
+    Build the model inputs for one variant group, in the order the
+    models were trained with: [sequence, chromosome, gene].
+    """
+    inputs = [tokens]
+    if variant in (VARIANT_CHR, VARIANT_CHRGENE):
+        inputs.append(preprocess_chroms(chromosomes))
+    if variant in (VARIANT_GENE, VARIANT_CHRGENE):
+        inputs.append(preprocess_genes(gene_infos))
+    return inputs if len(inputs) > 1 else inputs[0]
+
+
+def bucket_rows(tokens: np.ndarray, positions: list[int]) -> list[tuple[int, list[int]]]:
+    """
+    Split rows of a post‐padded token matrix into LENGTH_BUCKETS by their
+    number of tokens.
+
+    Returns:
+      - list of (bucket width, row positions), smallest bucket first
+    """
+    positions = np.asarray(positions)
+    n_tokens = (tokens[positions] != 0).sum(axis=1)  # padding is only at the end
+    bucket_of = np.searchsorted(LENGTH_BUCKETS, n_tokens)
+    # One stable sort groups the rows by bucket, keeping their order within each
+    order = np.argsort(bucket_of, kind="stable")
+    buckets, firsts = np.unique(bucket_of[order], return_index=True)
+    return [
+        (LENGTH_BUCKETS[b], rows.tolist())
+        for b, rows in zip(buckets, np.split(positions[order], firsts[1:]))
+    ]
+
+
+def _forward_rows(
+    tokens: np.ndarray,
+    chromosomes: list[str],
+    gene_infos: list[str],
+    batch_size: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run every row of a token matrix through the model variant its
+    chromosome/gene inputs select, one forward pass per variant (and per
+    length bucket when the variant's model accepts shorter padding).
+
+    Returns:
+      - probs (n, num_classes) and alphas (n, time_steps), in row order
+    """
+    groups: dict[str, list[int]] = {}
+    for i, (chrom, gene) in enumerate(zip(chromosomes, gene_infos)):
+        groups.setdefault(select_variant(chrom, gene), []).append(i)
+
+    probs = alphas = None
+    for variant, positions in groups.items():
+        with timed("load"):  # only slow on a registry miss
+            runner = model_registry.get(variant)
+        if runner.variable_length:
+            # Variable‐length model: run each length bucket at its own padded width
+            batches = bucket_rows(tokens, positions)
+        else:
+            batches = [(tokens.shape[1], positions)]
+
+        for width, rows in batches:
+            with timed("ohe"):
+                inputs = _build_inputs(
+                    variant,
+                    tokens[rows, :width],
+                    [chromosomes[i] for i in rows],
+                    [gene_infos[i] for i in rows],
+                )
+            # One forward pass → softmax probabilities and α vectors
+            with timed("forward"):
+                group_probs, group_alphas = runner(inputs, batch_size)
+            if probs is None:
+                probs = np.empty((len(tokens), group_probs.shape[1]), dtype=np.float32)
+                alphas = np.empty((len(tokens), group_alphas.shape[1]), dtype=np.float32)
+            probs[rows] = group_probs
+            alphas[rows] = group_alphas
+    return probs, alphas
+
+
+def _window_starts(n_tokens: int, window: int, stride: int) -> list[int]:
+    """Start offsets of overlapping windows covering n_tokens; the last one is end‐aligned."""
+    if n_tokens <= window:
+        return [0]
+    starts = list(range(0, n_tokens - window + 1, stride))
+    if starts[-1] != n_tokens - window:
+        starts.append(n_tokens - window)
+    return starts
+
+
+def _attention_predict_tiled(
+    sequences: list[str],
+    chromosomes: list[str],
+    gene_infos: list[str],
+    batch_size: int,
+    stride: int = WINDOW_STRIDE,
+    aggregate: str = WINDOW_AGGREGATE,
+    with_attention: bool = True,
+) -> list[tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Sliding‐window prediction for sequences longer than MAX_LEN_BILSTM k‐mers.
+
+    Every sequence is cut into overlapping windows of MAX_LEN_BILSTM tokens
+    (`stride` apart, the last window end‐aligned), all windows of all
+    sequences run through `_forward_rows` as one batch, and the window
+    outputs are merged back: probabilities by `aggregate` ("mean" or
+    "max", renormalized), attention by averaging every position over the
+    windows covering it, renormalized to sum to 1. The number of windows,
+    and so the cost, grows linearly with sequence length.
+
+    Returns:
+      - list of (idx, probs, alphas) with one α per k‐mer of the full
+        sequence; alphas is None (and not merged) without `with_attention`
+    """
+    if aggregate not in ("mean", "max"):
+        raise ValueError("Window aggregate must be 'mean' or 'max'")
+    stride = max(1, min(stride, MAX_LEN_BILSTM))
+
+    width = max(MAX_LEN_BILSTM, max(len(seq) for seq in sequences) - KMER_K + 1)
+    with timed("tokenize"):
+        tokens = preprocess_sequences(sequences, width)
+    n_tokens = (tokens != 0).sum(axis=1)  # padding is only at the end
+
+    owners, starts = [], []
+    for i, n in enumerate(n_tokens):
+        for start in _window_starts(int(n), MAX_LEN_BILSTM, stride):
+            owners.append(i)
+            starts.append(start)
+    owners = np.asarray(owners)
+    cols = np.asarray(starts)[:, None] + np.arange(MAX_LEN_BILSTM)
+    windows = tokens[owners[:, None], cols]
+
+    probs, alphas = _forward_rows(
+        windows,
+        [chromosomes[i] for i in owners],
+        [gene_infos[i] for i in owners],
+        batch_size,
+    )
+
+    # The windows of each sequence are consecutive rows: first[i]:first[i + 1]
+    n_windows = np.bincount(owners, minlength=len(sequences))
+    first = np.concatenate(([0], np.cumsum(n_windows)))
+    if aggregate == "max":
+        seq_probs = np.maximum.reduceat(probs, first[:-1], axis=0)
+        seq_probs = seq_probs / seq_probs.sum(axis=1, keepdims=True)
+    else:
+        seq_probs = np.add.reduceat(probs, first[:-1], axis=0) / n_windows[:, None]
+    seq_probs = seq_probs.astype(np.float32)
+    if not with_attention:
+        return [(int(np.argmax(p)), p, None) for p in seq_probs]
+
+    # Average α over the windows covering each position: every window adds
+    # its weights at its own offset into one flat buffer of all sequences
+    lengths = np.where(n_windows == 1, np.maximum(n_tokens, MAX_LEN_BILSTM), n_tokens)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    starts = np.asarray(starts)
+    steps = np.arange(MAX_LEN_BILSTM)
+    covered = steps < (lengths[owners] - starts)[:, None]
+    flat = (offsets[owners] + starts)[:, None] + steps
+    summed = np.bincount(flat[covered], weights=alphas[covered], minlength=offsets[-1])
+    counts = np.bincount(flat[covered], minlength=offsets[-1])
+
+    results = []
+    for i, p in enumerate(seq_probs):
+        lo, hi = offsets[i], offsets[i + 1]
+        seq_alphas = (summed[lo:hi] / np.maximum(counts[lo:hi], 1)).astype(np.float32)
+        seq_alphas /= seq_alphas.sum()
+        results.append((int(np.argmax(p)), p, seq_alphas))
+    return results
+
+
+#  Batched “Attention” Prediction
+def attention_predict_batch(
+    sequences: list[str],
+    chromosomes: list[str] = None,
+    gene_infos: list[str] = None,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    tile_long: bool = TILE_LONG_SEQUENCES,
+    with_attention: bool = True,
+) -> list[tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Predict many sequences at once.
+
+    Cached results are served first. The remaining sequences are tokenized
+    into one padded matrix, grouped by model variant and sent through each
+    fused model in a single forward pass, then the rows are split back out.
+
+    With `tile_long`, sequences longer than MAX_LEN_BILSTM k‐mers are not
+    truncated but scored with sliding windows (see `_attention_predict_tiled`).
+
+    Without `with_attention`, alphas is None in every result. The fused
+    model computes α in the same forward pass, so this only saves merging
+    the windows of tiled sequences and sending the weights on.
+
+    Returns:
+      - list of (idx, probs, alphas), in the same order as `sequences`
+    """
+    n = len(sequences)
+    chromosomes = list(chromosomes) if chromosomes is not None else [None] * n
+    gene_infos  = list(gene_infos)  if gene_infos  is not None else [None] * n
+    if len(chromosomes) != n or len(gene_infos) != n:
+        raise ValueError("sequences, chromosomes and gene_infos must have the same length")
+
+    results: list = [None] * n
+    long_rows = []
+    if tile_long:
+        long_rows = [i for i, seq in enumerate(sequences) if len(seq) - KMER_K + 1 > MAX_LEN_BILSTM]
+        if long_rows:
+            tiled = _attention_predict_tiled(
+                [sequences[i] for i in long_rows],
+                [chromosomes[i] for i in long_rows],
+                [gene_infos[i] for i in long_rows],
+                batch_size,
+                with_attention=with_attention,
+            )
+            for i, result in zip(long_rows, tiled):
+                results[i] = result
+
+    keys = None
+    if prediction_cache.enabled:
+        with timed("cache"):
+            keys = [prediction_cache.key(*req) for req in zip(sequences, chromosomes, gene_infos)]
+            cached = prediction_cache.get_many([keys[i] for i in range(n) if results[i] is None])
+        results = [results[i] or cached.get(keys[i]) for i in range(n)]
+
+    pending = [i for i in range(n) if results[i] is None]
+    if not pending:
+        return results if with_attention else [(idx, probs, None) for idx, probs, _ in results]
+
+    with timed("tokenize"):
+        tokens = preprocess_sequences([sequences[i] for i in pending], MAX_LEN_BILSTM)
+    probs, alphas = _forward_rows(
+        tokens,
+        [chromosomes[i] for i in pending],
+        [gene_infos[i] for i in pending],
+        batch_size,
+    )
+
+    fresh = {}
+    for row, i in enumerate(pending):
+        results[i] = (int(np.argmax(probs[row])), probs[row], alphas[row])
+        if keys is not None:
+            fresh[keys[i]] = (results[i][0], probs[row].copy(), alphas[row].copy())
+
+    with timed("cache"):
+        prediction_cache.put_many(fresh)
+    return results if with_attention else [(idx, probs, None) for idx, probs, _ in results]
+
 
 #  “Attention” Prediction
 def attention_predict_auto(
@@ -145,30 +563,26 @@ def attention_predict_auto(
       - probs (np.ndarray, shape=(num_classes,))
       - alphas(np.ndarray, shape=(time_steps,)): attention weights
     """
-    padded_seq = preprocess_sequence(sequence, MAX_LEN_BILSTM)
-    chrom_inp = preprocess_chrom(chromosome) if chromosome else None
-    gene_inp  = preprocess_gene(gene_info)   if gene_info  else None
+    return attention_predict_batch([sequence], [chromosome], [gene_info])[0]
 
-    if chromosome and gene_info:
-        # 1) Classification model → softmax
-        print(padded_seq, chrom_inp, gene_inp)
-        probs  = seq_chrgene_model.predict([padded_seq, chrom_inp, gene_inp])[0]
-        # 2) Attention‐only model → α vector
-        alphas = att_chrgene_model.predict([padded_seq, chrom_inp, gene_inp])[0]
 
-    elif chromosome:
-        print("BiLSTM with chromosome")
-        probs  = seq_chr_model.predict([padded_seq, chrom_inp])[0]
-        alphas = att_chr_model.predict([padded_seq, chrom_inp])[0]
-
-    elif gene_info:
-        print("BiLSTM with gene")
-        probs  = seq_gene_model.predict([padded_seq, gene_inp])[0]
-        alphas = att_gene_model.predict([padded_seq, gene_inp])[0]
+def verify_fused_model(variant: str, sequences: list[str], chromosome: str = None, gene_info: str = None) -> dict:
+    """
+    Compare the fused model of a variant against its original pair of
+    `.keras` files on the given sequences.
 
-    else:
-        probs  = seq_only_model.predict(padded_seq)[0]
-        alphas = att_seq_model.predict(padded_seq)[0]
+    Returns:
+      - dict with the max absolute difference of probs and alphas
+    """
+    cls_path, att_path = MODEL_PATHS[variant]
+    cls_model = load_model(cls_path, custom_objects={'AttentionLayer': AttentionLayer})
+    att_model = load_model(att_path, custom_objects={'AttentionLayer': AttentionLayer})
 
-    idx = int(np.argmax(probs))
-    return idx, probs, alphas
+    n = len(sequences)
+    tokens = preprocess_sequences(sequences, MAX_LEN_BILSTM)
+    inputs = _build_inputs(variant, tokens, [chromosome] * n, [gene_info] * n)
+    probs, alphas = model_registry.get(variant)(inputs, INFERENCE_BATCH_SIZE)
+    return {
+        "probs_max_abs_diff":  float(np.max(np.abs(probs - cls_model.predict(inputs, verbose=0)))),
+        "alphas_max_abs_diff": float(np.max(np.abs(alphas - att_model.predict(inputs, verbose=0)))),
+    }
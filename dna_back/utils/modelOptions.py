@@ -0,0 +1,56 @@
+import os
+import re
+from typing import Optional, Tuple
+
+# Kept free of TensorFlow imports: the API processes need these even when
+# the models themselves run in the inference server.
+
+# Model variants, keyed by which optional inputs a request carries
+VARIANT_SEQ       = "seq"
+VARIANT_CHR       = "chr"
+VARIANT_GENE      = "gene"
+VARIANT_CHRGENE   = "chr_gene"
+
+# Chromosomes the chr/chr_gene models were trained on
+TRAIN_CHROMS = {str(i) for i in range(1, 23)} | {"X"}
+GENE_SYMBOL_RE = re.compile(r"[A-Z0-9]+")
+
+# Sliding‐window inference for sequences longer than MAX_LEN_BILSTM k‐mers
+TILE_LONG_SEQUENCES     = os.getenv("DNA_TILE_LONG_SEQUENCES", "0") == "1"
+
+
+def select_variant(chromosome: str = None, gene_info: str = None) -> str:
+    """
+    Pick the model variant matching the optional inputs of a request.
+    """
+    if chromosome and gene_info:
+        return VARIANT_CHRGENE
+    if chromosome:
+        return VARIANT_CHR
+    if gene_info:
+        return VARIANT_GENE
+    return VARIANT_SEQ
+
+
+def gene_symbol(geneinfo: Optional[str]) -> Optional[str]:
+    """
+    First gene symbol of a ClinVar GENEINFO value, upper‐cased
+    ("BRCA1:672|NBR2:10230" → "BRCA1"). None when absent or when the
+    symbol is not a valid gene input (letters and digits only).
+    """
+    if not geneinfo:
+        return None
+    symbol = geneinfo.split("|", 1)[0].split(":", 1)[0].strip().upper()
+    return symbol if GENE_SYMBOL_RE.fullmatch(symbol) else None
+
+
+def record_model_inputs(chrom: Optional[str], geneinfo: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Chromosome and gene inputs for a stored DiseaseRecord: CHROM if the
+    models were trained on it, and the GENEINFO symbol; None for either
+    one that cannot be used, so the matching model variant is picked.
+    """
+    chrom = (chrom or "").strip().upper()
+    if chrom.startswith("CHR"):
+        chrom = chrom[3:]
+    return (chrom if chrom in TRAIN_CHROMS else None), gene_symbol(geneinfo)
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Load models on demand and keep them under a memory budget.
+
+    A model is loaded the first time its key is requested. Pinned keys are
+    never evicted; every other key is kept in least‐recently‐used order and
+    the coldest ones are dropped whenever the resident size goes over
+    `memory_budget_bytes` (0 or None = unlimited).
+
+    Args:
+        loader (Callable[[str], Any]): Builds the model for a key.
+        size_fn (Callable[[Any], int]): Estimated resident size of a model in bytes.
+        memory_budget_bytes (int, optional): Budget for all resident models.
+        pinned (Iterable[str], optional): Keys that are never evicted.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        size_fn: Callable[[Any], int],
+        memory_budget_bytes: Optional[int] = None,
+        pinned: Optional[Iterable[str]] = None,
+    ):
+        self._loader = loader
+        self._size_fn = size_fn
+        self.memory_budget_bytes = memory_budget_bytes or 0
+        self._pinned = set(pinned or ())
+
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+        self._stats = {"loads": 0, "hits": 0, "evictions": 0}
+        self._load_seconds: Dict[str, float] = {}
+
+    def get(self, key: str) -> Any:
+        """
+        Return the model for `key`, loading it if it is not resident.
+
+        Concurrent requests for the same cold key wait for a single load.
+        """
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self._stats["hits"] += 1
+                return model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return model
+
+            start = time.perf_counter()
+            model = self._loader(key)
+            elapsed = time.perf_counter() - start
+            size = int(self._size_fn(model))
+
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = size
+                self._stats["loads"] += 1
+                self._load_seconds[key] = elapsed
+                self._evict_over_budget(keep=key)
+            logger.info("Loaded model '%s' (%.1f MB) in %.2fs", key, size / 2**20, elapsed)
+            return model
+
+    def pin(self, key: str) -> None:
+        """Protect `key` from eviction (it is still loaded lazily)."""
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: str) -> None:
+        """Allow `key` to be evicted again."""
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict_over_budget()
+
+    def preload(self, keys: Iterable[str]) -> None:
+        """Load the given keys now instead of on first use."""
+        for key in keys:
+            self.get(key)
+
+    def evict(self, key: str) -> bool:
+        """Drop a resident model, pinned or not. Returns True if it was resident."""
+        with self._lock:
+            if key not in self._models:
+                return False
+            self._drop(key)
+            return True
+
+    def clear(self) -> None:
+        """Drop every resident model, e.g. after the model files changed."""
+        with self._lock:
+            for key in list(self._models.keys()):
+                self._drop(key)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def stats(self) -> dict:
+        """Load/hit/evict counters plus the current resident set."""
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": sum(self._sizes.values()),
+                "resident": list(self._models.keys()),
+                "pinned": sorted(self._pinned),
+                "load_seconds": dict(self._load_seconds),
+            }
+
+    def _evict_over_budget(self, keep: Optional[str] = None) -> None:
+        # Caller must hold self._lock
+        if not self.memory_budget_bytes:
+            return
+        for key in list(self._models.keys()):  # oldest first
+            if sum(self._sizes.values()) <= self.memory_budget_bytes:
+                return
+            if key == keep or key in self._pinned:
+                continue
+            self._drop(key)
+        if sum(self._sizes.values()) > self.memory_budget_bytes:
+            logger.warning(
+                "Resident models (%d bytes) exceed the memory budget (%d bytes); "
+                "only pinned or in‐use models remain",
+                sum(self._sizes.values()), self.memory_budget_bytes,
+            )
+
+    def _drop(self, key: str) -> None:
+        # Caller must hold self._lock
+        del self._models[key]
+        del self._sizes[key]
+        self._stats["evictions"] += 1
+        logger.info("Evicted model '%s'", key)
@@ -0,0 +1,237 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# (idx, probs, alphas) as returned by attention_predict_batch
+Prediction = Tuple[int, np.ndarray, np.ndarray]
+
+
+def model_fingerprint(paths: Iterable[Path]) -> str:
+    """
+    Short version string for a set of model/preprocessor files, derived
+    from their names, sizes and modification times. Missing files are
+    part of the fingerprint too, so adding one changes it.
+    """
+    h = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        try:
+            st = path.stat()
+            h.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except FileNotFoundError:
+            h.update(f"{path.name}:missing;".encode())
+    return h.hexdigest()[:16]
+
+
+def cache_key(sequence: str, chromosome: Optional[str], gene_info: Optional[str], model_version: str) -> str:
+    """Content hash of a normalized request plus the model version."""
+    parts = (
+        sequence.strip().upper(),
+        (chromosome or "").strip().upper(),
+        (gene_info or "").strip().upper(),
+        model_version,
+    )
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+class PredictionCache:
+    """
+    Two‐tier cache of prediction results keyed by `cache_key`.
+
+    The first tier is an in‐process LRU bounded by `max_entries` and
+    `ttl_seconds`. The optional second tier is a SQLite file that several
+    workers can share. Every `version_check_seconds` the current model
+    version is recomputed; when it changes, both tiers drop entries from
+    the old version and `on_version_change` is called.
+
+    Args:
+        version_fn (Callable[[], str]): Returns the current model version.
+        max_entries (int): In‐memory capacity; 0 disables the cache entirely.
+        ttl_seconds (float): Entry lifetime in both tiers; 0 = no expiry.
+        disk_path (str | Path, optional): SQLite file for the shared tier.
+        version_check_seconds (float): How often to re‐fingerprint the models.
+        on_version_change (Callable[[], None], optional): Hook for reloading models.
+    """
+
+    def __init__(
+        self,
+        version_fn: Callable[[], str],
+        max_entries: int = 10000,
+        ttl_seconds: float = 3600.0,
+        disk_path: Optional[str] = None,
+        version_check_seconds: float = 30.0,
+        on_version_change: Optional[Callable[[], None]] = None,
+    ):
+        self.version_fn = version_fn
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.on_version_change = on_version_change
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, int, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._version = version_fn()
+        self._version_checked_at = time.monotonic()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path and self.enabled:
+            self._disk = sqlite3.connect(str(disk_path), check_same_thread=False, timeout=30)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prediction_cache (
+                    key           TEXT PRIMARY KEY,
+                    model_version TEXT NOT NULL,
+                    created_at    REAL NOT NULL,
+                    idx           INTEGER NOT NULL,
+                    probs         BLOB NOT NULL,
+                    alphas        BLOB NOT NULL
+                )
+                """
+            )
+            self._disk.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def model_version(self) -> str:
+        self._check_version()
+        return self._version
+
+    def key(self, sequence: str, chromosome: Optional[str] = None, gene_info: Optional[str] = None) -> str:
+        return cache_key(sequence, chromosome, gene_info, self.model_version)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Prediction]:
+        """Look keys up in memory, then on disk. Returns only the hits."""
+        if not self.enabled:
+            return {}
+        now = time.time()
+        found: Dict[str, Prediction] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is None:
+                    missing.append(key)
+                    continue
+                created_at, idx, probs, alphas = entry
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    del self._memory[key]
+                    self._stats["expirations"] += 1
+                    missing.append(key)
+                    continue
+                self._memory.move_to_end(key)
+                found[key] = (idx, probs, alphas)
+            self._stats["memory_hits"] += len(found)
+
+            if missing and self._disk is not None:
+                for key, prediction, created_at in self._disk_get(missing, now):
+                    found[key] = prediction
+                    self._remember(key, prediction, created_at)
+                    self._stats["disk_hits"] += 1
+
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, Prediction]) -> None:
+        """Store predictions in both tiers."""
+        if not self.enabled or not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, prediction in items.items():
+                self._remember(key, prediction, now)
+            if self._disk is not None:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO prediction_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            key, self._version, now, int(idx),
+                            np.asarray(probs, dtype=np.float32).tobytes(),
+                            np.asarray(alphas, dtype=np.float32).tobytes(),
+                        )
+                        for key, (idx, probs, alphas) in items.items()
+                    ],
+                )
+                self._disk.commit()
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM prediction_cache")
+                self._disk.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": self._disk is not None,
+                "model_version": self._version,
+            }
+
+    def _remember(self, key: str, prediction: Prediction, created_at: float) -> None:
+        # Caller must hold self._lock
+        idx, probs, alphas = prediction
+        self._memory[key] = (created_at, idx, probs, alphas)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_get(self, keys: List[str], now: float):
+        # Caller must hold self._lock
+        oldest = now - self.ttl_seconds if self.ttl_seconds else 0.0
+        for start in range(0, len(keys), 500):  # stay under SQLite's variable limit
+            chunk = keys[start : start + 500]
+            rows = self._disk.execute(
+                f"SELECT key, created_at, idx, probs, alphas FROM prediction_cache "
+                f"WHERE model_version = ? AND created_at >= ? AND key IN ({','.join('?' * len(chunk))})",
+                [self._version, oldest, *chunk],
+            ).fetchall()
+            for key, created_at, idx, probs, alphas in rows:
+                prediction = (
+                    int(idx),
+                    _readonly(np.frombuffer(probs, dtype=np.float32).copy()),
+                    _readonly(np.frombuffer(alphas, dtype=np.float32).copy()),
+                )
+                yield key, prediction, created_at
+
+    def _check_version(self) -> None:
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_seconds:
+            return
+        self._version_checked_at = now
+        version = self.version_fn()
+        if version == self._version:
+            return
+
+        with self._lock:
+            self._version = version
+            self._memory.clear()
+            self._stats["invalidations"] += 1
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM prediction_cache WHERE model_version != ?", (version,))
+                self._disk.commit()
+        if self.on_version_change is not None:
+            self.on_version_change()
@@ -0,0 +1,84 @@
+import os
+
+from fastapi import HTTPException
+
+from utils.metrics import timed
+from utils.modelOptions import TILE_LONG_SEQUENCES
+
+# What the routes call for predictions: the same functions whether the
+# models run in this process or behind the inference server.
+
+# Socket path of `python -m utils.inferenceServer`; empty = models run in this process
+INFERENCE_SERVER = os.getenv("DNA_INFERENCE_SERVER", "")
+
+if INFERENCE_SERVER:
+    # No TensorFlow in this process: every prediction goes to the server
+    from utils.inferenceServer import InferenceClient
+
+    _client = InferenceClient(INFERENCE_SERVER)
+    _label_map: dict = {}
+
+    def _unavailable(e: ConnectionError) -> HTTPException:
+        return HTTPException(status_code=503, detail=f"Inference server unavailable: {e}")
+
+    def attention_predict_batch(
+        sequences: list[str],
+        chromosomes: list[str] = None,
+        gene_infos: list[str] = None,
+        tile_long: bool = TILE_LONG_SEQUENCES,
+        with_attention: bool = True,
+    ) -> list:
+        try:
+            # Round trip to the server; its own stages are reported separately
+            with timed("inference"):
+                return _client.predict(sequences, chromosomes, gene_infos, tile_long, with_attention)
+        except ConnectionError as e:
+            raise _unavailable(e)
+
+    def get_label_map() -> dict:
+        if not _label_map:
+            try:
+                _label_map.update(_client.info()["label_map"])
+            except ConnectionError as e:
+                raise _unavailable(e)
+        return _label_map
+
+    def model_version() -> str:
+        try:
+            return _client.info()["model_version"]
+        except ConnectionError as e:
+            raise _unavailable(e)
+
+    def registry_stats() -> dict:
+        return {"workers": [{"worker": w["worker"], "pid": w["pid"], **w["registry"]} for w in _client.stats()]}
+
+    def cache_stats() -> dict:
+        return {"workers": [{"worker": w["worker"], "pid": w["pid"], **w["cache"]} for w in _client.stats()]}
+
+else:
+    from utils import modelHandler
+
+    from utils.modelHandler import label_map, model_registry, prediction_cache
+
+    def attention_predict_batch(
+        sequences: list[str],
+        chromosomes: list[str] = None,
+        gene_infos: list[str] = None,
+        tile_long: bool = TILE_LONG_SEQUENCES,
+        with_attention: bool = True,
+    ) -> list:
+        return modelHandler.attention_predict_batch(
+            sequences, chromosomes, gene_infos, tile_long=tile_long, with_attention=with_attention,
+        )
+
+    def get_label_map() -> dict:
+        return label_map
+
+    def model_version() -> str:
+        return prediction_cache.model_version
+
+    def registry_stats() -> dict:
+        return model_registry.stats()
+
+    def cache_stats() -> dict:
+        return prediction_cache.stats()
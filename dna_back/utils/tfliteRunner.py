@@ -0,0 +1,108 @@
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Backend name accepted by DNA_INFERENCE_BACKEND
+BACKEND_TFLITE = "tflite"
+
+# Quantization modes written by scripts/export_tflite.py
+QUANT_NONE     = "none"
+QUANT_DYNAMIC  = "dynamic"
+QUANT_FLOAT16  = "float16"
+QUANTIZATIONS  = (QUANT_NONE, QUANT_DYNAMIC, QUANT_FLOAT16)
+
+
+def _interpreter_class():
+    # Prefer the standalone runtimes so serving does not need all of TensorFlow
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+def metadata_path(model_path: Path) -> Path:
+    """Sidecar JSON written next to each exported `.tflite` file."""
+    return Path(model_path).with_suffix(".json")
+
+
+class TFLiteRunner:
+    """
+    Serve a fused (probs, alphas) model exported by scripts/export_tflite.py
+    through the TFLite interpreter.
+
+    The LSTM only converts to builtin ops with a static batch size, so each
+    export has a fixed `batch_size` (stored in its sidecar JSON). Inputs are
+    fed in chunks of that size, with the last chunk zero‐padded. The model
+    file is memory‐mapped by the interpreter, and calls are serialized
+    because an interpreter is not thread‐safe.
+
+    Args:
+        model_path (Path): The `.tflite` file.
+        num_threads (int, optional): Interpreter threads; default lets TFLite decide.
+
+    Raises:
+        FileNotFoundError: If the model or its sidecar JSON is missing.
+    """
+    name = BACKEND_TFLITE
+    variable_length = False
+
+    def __init__(self, model_path: Path, num_threads: Optional[int] = None):
+        model_path = Path(model_path)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"TFLite model '{model_path}' not found; run `python -m scripts.export_tflite` first"
+            )
+        self.model_path = model_path
+        self.metadata = json.loads(metadata_path(model_path).read_text())
+        self.batch_size = int(self.metadata["batch_size"])
+        self.quantization = self.metadata["quantization"]
+        self.nbytes = model_path.stat().st_size
+
+        self._interpreter = _interpreter_class()(model_path=str(model_path), num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        by_name = {d["name"]: d for d in self._interpreter.get_input_details()}
+        self._inputs = [by_name[name] for name in self.metadata["inputs"]]
+        outputs = {d["name"]: d for d in self._interpreter.get_output_details()}
+        self._probs = outputs[self.metadata["outputs"]["probs"]]
+        self._alphas = outputs[self.metadata["outputs"]["alphas"]]
+        self._lock = threading.Lock()
+
+    def warmup(self, lengths=None) -> None:
+        with self._lock:
+            self._interpreter.invoke()
+
+    def __call__(self, inputs, batch_size: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """`batch_size` is ignored; the export's fixed batch size is used."""
+        arrays = [
+            np.asarray(x.toarray() if hasattr(x, "toarray") else x, dtype=detail["dtype"])
+            for x, detail in zip(inputs if isinstance(inputs, (list, tuple)) else [inputs], self._inputs)
+        ]
+        n = arrays[0].shape[0]
+        probs = np.empty((n,) + tuple(self._probs["shape"][1:]), dtype=np.float32)
+        alphas = np.empty((n,) + tuple(self._alphas["shape"][1:]), dtype=np.float32)
+
+        with self._lock:
+            for start in range(0, n, self.batch_size):
+                stop = min(start + self.batch_size, n)
+                for arr, detail in zip(arrays, self._inputs):
+                    chunk = arr[start:stop]
+                    if stop - start < self.batch_size:
+                        chunk = np.concatenate(
+                            [chunk, np.zeros((self.batch_size - len(chunk),) + chunk.shape[1:], dtype=chunk.dtype)]
+                        )
+                    self._interpreter.set_tensor(detail["index"], chunk)
+                self._interpreter.invoke()
+                probs[start:stop] = self._interpreter.get_tensor(self._probs["index"])[: stop - start]
+                alphas[start:stop] = self._interpreter.get_tensor(self._alphas["index"])[: stop - start]
+        return probs, alphas
@@ -0,0 +1,68 @@
+from typing import AsyncIterator, List
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+
+async def iter_form_file(request: Request, field: str) -> AsyncIterator[bytes]:
+    """
+    Yield the content of the multipart/form-data file field `field` while
+    the request body is still arriving, instead of spooling the whole
+    upload first as `UploadFile` does.
+
+    The rest of the body is read and discarded, so the request is always
+    consumed to the end.
+
+    Raises:
+        ValueError: If the request is not multipart/form-data, the form is
+            malformed, or it has no `field`.
+        starlette.requests.ClientDisconnect: If the client goes away mid‐upload.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+        raise ValueError("Expected a multipart/form-data upload")
+
+    wanted = field.encode()
+    part = {"name": None, "header_field": b"", "header_value": b""}
+    found = False
+    pieces: List[bytes] = []
+
+    def on_part_begin():
+        part.update(name=None, header_field=b"", header_value=b"")
+
+    def on_header_field(data, start, end):
+        part["header_field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part["header_value"] += data[start:end]
+
+    def on_header_end():
+        if part["header_field"].lower() == b"content-disposition":
+            part["name"] = parse_options_header(part["header_value"])[1].get(b"name")
+        part.update(header_field=b"", header_value=b"")
+
+    def on_part_data(data, start, end):
+        if part["name"] == wanted:
+            pieces.append(data[start:end])
+
+    def on_part_end():
+        nonlocal found
+        found = found or part["name"] == wanted
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin":   on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end":   on_header_end,
+        "on_part_data":    on_part_data,
+        "on_part_end":     on_part_end,
+    })
+    async for body in request.stream():
+        parser.write(body)
+        if pieces:
+            data = b"".join(pieces)
+            pieces.clear()
+            yield data
+    parser.finalize()
+    if not found:
+        raise ValueError(f"No '{field}' file in the form")
@@ -0,0 +1,113 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from db.VariantPrediction import VariantPrediction
+from utils.database import Base, engine
+from utils.fastaHandler import ATCG_RE
+from utils.modelOptions import TILE_LONG_SEQUENCES, record_model_inputs
+
+# Which DiseaseRecord column each stored prediction was made from
+SEQUENCE_NORMAL   = "normal"
+SEQUENCE_MUTATED  = "mutated"
+
+# (ID, CHROM, GENEINFO, NormalSeq, MUTATED_SEQ): the DiseaseRecord columns scoring needs
+RecordRow = Tuple[int, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def create_variant_prediction_table() -> None:
+    """Create the variant_predictions table if it does not exist yet."""
+    Base.metadata.create_all(engine, tables=[VariantPrediction.__table__])
+
+
+def record_requests(record: RecordRow) -> List[tuple]:
+    """
+    Prediction requests for one record: (sequence kind, sequence,
+    chromosome, gene) for each of NormalSeq/MUTATED_SEQ that is a valid
+    ATCG sequence.
+    """
+    record_id, chrom, geneinfo, normal_seq, mutated_seq = record
+    chromosome, gene = record_model_inputs(chrom, geneinfo)
+    requests = []
+    for kind, seq in ((SEQUENCE_NORMAL, normal_seq), (SEQUENCE_MUTATED, mutated_seq)):
+        seq = (seq or "").strip().upper()
+        if ATCG_RE.fullmatch(seq):
+            requests.append((kind, seq, chromosome, gene))
+    return requests
+
+
+def score_records(records: List[RecordRow], model_version: str, with_attention: bool = True) -> List[dict]:
+    """
+    Score every stored sequence of `records` in one batched call.
+
+    Returns:
+        List[dict]: variant_predictions rows, ready for `save_predictions`.
+    """
+    # Imported here so that reading and writing rows never loads the models
+    from utils.predictor import attention_predict_batch
+
+    owners, requests = [], []
+    for record in records:
+        for request in record_requests(record):
+            owners.append(record[0])
+            requests.append(request)
+    if not requests:
+        return []
+
+    outputs = attention_predict_batch(
+        sequences=[seq for _, seq, _, _ in requests],
+        chromosomes=[chrom for _, _, chrom, _ in requests],
+        gene_infos=[gene for _, _, _, gene in requests],
+        tile_long=TILE_LONG_SEQUENCES,
+        with_attention=with_attention,
+    )
+    return [
+        {
+            "RECORD_ID":       record_id,
+            "MODEL_VERSION":   model_version,
+            "SEQUENCE":        kind,
+            "CHROMOSOME":      chrom,
+            "GENE":            gene,
+            "PREDICTION_IDX":  int(idx),
+            "PROBS":           np.asarray(probs, dtype=np.float32).tobytes(),
+            "ALPHAS":          np.asarray(alphas, dtype=np.float32).tobytes() if with_attention and alphas is not None else None,
+        }
+        for record_id, (kind, _, chrom, gene), (idx, probs, alphas) in zip(owners, requests, outputs)
+    ]
+
+
+def save_predictions(db: Session, rows: List[dict]) -> None:
+    """Insert or replace prediction rows and commit."""
+    if not rows:
+        return
+    stmt = insert(VariantPrediction)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["RECORD_ID", "MODEL_VERSION", "SEQUENCE"],
+        set_={col: stmt.excluded[col] for col in ("CHROMOSOME", "GENE", "PREDICTION_IDX", "PROBS", "ALPHAS")},
+    )
+    db.execute(stmt, rows)
+    db.commit()
+
+
+def load_predictions(db: Session, record_id: int, model_version: str) -> Dict[str, tuple]:
+    """
+    Stored predictions of one record for `model_version`.
+
+    Returns:
+        Dict[str, tuple]: sequence kind → (idx, probs, alphas or None).
+    """
+    rows = (
+        db.query(VariantPrediction)
+        .filter(VariantPrediction.RECORD_ID == record_id, VariantPrediction.MODEL_VERSION == model_version)
+        .all()
+    )
+    return {
+        row.SEQUENCE: (
+            row.PREDICTION_IDX,
+            np.frombuffer(row.PROBS, dtype=np.float32),
+            np.frombuffer(row.ALPHAS, dtype=np.float32) if row.ALPHAS is not None else None,
+        )
+        for row in rows
+    }